@@ -5,69 +5,54 @@
 #
 # Made by firepdx, with major feature enhancements by Gemini.
 
+import time
+STARTUP_TIME = time.perf_counter() # Reference point for --profile-startup
+
 import sys
 import os
-import json
 import shutil
 import webbrowser
-import zipfile
+import queue
 import subprocess
-import time
+import multiprocessing
 from uuid import uuid1, UUID
-from random_username.generate import generate_username
-from subprocess import Popen, PIPE, STDOUT
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QPushButton, QComboBox, QProgressBar,
                              QDialog, QSpinBox, QFileDialog, QMessageBox, QListWidget,
                              QListWidgetItem, QInputDialog, QPlainTextEdit, QDockWidget,
-                             QSplashScreen, QCheckBox, QToolButton, QMenu)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QProcess
-from PyQt5.QtGui import QPixmap, QIcon
+                             QSplashScreen, QCheckBox, QToolButton, QMenu, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView, QTabWidget)
+from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer, QProcess, QFileSystemWatcher, QPointF
+from PyQt5.QtGui import QPixmap, QIcon, QPainter, QPen, QColor, QPolygonF
+
+from launcher_core import (DownloadEngine, SharedStore, ManifestCache, prefetch_version, ConsoleBuffer,
+                           GC_PRESETS, IntegrityVerifier, ModpackImporter, ModIndex, ServerStatusMonitor,
+                           read_servers_dat, ConfigStore, lazy_import, InstalledVersionIndex, StartupProfiler,
+                           CONFIG_FILE, default_config, get_profile_path, LaunchPipeline, LaunchError,
+                           InstanceSupervisor, InstanceLimits, parse_cpu_list, available_cpus, split_cpus,
+                           ProcessSampler, MsaTokenRefresher, apply_msa_login, limit_lines)
 
-import minecraft_launcher_lib
+# Heavy and only needed once something is installed, launched or logged in
+minecraft_launcher_lib = lazy_import("minecraft_launcher_lib")
+# The server dashboard's worker runs its own event loop
+asyncio = lazy_import("asyncio")
 
-# Optional dependency for server status ping
-try:
-    from mcstatus import JavaServer
-    MCSTATUS_AVAILABLE = True
-except ImportError:
-    MCSTATUS_AVAILABLE = False
+profiler = StartupProfiler(STARTUP_TIME, enabled="--profile-startup" in sys.argv)
+profiler.mark("module imports")
 
 
 ###############################################################################
 # CONFIGURATION HELPERS
 ###############################################################################
-CONFIG_FILE = "launcher_config.json"
+_config_store = None
 
 def load_config():
-    """Loads a JSON config file if it exists, otherwise returns defaults."""
-    default_config = {
-        "minecraft_directory": minecraft_launcher_lib.utils.get_minecraft_directory(),
-        "ram": 4096,  # Increased default RAM
-        "mod_loader": "None",
-        "extra_jvm_args": "",
-        "java_path": "", # New: For custom Java executable
-        "accounts": [], # New structure: [{"uuid": "...", "name": "...", "type": "offline/msa", ...}]
-        "active_account_uuid": "" # New: To track the currently selected account
-    }
-    if os.path.isfile(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            default_config.update(data)
-        except Exception as e:
-            print(f"Warning: Could not load config file. Using defaults. Error: {e}")
-            pass
-    return default_config
-
-def save_config(config_data):
-    """Saves the given config dictionary to a JSON file."""
-    try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config_data, f, indent=4)
-    except Exception as e:
-        print(f"Error: Failed to save config: {e}")
+    """Returns the shared config store, loading the JSON config file (or defaults) on first use."""
+    global _config_store
+    if _config_store is None:
+        _config_store = ConfigStore(CONFIG_FILE, default_config())
+    return _config_store
 
 ###############################################################################
 # UTILITY FUNCTIONS
@@ -86,25 +71,22 @@ def open_folder_in_explorer(path):
     except Exception as e:
         print(f"Error opening folder {path}: {e}")
 
-def get_profile_path(mc_dir, version_id):
-    """Returns the path for a specific profile/instance."""
-    return os.path.join(mc_dir, "profiles", version_id)
+def load_modpack(zip_path, profile_dir, progress_callback=None, curseforge_api_key=""):
+    """Imports a modpack (plain ZIP, Modrinth .mrpack or CurseForge ZIP) into the specific profile directory.
 
-def load_modpack(zip_path, profile_dir):
-    """Extracts a modpack ZIP into the specific profile directory."""
+    Returns the importer's summary dict.
+    """
     if not os.path.isfile(zip_path):
-        return
-    try:
-        print(f"Extracting modpack to {profile_dir}...")
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            zf.extractall(profile_dir)
-        # Ensure a "mods" folder exists inside the profile directory
-        mods_path = os.path.join(profile_dir, "mods")
-        if not os.path.isdir(mods_path):
-             os.makedirs(mods_path)
-        QMessageBox.information(None, "Modpack Loaded", f"Modpack '{os.path.basename(zip_path)}' extracted successfully.")
-    except Exception as e:
-        QMessageBox.critical(None, "Error", f"Failed to load modpack: {e}")
+        raise FileNotFoundError(f"Modpack not found: {zip_path}")
+    print(f"Extracting modpack to {profile_dir}...")
+    # Only files that differ from what is already in the profile get written, and
+    # mods listed in a manifest go through the shared store
+    with DownloadEngine(progress_callback=progress_callback, store=SharedStore()) as engine:
+        importer = ModpackImporter(engine, curseforge_api_key=curseforge_api_key)
+        summary = importer.import_pack(zip_path, profile_dir, progress_callback)
+    # Ensure a "mods" folder exists inside the profile directory
+    os.makedirs(os.path.join(profile_dir, "mods"), exist_ok=True)
+    return summary
 
 ###############################################################################
 # CONSOLE CAPTURE
@@ -147,33 +129,176 @@ class VersionInstallThread(QThread):
 
     def run(self):
         try:
+            # Fetch libraries, assets and the client jar in parallel first; the library
+            # install below then only verifies them and handles natives/runtime.
+            with DownloadEngine(progress_callback=self.progress_signal.emit, store=SharedStore()) as engine:
+                prefetch_version(engine, self.version_id, self.mc_dir)
             minecraft_launcher_lib.install.install_minecraft_version(self.version_id, self.mc_dir, callback=self.callback)
             self.finished_signal.emit(True, f"Version {self.version_id} installed successfully!")
         except Exception as e:
             self.finished_signal.emit(False, f"Installation failed: {e}")
 
-class ServerPingThread(QThread):
-    """Pings a Minecraft server in the background."""
-    result_signal = pyqtSignal(str)
+class VerifyInstallThread(QThread):
+    """Verifies a version's files and re-downloads only the corrupted ones."""
+    progress_signal = pyqtSignal(int, int, str)
+    finished_signal = pyqtSignal(bool, str) # Success (bool), message (str)
 
-    def __init__(self, server_address):
+    def __init__(self, version_id, mc_dir):
         super().__init__()
-        self.server_address = server_address
+        self.version_id = version_id
+        self.mc_dir = mc_dir
+
+    def run(self):
+        try:
+            verifier = IntegrityVerifier()
+            bad = verifier.verify(self.version_id, self.mc_dir, progress_callback=self.progress_signal.emit)
+            if not bad:
+                self.finished_signal.emit(True, f"All files of {self.version_id} are intact.")
+                return
+            with DownloadEngine(progress_callback=self.progress_signal.emit, store=SharedStore()) as engine:
+                verifier.repair(bad, engine)
+            self.finished_signal.emit(True, f"Repaired {len(bad)} corrupted or missing file(s) of {self.version_id}.")
+        except Exception as e:
+            self.finished_signal.emit(False, f"Verification failed: {e}")
+
+class ModpackExtractThread(QThread):
+    """Extracts a modpack in the background."""
+    progress_signal = pyqtSignal(int, int, str)
+    finished_signal = pyqtSignal(bool, str) # Success (bool), message (str)
+
+    def __init__(self, zip_path, profile_dir, curseforge_api_key=""):
+        super().__init__()
+        self.zip_path = zip_path
+        self.profile_dir = profile_dir
+        self.curseforge_api_key = curseforge_api_key
 
     def run(self):
-        if not MCSTATUS_AVAILABLE:
-            self.result_signal.emit("Error: mcstatus library not found.\nPlease run: pip install mcstatus")
-            return
         try:
-            server = JavaServer.lookup(self.server_address)
-            status = server.status()
-            result = (f"✅ Server Online!\n"
-                      f"Version: {status.version.name}\n"
-                      f"Players: {status.players.online}/{status.players.max}\n"
-                      f"MOTD: {status.description}")
-            self.result_signal.emit(result)
+            summary = load_modpack(self.zip_path, self.profile_dir, progress_callback=self.progress_signal.emit,
+                                   curseforge_api_key=self.curseforge_api_key)
+            message = (f"Modpack '{summary['name']}' loaded successfully.\n"
+                       f"{summary['downloaded']} mod(s) downloaded, {summary['written']} file(s) written, "
+                       f"{summary['skipped']} already up to date.")
+            if summary["rejected"]:
+                message += f"\n{summary['rejected']} file(s) with unsafe or invalid paths were not extracted."
+            if summary["minecraft"]:
+                message += f"\n\nThis pack is made for Minecraft {summary['minecraft']}"
+                message += f" with {summary['loader']}." if summary["loader"] else "."
+            if summary["manual"]:
+                message += "\n\nThese mods don't allow automatic downloads and must be added by hand:\n" + "\n".join(summary["manual"])
+            self.finished_signal.emit(True, message)
         except Exception as e:
-            self.result_signal.emit(f"❌ Could not connect to server.\nReason: {e}")
+            self.finished_signal.emit(False, f"Failed to load modpack: {e}")
+
+class ManifestRefreshThread(QThread):
+    """Revalidates the cached version manifest in the background."""
+    versions_signal = pyqtSignal(list) # Emitted only when the manifest changed
+    failed_signal = pyqtSignal(str)
+
+    def __init__(self, manifest_cache, parent=None):
+        super().__init__(parent)
+        self.manifest_cache = manifest_cache
+
+    def run(self):
+        try:
+            changed, versions = self.manifest_cache.revalidate()
+            if changed:
+                self.versions_signal.emit(versions)
+        except Exception as e:
+            self.failed_signal.emit(f"Could not refresh the version list: {e}")
+
+ASSET_THREAD_WAIT_MS = 2000
+STARTUP_ASSETS = [
+    ("Command_Block_(Story_Mode).ico", "https://static.wikia.nocookie.net/minecraftstorymode/images/d/d4/Command_Block_%28Story_Mode%29.png/revision/latest?cb=20230225211910"),
+    ("assets/title.png", "https://i.imgur.com/rS2Fk9z.png") # A generic placeholder
+]
+
+class AssetDownloadThread(QThread):
+    """Fetches missing icon/title images after the window is up instead of before it."""
+    downloaded_signal = pyqtSignal(str)
+
+    def run(self):
+        from urllib import request
+        for path, url in STARTUP_ASSETS:
+            if self.isInterruptionRequested():
+                break
+            if os.path.isfile(path):
+                continue
+            try:
+                with request.urlopen(url, timeout=15) as response, open(path + ".part", "wb") as f:
+                    while not self.isInterruptionRequested():
+                        chunk = response.read(64 * 1024)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                if self.isInterruptionRequested():
+                    break
+                os.replace(path + ".part", path)
+                self.downloaded_signal.emit(path)
+            except Exception as e:
+                print(f"Warning: Could not download {path}: {e}")
+
+class VersionScanThread(QThread):
+    """Lists the installed versions off the GUI thread."""
+    versions_signal = pyqtSignal(str, list)
+    error_signal = pyqtSignal(str, str)
+
+    def __init__(self, version_index, mc_dir):
+        super().__init__()
+        self.version_index = version_index
+        self.mc_dir = mc_dir
+
+    def run(self):
+        try:
+            self.versions_signal.emit(self.mc_dir, self.version_index.scan(self.mc_dir))
+        except Exception as e:
+            self.error_signal.emit(self.mc_dir, str(e))
+
+class ServerStatusThread(QThread):
+    """Long-lived worker that pings lists of servers on one event loop, reporting each answer as it arrives."""
+    status_signal = pyqtSignal(str, dict)
+    error_signal = pyqtSignal(str)
+    poll_finished_signal = pyqtSignal()
+
+    def __init__(self, monitor, timeout=5.0):
+        super().__init__()
+        self.monitor = monitor
+        self.timeout = timeout
+        self.requests = queue.Queue()
+
+    def request(self, addresses):
+        """Queues a poll of addresses."""
+        self.requests.put(list(addresses))
+
+    def stop(self):
+        self.requests.put(None)
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                addresses = self.requests.get()
+                if addresses is None:
+                    break
+                try:
+                    self.monitor.poll(addresses, self.timeout, on_result=self.status_signal.emit, loop=loop)
+                except Exception as e:
+                    self.error_signal.emit(str(e))
+                self.poll_finished_signal.emit()
+        finally:
+            loop.close()
+
+class ModScanThread(QThread):
+    """Reads the metadata of a mods folder off the GUI thread."""
+    finished_signal = pyqtSignal(list, list) # Mods, problems
+
+    def __init__(self, mods_dir):
+        super().__init__()
+        self.mods_dir = mods_dir
+
+    def run(self):
+        mods = ModIndex().scan(self.mods_dir)
+        self.finished_signal.emit(mods, ModIndex.conflicts(mods))
 
 ###############################################################################
 # DIALOGS
@@ -225,20 +350,43 @@ class VersionInstallDialog(QDialog):
         self.install_button.clicked.connect(self.install_version)
         layout.addWidget(self.install_button)
 
-        self.all_versions = minecraft_launcher_lib.utils.get_version_list()
+        # Open instantly from the on-disk manifest, then revalidate it in the background.
+        # The thread is parented to our parent so closing the dialog doesn't destroy it mid-request.
+        self.manifest_cache = ManifestCache()
+        self.all_versions = self.manifest_cache.cached_versions()
         self.update_version_list()
+        self.refresh_thread = ManifestRefreshThread(self.manifest_cache, parent or self)
+        self.refresh_thread.versions_signal.connect(self.on_versions_refreshed)
+        self.refresh_thread.failed_signal.connect(self.on_refresh_failed)
+        self.refresh_thread.finished.connect(self.refresh_thread.deleteLater)
+        self.refresh_thread.start()
 
     def update_version_list(self):
-        self.version_list_widget.clear()
         show_types = []
         if self.show_releases.isChecked(): show_types.append("release")
         if self.show_snapshots.isChecked(): show_types.append("snapshot")
         if self.show_old_beta.isChecked(): show_types.append("old_beta")
         if self.show_old_alpha.isChecked(): show_types.append("old_alpha")
 
+        selected_item = self.version_list_widget.currentItem()
+        selected_id = selected_item.text() if selected_item else None
+        self.version_list_widget.clear()
         for version in self.all_versions:
             if version['type'] in show_types:
-                self.version_list_widget.addItem(QListWidgetItem(version['id']))
+                item = QListWidgetItem(version['id'])
+                self.version_list_widget.addItem(item)
+                if version['id'] == selected_id:
+                    self.version_list_widget.setCurrentItem(item)
+
+    def on_versions_refreshed(self, versions):
+        self.all_versions = versions
+        self.update_version_list()
+
+    def on_refresh_failed(self, message):
+        print(f"[Launcher] {message}")
+        if not self.all_versions:
+            self.progress_label.setText(message)
+            self.progress_label.show()
 
     def install_version(self):
         selected_item = self.version_list_widget.currentItem()
@@ -338,18 +486,22 @@ class AccountManagerDialog(QDialog):
         try:
             auth_data = minecraft_launcher_lib.microsoft_account.get_secure_login(code)
             
-            # Check if account already exists
-            if any(acc['uuid'] == auth_data["id"] for acc in self.config["accounts"]):
-                QMessageBox.warning(self, "Account Exists", "This Microsoft account is already registered.")
+            # Logging in again with a known account renews its tokens
+            existing = next((acc for acc in self.config["accounts"] if acc['uuid'] == auth_data["id"]), None)
+            if existing:
+                with self.config.lock:
+                    apply_msa_login(existing, auth_data)
+                self.config.save()
+                self.account_changed.emit()
+                QMessageBox.information(self, "Success", f"The login of Microsoft account '{existing['name']}' was renewed.")
                 return
 
             new_acc = {
                 "type": "msa",
                 "uuid": auth_data["id"],
-                "name": auth_data["name"],
-                "token": auth_data["access_token"],
-                "refresh_token": auth_data["refresh_token"]
+                "name": auth_data["name"]
             }
+            apply_msa_login(new_acc, auth_data) # Tokens and when they expire
             self.config.setdefault("accounts", []).append(new_acc)
             self.config["active_account_uuid"] = new_acc["uuid"] # Auto-select new account
             self.load_accounts()
@@ -360,7 +512,12 @@ class AccountManagerDialog(QDialog):
             QMessageBox.critical(self, "Login Failed", f"The Microsoft login failed.\nError: {e}")
 
     def add_offline_account(self):
-        text, ok = QInputDialog.getText(self, "Add Offline Account", "Enter username:")
+        try:
+            from random_username.generate import generate_username
+            suggestion = generate_username(1)[0]
+        except ImportError:
+            suggestion = ""
+        text, ok = QInputDialog.getText(self, "Add Offline Account", "Enter username:", text=suggestion)
         if ok and text.strip():
             username = text.strip()
             # Check if account name already exists
@@ -396,6 +553,394 @@ class AccountManagerDialog(QDialog):
         else:
             QMessageBox.warning(self, "No Selection", "Please select an account first.")
 
+class ModListDialog(QDialog):
+    """Lists the mods of a profile with their versions, dependencies and any detected problems."""
+    def __init__(self, mods_dir, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Installed Mods")
+        self.setGeometry(350, 350, 550, 450)
+        self.mods_dir = mods_dir
+        layout = QVBoxLayout(self)
+
+        self.header_label = QLabel(f"Reading the mods in {mods_dir}...")
+        layout.addWidget(self.header_label)
+        self.mod_list = QListWidget()
+        layout.addWidget(self.mod_list)
+        self.problems_label = QLabel("")
+        layout.addWidget(self.problems_label)
+        self.problem_list = QListWidget()
+        self.problem_list.hide()
+        layout.addWidget(self.problem_list)
+
+        # Opening jars and parsing their metadata can take a while for big packs
+        self.scan_thread = ModScanThread(mods_dir)
+        self.scan_thread.finished_signal.connect(self.show_mods)
+        self.scan_thread.start()
+
+    def show_mods(self, mods, problems):
+        self.header_label.setText(f"{len(mods)} mod(s) in {self.mods_dir}:")
+        for mod in sorted(mods, key=lambda m: (m["name"] or "").lower()):
+            if mod.get("error"):
+                continue
+            item = QListWidgetItem(f"{mod['name']} ({mod['id']}) {mod['version']}  [{mod['loader']}]  -  {mod['file']}")
+            if mod["depends"]:
+                item.setToolTip("Depends on: " + ", ".join(mod["depends"]))
+            self.mod_list.addItem(item)
+
+        self.problems_label.setText("Problems:" if problems else "No problems detected.")
+        if problems:
+            self.problem_list.addItems(problems)
+            self.problem_list.show()
+
+    def done(self, result):
+        # Don't let the dialog (and its thread) be destroyed mid-scan
+        self.scan_thread.wait()
+        super().done(result)
+
+class ServerDashboardDialog(QDialog):
+    """Live status of the profile's saved servers and any watched ones, with averages over recent pings."""
+    COLUMNS = ["Server", "Address", "Status", "Players", "Ping", "Avg Ping", "Avg Load", "Version"]
+    REFRESH_MS = 30000
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.config = main_window.config
+        self.monitor = main_window.server_monitor
+        self.servers = []
+        self.polling = False
+        # One worker for the dialog's lifetime; refreshes are queued to it
+        self.poll_thread = ServerStatusThread(self.monitor)
+        self.poll_thread.status_signal.connect(self.on_status)
+        self.poll_thread.error_signal.connect(self.on_poll_error)
+        self.poll_thread.poll_finished_signal.connect(self.on_poll_finished)
+        self.poll_thread.start()
+        self.setWindowTitle("Server Status")
+        self.setGeometry(300, 300, 800, 400)
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.itemDoubleClicked.connect(self.use_selected)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        add_layout = QHBoxLayout()
+        self.address_line = QLineEdit()
+        self.address_line.setPlaceholderText("Add a server, e.g. myserver.com:25565")
+        self.address_line.returnPressed.connect(self.add_server)
+        add_layout.addWidget(self.address_line)
+        add_button = QPushButton("Add")
+        add_button.clicked.connect(self.add_server)
+        add_layout.addWidget(add_button)
+        remove_button = QPushButton("Remove")
+        remove_button.clicked.connect(self.remove_server)
+        add_layout.addWidget(remove_button)
+        layout.addLayout(add_layout)
+
+        button_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(self.refresh_button)
+        button_layout.addStretch()
+        use_button = QPushButton("Join Selected")
+        use_button.clicked.connect(self.use_selected)
+        button_layout.addWidget(use_button)
+        layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def collect_servers(self):
+        """Saved servers from servers.dat (global and the selected profile), watched servers and the typed address."""
+        servers = []
+        mc_dir = self.config["minecraft_directory"]
+        version_id = self.main_window.selected_version()
+        sources = [os.path.join(mc_dir, "servers.dat")]
+        if version_id and "No installed versions" not in version_id:
+            sources.append(os.path.join(get_profile_path(mc_dir, version_id), "servers.dat"))
+        for path in sources:
+            if os.path.isfile(path):
+                servers.extend(dict(server, source="servers.dat") for server in read_servers_dat(path))
+        servers.extend(dict(server, source="watched") for server in self.config.get("watched_servers", []))
+        typed = self.main_window.server_line.text().strip()
+        if typed:
+            servers.append({"name": typed, "address": typed, "source": "typed"})
+        unique = {}
+        for server in servers:
+            unique.setdefault(server["address"], server)
+        return list(unique.values())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.servers = self.collect_servers()
+        self.table.setRowCount(len(self.servers))
+        for row, server in enumerate(self.servers):
+            self.table.setItem(row, 0, QTableWidgetItem(server["name"]))
+            self.table.setItem(row, 1, QTableWidgetItem(server["address"]))
+            self.update_row(row, server["address"], self.monitor.last_status(server["address"]), cached=True)
+        self.update_summary()
+        self.refresh()
+        self.refresh_timer.start(self.REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if not self.servers or self.polling:
+            return
+        self.polling = True
+        self.refresh_button.setEnabled(False)
+        self.poll_thread.request([server["address"] for server in self.servers])
+
+    def on_status(self, address, status):
+        for row, server in enumerate(self.servers):
+            if server["address"] == address:
+                self.update_row(row, address, status)
+
+    def on_poll_error(self, message):
+        self.refresh_timer.stop()
+        self.summary_label.setText(message)
+
+    def on_poll_finished(self):
+        self.polling = False
+        self.refresh_button.setEnabled(True)
+        self.update_summary()
+
+    def update_row(self, row, address, status, cached=False):
+        stats = self.monitor.stats(address)
+        if not status:
+            cells = ["Not checked yet", "", "", "", "", ""]
+        elif status.get("online"):
+            cells = [
+                "Online (cached)" if cached else "Online",
+                f"{status['players']}/{status['max_players']}",
+                f"{status['latency']:.0f} ms",
+                f"{stats['latency']:.0f} ms" if stats["latency"] is not None else "",
+                f"{stats['load']:.0%}" if stats["load"] is not None else "",
+                status.get("version", "")
+            ]
+        else:
+            cells = ["Offline (cached)" if cached else "Offline", "", "",
+                     f"{stats['latency']:.0f} ms" if stats["latency"] is not None else "",
+                     f"{stats['load']:.0%}" if stats["load"] is not None else "", ""]
+        for column, text in enumerate(cells, start=2):
+            item = QTableWidgetItem(text)
+            if status:
+                item.setToolTip(status.get("motd") or status.get("error", ""))
+            self.table.setItem(row, column, item)
+        history = [f"{s[1]:.0f}" if s[1] is not None else "-" for s in self.monitor.history(address)[-20:]]
+        if history:
+            self.table.item(row, 4).setToolTip("Recent pings (ms): " + " ".join(history))
+
+    def update_summary(self):
+        best = self.monitor.least_loaded([server["address"] for server in self.servers])
+        for row, server in enumerate(self.servers):
+            font = self.table.item(row, 0).font()
+            font.setBold(server["address"] == best)
+            for column in range(len(self.COLUMNS)):
+                if self.table.item(row, column):
+                    self.table.item(row, column).setFont(font)
+        if best:
+            self.summary_label.setText(f"Least loaded: <b>{best}</b> (averaged over recent pings)")
+        elif self.servers:
+            self.summary_label.setText("No server is reachable right now.")
+        else:
+            self.summary_label.setText("No servers yet. Add one below or save some in-game.")
+
+    def add_server(self):
+        address = self.address_line.text().strip()
+        if not address:
+            return
+        watched = self.config.setdefault("watched_servers", [])
+        if not any(server["address"] == address for server in watched):
+            watched.append({"name": address, "address": address})
+            self.config.save()
+        self.address_line.clear()
+        if not any(server["address"] == address for server in self.servers):
+            self.servers.append({"name": address, "address": address, "source": "watched"})
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.table.setItem(row, 0, QTableWidgetItem(address))
+            self.table.setItem(row, 1, QTableWidgetItem(address))
+            self.update_row(row, address, self.monitor.last_status(address), cached=True)
+        self.refresh()
+
+    def remove_server(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        server = self.servers[row]
+        if server["source"] != "watched":
+            QMessageBox.information(self, "Server Status", "Servers saved in-game can only be removed from the in-game server list.")
+            return
+        self.config["watched_servers"] = [s for s in self.config.get("watched_servers", []) if s["address"] != server["address"]]
+        self.config.save()
+        del self.servers[row]
+        self.table.removeRow(row)
+        self.update_summary()
+
+    def use_selected(self, *args):
+        row = self.table.currentRow()
+        if row >= 0:
+            self.main_window.server_line.setText(self.servers[row]["address"])
+            self.close()
+
+class InstanceSignals(QObject):
+    """Carries InstanceSupervisor callbacks from the instance threads to the GUI thread."""
+    output_signal = pyqtSignal(str, str)
+    state_signal = pyqtSignal(str, str, str)
+
+class InstancesDialog(QDialog):
+    """Launches several profiles at once with CPU/priority/memory limits, one console tab per instance."""
+    COLUMNS = ["Instance", "Version", "PID", "State", "Details"]
+    CONSOLE_MAX_LINES = 2000
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.setWindowTitle("Instances")
+        self.setGeometry(250, 250, 900, 600)
+        self.signals = InstanceSignals()
+        self.signals.output_signal.connect(self.append_output)
+        self.signals.state_signal.connect(self.update_state)
+        self.supervisor = InstanceSupervisor(main_window.config, on_output=self.signals.output_signal.emit,
+                                             on_state=self.signals.state_signal.emit,
+                                             token_refresher=main_window.token_refresher)
+        self.rows = {}
+        self.consoles = {}
+        # Instance output isn't logged, so the overflow policy is applied to each batch from the pump (every 50 ms)
+        self.overflow_policy = main_window.config.get("console_overflow_policy", "sample")
+        self.batch_budget = max(1, int(main_window.config.get("console_max_lines_per_second", 5000) * 0.05))
+
+        layout = QVBoxLayout(self)
+        form = QHBoxLayout()
+        form.addWidget(QLabel("Version:"))
+        self.version_combo = QComboBox()
+        form.addWidget(self.version_combo)
+        form.addWidget(QLabel("Instances:"))
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 16)
+        form.addWidget(self.count_spin)
+        form.addWidget(QLabel("CPUs:"))
+        self.cpus_edit = QLineEdit()
+        self.cpus_edit.setPlaceholderText("split evenly, or e.g. 0-3,6")
+        form.addWidget(self.cpus_edit)
+        form.addWidget(QLabel("Nice:"))
+        self.nice_spin = QSpinBox()
+        self.nice_spin.setRange(0, 19)
+        form.addWidget(self.nice_spin)
+        form.addWidget(QLabel("Memory cap (MB):"))
+        self.memory_spin = QSpinBox()
+        self.memory_spin.setRange(0, 65536)
+        self.memory_spin.setSingleStep(512)
+        self.memory_spin.setSpecialValueText("None")
+        form.addWidget(self.memory_spin)
+        launch_button = QPushButton("Launch")
+        launch_button.clicked.connect(self.launch_instances)
+        form.addWidget(launch_button)
+        layout.addLayout(form)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        stop_layout = QHBoxLayout()
+        stop_layout.addStretch()
+        stop_button = QPushButton("Stop Selected")
+        stop_button.clicked.connect(self.stop_selected)
+        stop_layout.addWidget(stop_button)
+        stop_all_button = QPushButton("Stop All")
+        stop_all_button.clicked.connect(self.supervisor.stop_all)
+        stop_layout.addWidget(stop_all_button)
+        layout.addLayout(stop_layout)
+
+        self.console_tabs = QTabWidget()
+        layout.addWidget(self.console_tabs, 1)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        selected = self.version_combo.currentText() or self.main_window.version_combo.currentText()
+        self.version_combo.clear()
+        combo = self.main_window.version_combo
+        if combo.isEnabled():
+            self.version_combo.addItems([combo.itemText(i) for i in range(combo.count())])
+            self.version_combo.setCurrentText(selected)
+
+    def launch_instances(self):
+        version_id = self.version_combo.currentText()
+        if not version_id:
+            QMessageBox.warning(self, "No Version", "Install a version first.")
+            return
+        count = self.count_spin.value()
+        try:
+            cpus = parse_cpu_list(self.cpus_edit.text()) if self.cpus_edit.text().strip() else None
+        except ValueError:
+            QMessageBox.warning(self, "Invalid CPU List", "Use CPU numbers and ranges, e.g. 0-3,6")
+            return
+        # Without an explicit list, instances get disjoint slices of the CPUs we may use
+        cpu_groups = [cpus] * count if cpus else (split_cpus(available_cpus(), count) if count > 1 else [None])
+
+        for i in range(count):
+            # Each instance gets its own profile folder (never the PLAY one) so they don't fight over
+            # worlds, logs and options; the supervisor links the version profile's mods into it
+            profile = f"{version_id}-{i + 1}"
+            name = profile
+            limits = InstanceLimits(cpus=cpu_groups[i], nice=self.nice_spin.value(), memory_mb=self.memory_spin.value())
+            try:
+                self.supervisor.launch(name, version_id, profile, limits)
+            except ValueError as e:
+                QMessageBox.warning(self, "Cannot Launch", str(e))
+                continue
+            self.add_instance_row(name, version_id)
+
+    def add_instance_row(self, name, version_id):
+        if name not in self.rows:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.rows[name] = row
+            console = QPlainTextEdit()
+            console.setReadOnly(True)
+            console.setUndoRedoEnabled(False)
+            console.setMaximumBlockCount(self.CONSOLE_MAX_LINES)
+            self.consoles[name] = console
+            self.console_tabs.addTab(console, name)
+        row = self.rows[name]
+        for column, text in enumerate([name, version_id, "", "starting", ""]):
+            self.table.setItem(row, column, QTableWidgetItem(text))
+
+    def append_output(self, name, text):
+        console = self.consoles.get(name)
+        if console:
+            text = "".join(limit_lines(text.splitlines(keepends=True), self.batch_budget, self.overflow_policy))
+            console.appendPlainText(text.rstrip("\n"))
+
+    def update_state(self, name, state, detail):
+        row = self.rows.get(name)
+        if row is None:
+            return
+        instance = self.supervisor.instances.get(name)
+        self.table.setItem(row, 2, QTableWidgetItem(str(instance.pid) if instance and instance.pid else ""))
+        self.table.setItem(row, 3, QTableWidgetItem(state))
+        self.table.setItem(row, 4, QTableWidgetItem(detail.splitlines()[0] if detail else ""))
+        self.table.item(row, 4).setToolTip(detail)
+
+    def stop_selected(self):
+        for name, row in self.rows.items():
+            if self.table.item(row, 0) and self.table.item(row, 0).isSelected():
+                self.supervisor.stop(name)
+
 class SettingsDialog(QDialog):
     """Dialog for advanced launcher settings."""
     def __init__(self, config, main_window, parent=None):
@@ -430,13 +975,27 @@ class SettingsDialog(QDialog):
         options_layout = QHBoxLayout()
         ram_v_layout = QVBoxLayout()
         ram_v_layout.addWidget(QLabel("RAM (MB):"))
+        self.ram_auto_check = QCheckBox("Automatic")
+        self.ram_auto_check.setChecked(self.config.get("ram_auto", True))
+        ram_v_layout.addWidget(self.ram_auto_check)
         self.ram_spin = QSpinBox()
         self.ram_spin.setRange(1024, 32768)
         self.ram_spin.setSingleStep(512)
         self.ram_spin.setValue(self.config.get("ram", 4096))
+        self.ram_spin.setDisabled(self.ram_auto_check.isChecked())
+        self.ram_auto_check.toggled.connect(self.ram_spin.setDisabled)
         ram_v_layout.addWidget(self.ram_spin)
         options_layout.addLayout(ram_v_layout)
 
+        gc_v_layout = QVBoxLayout()
+        gc_v_layout.addWidget(QLabel("Garbage Collector:"))
+        self.gc_combo = QComboBox()
+        for preset_id, preset in GC_PRESETS.items():
+            self.gc_combo.addItem(preset["label"], preset_id)
+        self.gc_combo.setCurrentIndex(max(0, self.gc_combo.findData(self.config.get("gc_preset", "g1"))))
+        gc_v_layout.addWidget(self.gc_combo)
+        options_layout.addLayout(gc_v_layout)
+
         loader_v_layout = QVBoxLayout()
         loader_v_layout.addWidget(QLabel("Mod Loader:"))
         self.loader_combo = QComboBox()
@@ -447,7 +1006,7 @@ class SettingsDialog(QDialog):
         layout.addLayout(options_layout)
 
         # JVM Arguments
-        layout.addWidget(QLabel("Extra JVM Arguments:"))
+        layout.addWidget(QLabel("Extra JVM Arguments (advanced, added after the preset):"))
         self.jvm_edit = QLineEdit(self.config.get("extra_jvm_args", ""))
         layout.addWidget(self.jvm_edit)
 
@@ -455,9 +1014,12 @@ class SettingsDialog(QDialog):
         util_layout = QHBoxLayout()
         clear_mods_button = QPushButton("Clear Current Profile's Mods")
         clear_mods_button.clicked.connect(self.clear_mods_folder)
+        verify_button = QPushButton("Verify Current Version")
+        verify_button.clicked.connect(self.verify_installation)
         clear_cache_button = QPushButton("Clear Launcher Cache")
         clear_cache_button.clicked.connect(self.clear_cache)
         util_layout.addWidget(clear_mods_button)
+        util_layout.addWidget(verify_button)
         util_layout.addWidget(clear_cache_button)
         layout.addLayout(util_layout)
 
@@ -475,7 +1037,7 @@ class SettingsDialog(QDialog):
         if path: self.java_path_edit.setText(path)
 
     def clear_mods_folder(self):
-        version_id = self.main_window.version_combo.currentText()
+        version_id = self.main_window.selected_version()
         if not version_id or "No installed versions" in version_id:
             QMessageBox.warning(self, "Warning", "Please select a valid version on the main window first.")
             return
@@ -495,6 +1057,23 @@ class SettingsDialog(QDialog):
         else:
             QMessageBox.information(self, "Info", "Mods folder does not exist for this profile yet.")
 
+    def verify_installation(self):
+        if self.main_window.verify_thread and self.main_window.verify_thread.isRunning():
+            QMessageBox.warning(self, "Warning", "A verification is already running. Progress is shown in the main window.")
+            return
+        version_id = self.main_window.selected_version()
+        if not version_id or "No installed versions" in version_id:
+            QMessageBox.warning(self, "Warning", "Please select a valid version on the main window first.")
+            return
+
+        # The thread lives on the main window so it keeps running after this dialog closes
+        thread = VerifyInstallThread(version_id, self.config["minecraft_directory"])
+        thread.progress_signal.connect(self.main_window.update_progress)
+        thread.finished_signal.connect(self.main_window.on_verify_finished)
+        self.main_window.verify_thread = thread
+        thread.start()
+        QMessageBox.information(self, "Verifying", f"Checking the files of {version_id}. Progress is shown in the main window.")
+
     def clear_cache(self):
         mc_dir = self.config["minecraft_directory"]
         paths_to_clear = [os.path.join(mc_dir, "assets", "indexes"), os.path.join(mc_dir, "assets", "objects"), os.path.join(mc_dir, "versions")]
@@ -513,6 +1092,8 @@ class SettingsDialog(QDialog):
         self.config["minecraft_directory"] = self.minecraft_folder_edit.text()
         self.config["java_path"] = self.java_path_edit.text()
         self.config["ram"] = self.ram_spin.value()
+        self.config["ram_auto"] = self.ram_auto_check.isChecked()
+        self.config["gc_preset"] = self.gc_combo.currentData()
         self.config["mod_loader"] = self.loader_combo.currentText()
         self.config["extra_jvm_args"] = self.jvm_edit.text()
         self.accept()
@@ -521,225 +1102,158 @@ class SettingsDialog(QDialog):
 # LAUNCH THREAD
 ###############################################################################
 class LaunchThread(QThread):
-    """Handles the entire game launch process in the background."""
+    """Runs the launch pipeline (launcher_core.LaunchPipeline) in the background."""
     progress_signal = pyqtSignal(int, int, str)
     state_signal = pyqtSignal(bool)
     error_signal = pyqtSignal(str)
     output_signal = pyqtSignal(str)
+    process_started_signal = pyqtSignal(int)
 
-    def __init__(self, config):
+    def __init__(self, config, token_refresher=None):
         super().__init__()
         self.config = config
         self.version_id = ""
-        self.process = None
-        self.process_output = ""
+        self.pipeline = LaunchPipeline(config, on_progress=self.progress_signal.emit, on_output=self.output_signal.emit,
+                                       token_refresher=token_refresher)
 
     def setup_launch(self, version_id):
         self.version_id = version_id
 
     def run(self):
         self.state_signal.emit(True)
-
-        # 1. Get Active Account
-        active_uuid = self.config.get("active_account_uuid")
-        if not active_uuid:
-            self.error_signal.emit("No account selected. Please select an account in the Account Manager.")
-            self.state_signal.emit(False)
-            return
-
-        account = next((acc for acc in self.config["accounts"] if acc["uuid"] == active_uuid), None)
-        if not account:
-            self.error_signal.emit("Active account not found. Please re-select it in the Account Manager.")
-            self.state_signal.emit(False)
-            return
-            
-        # 2. Refresh MSA Token if needed
-        if account["type"] == "msa":
-            try:
-                self.progress_signal.emit(0, 0, "Refreshing Microsoft login...")
-                new_auth_data = minecraft_launcher_lib.microsoft_account.refresh_login(account["refresh_token"])
-                account.update({
-                    "token": new_auth_data["access_token"],
-                    "refresh_token": new_auth_data["refresh_token"]
-                })
-                save_config(self.config) # Save the refreshed tokens
-            except Exception as e:
-                self.error_signal.emit(f"Failed to refresh Microsoft login: {e}\nPlease try adding the account again.")
-                self.state_signal.emit(False)
-                return
-
-        # 3. Potentially install Fabric or Forge
-        final_version_id = self.version_id
-        mod_loader = self.config.get("mod_loader", "None")
-        mc_dir = self.config.get("minecraft_directory")
-        callback = {
-            "setStatus": lambda text: self.progress_signal.emit(0, 0, text),
-            "setProgress": lambda val: self.progress_signal.emit(val, 100, f"Installing {mod_loader}..."),
-            "setMax": lambda val: None
-        }
-
         try:
-            if mod_loader == "Fabric":
-                self.progress_signal.emit(0, 0, "Installing Fabric...")
-                final_version_id = minecraft_launcher_lib.fabric.install_fabric(self.version_id, mc_dir, callback=callback)
-            elif mod_loader == "Forge":
-                self.progress_signal.emit(0, 0, "Installing Forge...")
-                # Get the latest Forge version for our Minecraft version
-                forge_versions = minecraft_launcher_lib.forge.list_forge_versions()
-                matching_versions = [v for v in forge_versions if v.startswith(self.version_id)]
-                if not matching_versions:
-                    raise Exception(f"No Forge version found for Minecraft {self.version_id}")
-                
-                # Use the latest Forge version
-                forge_version = matching_versions[0]
-                minecraft_launcher_lib.forge.install_forge_version(forge_version, mc_dir, callback=callback)
-                final_version_id = forge_version
-        except Exception as e:
-            self.error_signal.emit(f"Failed to install {mod_loader}: {str(e)}")
-            self.state_signal.emit(False)
-            return
-            
-        # 4. Build Launch Options
-        ram_mb = self.config.get("ram", 4096)
-        profile_dir = get_profile_path(mc_dir, self.version_id)
-        
-        options = {
-            "username": account["name"],
-            "uuid": account["uuid"],
-            "token": account.get("token", ""), # Empty for offline
-            "jvmArguments": [f"-Xmx{ram_mb}M", f"-Xms{ram_mb}M"],
-            "gameDirectory": profile_dir,
-            "executablePath": self.config.get("java_path") or self.find_java_executable()
-        }
-        
-        # Ensure Java executable exists
-        if not os.path.isfile(options["executablePath"]):
-            self.error_signal.emit(f"Java executable not found at: {options['executablePath']}\nPlease set a valid Java path in Settings.")
-            self.state_signal.emit(False)
-            return
-
-        extra_jvm_args = self.config.get("extra_jvm_args", "").strip()
-        if extra_jvm_args:
-            options["jvmArguments"].extend(extra_jvm_args.split())
-
-        server_address = self.config.get("server", "").strip()
-        if server_address:
-            try:
-                host, port = server_address.split(":")
-                options["server"] = host
-                options["port"] = int(port)
-            except ValueError:
-                options["server"] = server_address
-                options["port"] = 25565
-
-        # Ensure profile directory and its mods folder exist
-        profile_mods_dir = os.path.join(profile_dir, "mods")
-        os.makedirs(profile_mods_dir, exist_ok=True)
-
-        # 5. Build and run command
-        try:
-            # Let the library find the full version ID (e.g., with Forge)
-            command = minecraft_launcher_lib.command.get_minecraft_command(final_version_id, mc_dir, options)
-            
-            # Print command for debugging
-            print(f"[Launcher] Launching with command: {' '.join(command)}")
-            self.output_signal.emit(f"Launching Minecraft {final_version_id}...\n")
-            
-            # Launch the game
-            self.process = Popen(command, stdout=PIPE, stderr=STDOUT, universal_newlines=True, bufsize=1)
-            
-            # Stream output to console
-            for line in iter(self.process.stdout.readline, ''):
-                self.output_signal.emit(line)
-                
-            # Wait for process to finish
-            self.process.stdout.close()
-            return_code = self.process.wait()
-            
-            if return_code != 0:
-                self.output_signal.emit(f"\nMinecraft exited with error code: {return_code}")
-            else:
-                self.output_signal.emit("\nMinecraft exited successfully")
-                
-        except minecraft_launcher_lib.exceptions.VersionNotFound:
-             self.error_signal.emit(f"Version '{final_version_id}' not found. It might be corrupted or a loader failed to install. Try reinstalling it.")
+            plan = self.pipeline.prepare(self.version_id)
+            return_code, report = self.pipeline.run(plan, on_started=self.process_started_signal.emit)
+            if report:
+                self.error_signal.emit(f"Minecraft crashed (exit code {return_code}).\n\n{report}")
+        except LaunchError as e:
+            self.error_signal.emit(str(e))
         except Exception as e:
             self.error_signal.emit(f"An error occurred during launch: {e}")
         finally:
             self.state_signal.emit(False)
 
-    def find_java_executable(self):
-        """Finds a suitable Java executable"""
-        # Try system default
-        try:
-            java_path = minecraft_launcher_lib.utils.get_java_executable()
-            if java_path and os.path.isfile(java_path):
-                return java_path
-        except:
-            pass
-        
-        # Try common locations
-        common_paths = []
-        if sys.platform == "win32":
-            common_paths = [
-                os.path.join(os.getenv("ProgramFiles"), "Java", "jdk-*", "bin", "java.exe"),
-                os.path.join(os.getenv("ProgramFiles(x86)"), "Java", "jdk-*", "bin", "java.exe"),
-                os.path.join(os.getenv("ProgramFiles"), "Java", "jre*", "bin", "java.exe"),
-                os.path.join(os.getenv("ProgramFiles(x86)"), "Java", "jre*", "bin", "java.exe")
-            ]
-        elif sys.platform == "darwin":
-            common_paths = [
-                "/Library/Java/JavaVirtualMachines/jdk-*.jdk/Contents/Home/bin/java",
-                "/Library/Internet Plug-Ins/JavaAppletPlugin.plugin/Contents/Home/bin/java"
-            ]
-        else:  # Linux
-            common_paths = [
-                "/usr/lib/jvm/java-*-openjdk-*/bin/java",
-                "/usr/lib/jvm/java-*-oracle-*/bin/java",
-                "/usr/bin/java"
-            ]
-        
-        # Search for Java in common paths
-        for pattern in common_paths:
-            for path in glob.glob(pattern):
-                if os.path.isfile(path):
-                    return path
-        
-        # Last resort
-        return "java"  # Hope it's in PATH
+###############################################################################
+# TELEMETRY CHART
+###############################################################################
+class TelemetryChart(QWidget):
+    """Sparklines of the running game's CPU, memory, threads and disk I/O."""
+    HISTORY = 300
+    PANELS = [
+        ("CPU", lambda s: s["cpu_percent"], "{:.0f}%", "#4FC3F7"),
+        ("RSS", lambda s: s["rss_mb"], "{:.0f} MB", "#81C784"),
+        ("Threads", lambda s: s["threads"], "{:.0f}", "#FFB74D"),
+        ("Disk I/O", lambda s: s["read_mb_per_s"] + s["write_mb_per_s"], "{:.1f} MB/s", "#E57373")
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(80)
+        self.setMaximumHeight(100)
+        self.reset()
+
+    def reset(self):
+        self.values = [[] for _ in self.PANELS]
+        self.last_sample = None
+        self.update()
+
+    def add_sample(self, sample):
+        for values, (_, value_of, _, _) in zip(self.values, self.PANELS):
+            values.append(value_of(sample))
+            del values[:-self.HISTORY]
+        self.last_sample = sample
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor("#3C3F41"))
+        if not self.last_sample:
+            painter.setPen(QColor("#888888"))
+            painter.drawText(self.rect(), Qt.AlignCenter, "Game telemetry appears here while Minecraft runs")
+            return
+        width = self.width() / len(self.PANELS)
+        height = self.height()
+        for i, ((title, _, fmt, color), values) in enumerate(zip(self.PANELS, self.values)):
+            left = i * width
+            painter.setPen(QColor("#E0E0E0"))
+            painter.drawText(int(left + 6), 14, f"{title}: {fmt.format(values[-1])}")
+            top, bottom = 20, height - 4
+            peak = max(max(values), 1e-9)
+            step = (width - 12) / max(self.HISTORY - 1, 1)
+            start = left + 6 + (self.HISTORY - len(values)) * step
+            points = [QPointF(start + n * step, bottom - (bottom - top) * value / peak) for n, value in enumerate(values)]
+            painter.setPen(QPen(QColor(color), 1.5))
+            painter.drawPolyline(QPolygonF(points))
+        painter.end()
 
 ###############################################################################
 # MAIN WINDOW
 ###############################################################################
 class MainWindow(QMainWindow):
-    def __init__(self):
+    CONSOLE_MAX_LINES = 5000
+    CONSOLE_TAIL_LINES = 200
+    CONSOLE_FLUSH_MS = 100
+    telemetry_signal = pyqtSignal(dict)
+
+    def __init__(self, profiler=None):
         super().__init__()
+        self.profiler = profiler or StartupProfiler(enabled=False)
         self.setWindowTitle("Command Launcher Client V2.0")
         self.setWindowIcon(QIcon("Command_Block_(Story_Mode).ico"))
         self.resize(800, 600)
 
         self.config = load_config()
+        self.profiler.mark("load config")
+
+        # Console output is buffered here from any thread and rendered in batches by a timer
+        self.console_buffer = ConsoleBuffer(max_lines=self.CONSOLE_MAX_LINES, policy=self.config.get("console_overflow_policy", "sample"),
+                                            max_lines_per_drain=max(1, self.config.get("console_max_lines_per_second", 5000) * self.CONSOLE_FLUSH_MS // 1000))
 
         # Threads
-        self.launch_thread = LaunchThread(self.config)
-        self.ping_thread = None
+        # Renews MSA tokens ahead of expiry so PLAY doesn't wait on Microsoft
+        self.token_refresher = MsaTokenRefresher(self.config)
+        self.token_refresher.start()
+        self.launch_thread = LaunchThread(self.config, self.token_refresher)
+        self.server_monitor = ServerStatusMonitor()
+        self.server_dashboard = None
+        self.instances_dialog = None
+        self.sampler = None
+        self.version_index = InstalledVersionIndex()
+        self.version_scan_thread = None
+        self.versions_mc_dir = None # The folder the version combo currently lists
+        self.version_rescan_pending = False
+
+        # Rescan the installed versions when the versions folder changes, once things settle
+        self.versions_watcher = QFileSystemWatcher(self)
+        self.versions_rescan_timer = QTimer(self)
+        self.versions_rescan_timer.setSingleShot(True)
+        self.versions_rescan_timer.setInterval(500)
+        self.versions_rescan_timer.timeout.connect(self.load_installed_versions)
+        self.versions_watcher.directoryChanged.connect(self.versions_rescan_timer.start)
+        self.verify_thread = None
+        self.modpack_thread = None
 
         # Signals
         self.launch_thread.progress_signal.connect(self.update_progress)
         self.launch_thread.state_signal.connect(self.on_state_change)
         self.launch_thread.error_signal.connect(self.show_error)
         self.launch_thread.output_signal.connect(self.append_console_text)
+        self.launch_thread.process_started_signal.connect(self.on_process_started)
 
         # UI Setup
         self.setup_ui()
+        self.profiler.mark("build main window")
         
         # Initial state
         self.update_account_display()
         self.load_installed_versions()
         self.server_line.setText(self.config.get("server", ""))
+        self.profiler.mark("list installed versions")
 
         # Console
         self.setup_console()
+        self.profiler.mark("console")
     
     def setup_ui(self):
         central_widget = QWidget()
@@ -774,8 +1288,8 @@ class MainWindow(QMainWindow):
         self.server_line = QLineEdit()
         self.server_line.setPlaceholderText("e.g., myserver.com:25565")
         server_layout.addWidget(self.server_line)
-        ping_button = QPushButton("Ping")
-        ping_button.clicked.connect(self.ping_server)
+        ping_button = QPushButton("Server Status")
+        ping_button.clicked.connect(self.open_server_dashboard)
         server_layout.addWidget(ping_button)
         main_layout.addLayout(server_layout)
 
@@ -807,17 +1321,22 @@ class MainWindow(QMainWindow):
         game_folders_button.setPopupMode(QToolButton.InstantPopup)
         folder_menu = QMenu()
         folder_menu.addAction("Open Mods Folder", self.open_mods_folder)
+        folder_menu.addAction("Show Installed Mods", self.show_installed_mods)
         folder_menu.addAction("Open Resource Packs Folder", lambda: self.open_game_folder("resourcepacks"))
         folder_menu.addAction("Open Shader Packs Folder", lambda: self.open_game_folder("shaderpacks"))
         folder_menu.addAction("Open Screenshots Folder", lambda: self.open_game_folder("screenshots"))
         game_folders_button.setMenu(folder_menu)
 
-        modpack_button = QPushButton("Load Modpack (.zip)")
+        modpack_button = QPushButton("Load Modpack (.zip/.mrpack)")
         modpack_button.clicked.connect(self.load_modpack_action)
 
+        self.instances_button = QPushButton("Run Instances...")
+        self.instances_button.clicked.connect(self.open_instances)
+
         controls_v_layout.addWidget(install_version_button)
         controls_v_layout.addWidget(game_folders_button)
         controls_v_layout.addWidget(modpack_button)
+        controls_v_layout.addWidget(self.instances_button)
         bottom_layout.addLayout(controls_v_layout)
         
         main_layout.addLayout(bottom_layout)
@@ -840,10 +1359,21 @@ class MainWindow(QMainWindow):
         console_layout = QVBoxLayout(console_widget)
         console_layout.setContentsMargins(2,2,2,2)
 
+        self.telemetry_chart = TelemetryChart()
+        self.telemetry_chart.setVisible(ProcessSampler.supported())
+        self.telemetry_signal.connect(self.telemetry_chart.add_sample)
+        console_layout.addWidget(self.telemetry_chart)
+
         self.console_text = QPlainTextEdit()
         self.console_text.setReadOnly(True)
+        self.console_text.setUndoRedoEnabled(False)
+        self.console_text.setMaximumBlockCount(self.CONSOLE_MAX_LINES) # Oldest lines only live in the log file
         console_layout.addWidget(self.console_text)
 
+        self.console_timer = QTimer(self)
+        self.console_timer.timeout.connect(self.flush_console)
+        self.console_timer.start(self.CONSOLE_FLUSH_MS)
+
         console_actions_layout = QHBoxLayout()
         self.console_button = QPushButton("Toggle Console") # Moved button
         self.console_button.setCheckable(True)
@@ -852,8 +1382,15 @@ class MainWindow(QMainWindow):
 
         save_log_button = QPushButton("Save Log")
         save_log_button.clicked.connect(self.save_console_log)
+        copy_tail_button = QPushButton("Copy Last Lines")
+        copy_tail_button.clicked.connect(self.copy_console_tail)
+        export_telemetry_button = QPushButton("Export Telemetry")
+        export_telemetry_button.clicked.connect(self.export_telemetry)
+        export_telemetry_button.setVisible(ProcessSampler.supported())
         console_actions_layout.addWidget(self.console_button)
         console_actions_layout.addWidget(save_log_button)
+        console_actions_layout.addWidget(copy_tail_button)
+        console_actions_layout.addWidget(export_telemetry_button)
         console_layout.addLayout(console_actions_layout)
 
         self.console_dock.setWidget(console_widget)
@@ -865,14 +1402,14 @@ class MainWindow(QMainWindow):
         sys.stderr = EmittingStream(self.append_console_text)
 
     def play_game(self):
-        version_id = self.version_combo.currentText()
+        version_id = self.selected_version()
         if not version_id or "No installed versions" in version_id:
             self.show_error("No Minecraft version selected!")
             return
 
         # Save current server input to config before launch
         self.config["server"] = self.server_line.text().strip()
-        save_config(self.config)
+        self.config.save()
 
         print(f"[Launcher] Preparing to launch version: {version_id}")
         self.launch_thread.setup_launch(version_id)
@@ -882,15 +1419,16 @@ class MainWindow(QMainWindow):
     def open_settings(self):
         dlg = SettingsDialog(self.config, self, self)
         if dlg.exec_() == QDialog.Accepted:
-            save_config(self.config)
+            self.config.save()
             self.load_installed_versions() # Minecraft dir might have changed
             print("[Launcher] Settings saved.")
 
     def open_account_manager(self):
         dlg = AccountManagerDialog(self.config, self)
         dlg.account_changed.connect(self.update_account_display)
+        dlg.account_changed.connect(self.token_refresher.wake) # Schedule the new account's refresh now
         dlg.exec_()
-        save_config(self.config)
+        self.config.save()
 
     def open_version_installer(self):
         dlg = VersionInstallDialog(self.config["minecraft_directory"], self)
@@ -898,27 +1436,49 @@ class MainWindow(QMainWindow):
         dlg.exec_()
 
     def load_modpack_action(self):
-        version_id = self.version_combo.currentText()
+        if self.modpack_thread and self.modpack_thread.isRunning():
+            self.show_error("A modpack is already being loaded. Please wait for it to finish.")
+            return
+        version_id = self.selected_version()
         if not version_id or "No installed versions" in version_id:
             self.show_error("Please select a target version/profile first.")
             return
 
-        zip_path, _ = QFileDialog.getOpenFileName(self, "Select Modpack File", "", "Zip Files (*.zip)")
+        zip_path, _ = QFileDialog.getOpenFileName(self, "Select Modpack File", "", "Modpacks (*.zip *.mrpack)")
         if zip_path:
             profile_dir = get_profile_path(self.config["minecraft_directory"], version_id)
-            load_modpack(zip_path, profile_dir)
+            self.modpack_thread = ModpackExtractThread(zip_path, profile_dir, self.config.get("curseforge_api_key", ""))
+            self.modpack_thread.progress_signal.connect(self.update_progress)
+            self.modpack_thread.finished_signal.connect(self.on_modpack_finished)
+            self.modpack_thread.start()
+
+    def on_modpack_finished(self, success, message):
+        self.progress_label.hide()
+        self.progress_bar.hide()
+        if success:
+            QMessageBox.information(self, "Modpack Loaded", message)
+        else:
+            self.show_error(message)
 
     # FOLDER HANDLERS
     def open_mods_folder(self):
-        version_id = self.version_combo.currentText()
+        version_id = self.selected_version()
         if not version_id or "No installed versions" in version_id:
             self.show_error("Please select a version first to open its corresponding mods folder.")
             return
         self.open_game_folder("mods", version_id)
 
+    def show_installed_mods(self):
+        version_id = self.selected_version()
+        if not version_id or "No installed versions" in version_id:
+            self.show_error("Please select a version first to list its mods.")
+            return
+        mods_dir = os.path.join(get_profile_path(self.config["minecraft_directory"], version_id), "mods")
+        ModListDialog(mods_dir, self).exec_()
+
     def open_game_folder(self, folder_name, version_id=None):
         if version_id is None:
-            version_id = self.version_combo.currentText()
+            version_id = self.selected_version()
             if not version_id or "No installed versions" in version_id:
                 self.show_error("Please select a version first.")
                 return
@@ -928,24 +1488,78 @@ class MainWindow(QMainWindow):
         open_folder_in_explorer(target_path)
 
     # UTILITY AND UI UPDATE METHODS
+    def selected_version(self):
+        """The version picked in the combo, or "" while it shows nothing launchable (loading, error)."""
+        return self.version_combo.currentText() if self.version_combo.isEnabled() else ""
+
     def load_installed_versions(self):
+        """Shows the last known version list right away and rescans in the background."""
         mc_dir = self.config.get("minecraft_directory")
-        self.version_combo.clear()
-        try:
-            installed = minecraft_launcher_lib.utils.get_installed_versions(mc_dir)
-            if not installed:
-                self.version_combo.addItem("No installed versions found!")
-                self.version_combo.setEnabled(False)
+        if mc_dir != self.versions_mc_dir:
+            # The combo lists another folder's versions; drop them so nothing launches against the wrong one
+            self.versions_mc_dir = mc_dir
+            self.version_combo.clear()
+            cached = self.version_index.cached(mc_dir)
+            if cached is not None:
+                self.show_installed_versions(cached)
             else:
-                self.version_combo.setEnabled(True)
-                # Sort versions, perhaps putting latest release first
-                installed.sort(key=lambda x: x.get('releaseTime', ''), reverse=True)
-                for ver in installed:
-                    self.version_combo.addItem(ver["id"])
-        except Exception as e:
-            self.show_error(f"Failed to load versions from '{mc_dir}'. Error: {e}")
-            self.version_combo.addItem("Error loading versions!")
+                self.version_combo.addItem("Loading versions...")
+                self.version_combo.setEnabled(False)
+        if self.version_scan_thread and self.version_scan_thread.isRunning():
+            self.version_rescan_pending = True
+            return
+        self.version_scan_thread = VersionScanThread(self.version_index, mc_dir)
+        self.version_scan_thread.versions_signal.connect(self.on_versions_scanned)
+        self.version_scan_thread.error_signal.connect(self.on_version_scan_failed)
+        self.version_scan_thread.finished.connect(self.on_version_scan_finished)
+        self.version_scan_thread.start()
+
+    def on_versions_scanned(self, mc_dir, installed):
+        if mc_dir != self.config.get("minecraft_directory"):
+            self.version_rescan_pending = True # The folder changed while scanning
+            return
+        self.show_installed_versions(installed)
+        self.watch_versions_folder(mc_dir, installed)
+
+    def on_version_scan_failed(self, mc_dir, error):
+        if mc_dir != self.config.get("minecraft_directory"):
+            return # A stale folder; the pending rescan covers the current one
+        self.show_error(f"Failed to load versions from '{mc_dir}'. Error: {error}")
+        self.version_combo.clear()
+        self.version_combo.addItem("Error loading versions!")
+        self.version_combo.setEnabled(False)
+
+    def on_version_scan_finished(self):
+        if self.version_rescan_pending:
+            self.version_rescan_pending = False
+            self.load_installed_versions()
+
+    def show_installed_versions(self, installed):
+        """Fills the version combo (newest release first), keeping the current selection if it still exists."""
+        selected = self.version_combo.currentText()
+        self.version_combo.clear()
+        if not installed:
+            self.version_combo.addItem("No installed versions found!")
             self.version_combo.setEnabled(False)
+            return
+        self.version_combo.setEnabled(True)
+        for ver in installed:
+            self.version_combo.addItem(ver["id"])
+        index = self.version_combo.findText(selected)
+        if index >= 0:
+            self.version_combo.setCurrentIndex(index)
+
+    def watch_versions_folder(self, mc_dir, installed):
+        # The versions folder reports added/removed versions, each version's folder a rewritten JSON
+        versions_dir = os.path.join(mc_dir, "versions")
+        wanted = {versions_dir if os.path.isdir(versions_dir) else mc_dir}
+        wanted.update(os.path.join(versions_dir, ver["id"]) for ver in installed)
+        wanted = {path for path in wanted if os.path.isdir(path)}
+        current = set(self.versions_watcher.directories())
+        if current - wanted:
+            self.versions_watcher.removePaths(list(current - wanted))
+        if wanted - current:
+            self.versions_watcher.addPaths(list(wanted - current))
 
 
     def update_account_display(self):
@@ -957,34 +1571,91 @@ class MainWindow(QMainWindow):
         else:
             self.account_label.setText("<i>No account selected. Please use the Account Manager.</i>")
 
-    def ping_server(self):
-        server_address = self.server_line.text().strip()
-        if not server_address:
-            self.show_error("Please enter a server address to ping.")
-            return
-
-        self.ping_thread = ServerPingThread(server_address)
-        self.ping_thread.result_signal.connect(lambda result: QMessageBox.information(self, "Server Status", result))
-        self.ping_thread.start()
+    def on_asset_downloaded(self, path):
+        if path.endswith(".ico"):
+            self.setWindowIcon(QIcon(path))
+        else:
+            self.logo_label.setPixmap(QPixmap(path))
+
+    def open_instances(self):
+        # Kept alive while hidden so running instances keep their consoles
+        if self.instances_dialog is None:
+            self.instances_dialog = InstancesDialog(self)
+        self.instances_dialog.show()
+        self.instances_dialog.raise_()
+        self.instances_dialog.activateWindow()
+
+    def open_server_dashboard(self):
+        # Kept alive between openings so polling threads and history survive closing it
+        if self.server_dashboard is None:
+            self.server_dashboard = ServerDashboardDialog(self)
+        self.server_dashboard.show()
+        self.server_dashboard.raise_()
+        self.server_dashboard.activateWindow()
 
     def append_console_text(self, text):
-        self.console_text.moveCursor(self.console_text.textCursor().End)
-        self.console_text.insertPlainText(text)
+        # Safe to call from any thread; flush_console renders it on the GUI thread
+        self.console_buffer.append(text)
+
+    def flush_console(self):
+        text = self.console_buffer.drain()
+        if not text:
+            return
+        scrollbar = self.console_text.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        cursor = self.console_text.textCursor()
+        cursor.movePosition(cursor.End)
+        cursor.insertText(text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
 
     def save_console_log(self):
-        log_content = self.console_text.toPlainText()
-        if not log_content:
+        if not self.console_buffer.bytes_written:
             QMessageBox.information(self, "Empty Log", "There is nothing in the console to save.")
             return
         
         path, _ = QFileDialog.getSaveFileName(self, "Save Log File", "launcher_log.txt", "Text Files (*.txt)")
         if path:
             try:
-                with open(path, "w", encoding='utf-8') as f:
-                    f.write(log_content)
+                self.console_buffer.save_to(path)
             except Exception as e:
                 self.show_error(f"Failed to save log: {e}")
 
+    def copy_console_tail(self):
+        # Handy for bug reports; the full session is in the log file
+        lines = self.console_buffer.tail(self.CONSOLE_TAIL_LINES)
+        QApplication.clipboard().setText("\n".join(lines))
+        print(f"[Launcher] Copied the last {len(lines)} console line(s) to the clipboard")
+
+    def on_process_started(self, pid):
+        if not ProcessSampler.supported():
+            return
+        if self.sampler:
+            self.sampler.stop()
+        self.telemetry_chart.reset()
+        self.sampler = ProcessSampler(pid, interval=self.config.get("telemetry_interval", 1.0), on_sample=self.telemetry_signal.emit)
+        self.sampler.start()
+
+    def export_telemetry(self):
+        if not self.sampler or not self.sampler.series("time"):
+            QMessageBox.information(self, "No Telemetry", "Launch the game first; samples are kept until the next launch.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Telemetry", "telemetry.json.gz",
+                                                            "Columnar JSON (*.json.gz);;CSV (*.csv)")
+        if path:
+            try:
+                self.sampler.export(path)
+            except Exception as e:
+                self.show_error(f"Failed to export telemetry: {e}")
+
+    def on_verify_finished(self, success, message):
+        self.progress_label.hide()
+        self.progress_bar.hide()
+        if success:
+            QMessageBox.information(self, "Verify Installation", message)
+        else:
+            self.show_error(message)
+
     def update_progress(self, current, maximum, text):
         self.progress_label.setText(text)
         self.progress_label.show()
@@ -997,13 +1668,13 @@ class MainWindow(QMainWindow):
         for widget in self.centralWidget().findChildren(QPushButton) + self.centralWidget().findChildren(QToolButton):
             widget.setDisabled(is_running)
         self.console_button.setDisabled(False) # Always allow console toggle
+        self.instances_button.setDisabled(False) # Instances run independently of the main launch
         
         if not is_running:
             # Hide progress bar when not running
             self.progress_label.hide()
             self.progress_bar.hide()
-            # Refresh config in case MSA tokens were updated
-            self.config = load_config()
+            # The launch thread shares this config, so refreshed MSA tokens are already here
             self.update_account_display()
 
     def show_error(self, msg):
@@ -1012,7 +1683,21 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Ensures config is saved on exit."""
-        save_config(self.config)
+        if self.instances_dialog and self.instances_dialog.supervisor.running():
+            reply = QMessageBox.question(self, "Instances Running", "Stop the running instances and quit?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+            self.instances_dialog.supervisor.stop_all()
+        self.token_refresher.stop()
+        self.config.flush()
+        self.console_buffer.close()
+        # A status poll is bounded by its per-server timeout
+        if self.server_dashboard:
+            self.server_dashboard.poll_thread.stop()
+            self.server_dashboard.poll_thread.wait()
+        if self.version_scan_thread:
+            self.version_scan_thread.wait()
         event.accept()
 
 ###############################################################################
@@ -1020,17 +1705,7 @@ class MainWindow(QMainWindow):
 ###############################################################################
 def main():
     app = QApplication(sys.argv)
-    
-    # Splash Screen
-    splash_pix = QPixmap("assets/title.png") # Make sure this asset exists
-    splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
-    splash.show()
-
-    # Main Window (created but not shown yet)
-    window = MainWindow()
-
-    # Hide splash and show main window after a delay
-    QTimer.singleShot(3000, lambda: (splash.close(), window.show()))
+    profiler.mark("QApplication")
 
     # Global Stylesheet (QSS)
     app.setStyleSheet("""
@@ -1088,22 +1763,49 @@ def main():
             background-color: #3C3F41;
         }
     """)
-
-    sys.exit(app.exec_())
+    profiler.mark("stylesheet")
+    
+    # Splash Screen, up only until the main window is ready
+    splash_pix = QPixmap("assets/title.png") # Downloaded in the background if missing
+    splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
+    splash.show()
+    app.processEvents()
+    profiler.mark("splash")
+
+    window = MainWindow(profiler)
+    window.show()
+    splash.finish(window)
+    profiler.mark("show main window")
+
+    asset_thread = AssetDownloadThread()
+    asset_thread.downloaded_signal.connect(window.on_asset_downloaded)
+    asset_thread.start()
+
+    if profiler.enabled:
+        # The first event loop pass paints the window
+        def report():
+            profiler.mark("first paint")
+            # sys.stdout is the console dock by now; the report is for the terminal, if there is one
+            if sys.__stdout__ is not None:
+                sys.__stdout__.write(profiler.report() + "\n")
+                sys.__stdout__.flush()
+            app.quit()
+        QTimer.singleShot(0, report)
+
+    exit_code = app.exec_()
+    # Don't hold up quitting for a slow download; a half-written .part file is ignored next time
+    asset_thread.requestInterruption()
+    if not asset_thread.wait(ASSET_THREAD_WAIT_MS):
+        # Still stuck in a network call. The config is already saved, and letting Python tear
+        # down a running QThread would abort the process, so leave right away.
+        os._exit(exit_code)
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
-    # Create required asset/icon files if they don't exist
+    # The integrity verifier hashes on a process pool, which frozen Windows builds need this for
+    multiprocessing.freeze_support()
+
+    # Create required asset/icon folder if it doesn't exist
     if not os.path.isdir("assets"): os.makedirs("assets")
-    # A simple placeholder icon/image if the real ones are missing
-    if not os.path.isfile("Command_Block_(Story_Mode).ico"):
-        try:
-            from urllib import request
-            request.urlretrieve("https://static.wikia.nocookie.net/minecraftstorymode/images/d/d4/Command_Block_%28Story_Mode%29.png/revision/latest?cb=20230225211910", "Command_Block_(Story_Mode).ico")
-        except: pass
-    if not os.path.isfile("assets/title.png"):
-        try:
-            from urllib import request
-            request.urlretrieve("https://i.imgur.com/rS2Fk9z.png", "assets/title.png") # A generic placeholder
-        except: pass
 
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,389 @@
+# Command Launcher Client V2.0 - Benchmarks
+#
+# Times the launch and install pipeline against a synthetic minecraft_directory
+# served by a local HTTP stand-in, so runs are repeatable and need no network.
+# Only launcher_core is used (no Qt); stages that need minecraft_launcher_lib
+# are reported as skipped when it isn't installed.
+#
+# Examples:
+#   python launcher_bench.py
+#   python launcher_bench.py --assets 5000 --mods 300 --output bench.json
+#   python launcher_bench.py --baseline bench.json --tolerance 0.25   # exit code 1 on regressions
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import launcher_core
+from launcher_core import (ConfigStore, default_config, InstalledVersionIndex, DownloadEngine, SharedStore,
+                           prefetch_version, ForgeCatalogue, LaunchPipeline, LaunchPlanCache, ModpackImporter,
+                           ModIndex, ConsoleBuffer, OutputPump)
+
+# Forge catalogue lookups split on the first "-", so the synthetic version must look like a real one
+BENCH_VERSION = "1.99.0"
+FORGE_VERSION = f"{BENCH_VERSION}-99.0.0"
+
+
+###############################################################################
+# LOCAL HTTP STAND-IN
+###############################################################################
+class QuietHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real CDNs
+    disable_nagle_algorithm = True # Headers and body go out in separate writes; don't let delayed ACKs time the stand-in
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_directory(root):
+    """Serves root over HTTP on a free local port. Returns (server, base URL)."""
+    handler = lambda *args, **kwargs: QuietHandler(*args, directory=root, **kwargs)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+###############################################################################
+# SYNTHETIC GAME DIRECTORY
+###############################################################################
+def _write_blob(path, size, seed):
+    """Writes deterministic pseudo-random bytes and returns (sha1, size)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = hashlib.sha256(seed.encode()).digest() * (size // 32 + 1)
+    data = data[:size]
+    with open(path, "wb") as f:
+        f.write(data)
+    return hashlib.sha1(data).hexdigest(), size
+
+
+def _write_mod_jar(path, mod_id, depends=()):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("fabric.mod.json", json.dumps({"schemaVersion": 1, "id": mod_id, "version": "1.0.0", "name": mod_id,
+                                                  "depends": {dep: "*" for dep in depends}}))
+        zf.writestr(f"{mod_id}/Main.class", b"\0" * 2048)
+
+
+def build_fixture(workdir, args):
+    """Creates the served files (www/) and the parts of the game directory that are "already installed" (mc/)."""
+    www = os.path.join(workdir, "www")
+    mc_dir = os.path.join(workdir, "mc")
+    os.makedirs(www)
+    server, base = serve_directory(www)
+
+    libraries = []
+    for i in range(args.libraries):
+        relative = f"bench/lib{i}/1.0/lib{i}-1.0.jar"
+        sha1, size = _write_blob(os.path.join(www, "libraries", relative), 4096 + i % 4096, f"lib{i}")
+        libraries.append({"name": f"bench:lib{i}:1.0",
+                          "downloads": {"artifact": {"path": relative, "url": f"{base}/libraries/{relative}", "sha1": sha1, "size": size}}})
+
+    objects = {}
+    for i in range(args.assets):
+        data_seed = f"asset{i}"
+        tmp = os.path.join(www, "tmp_asset")
+        sha1, size = _write_blob(tmp, 512 + i % 2048, data_seed)
+        target = os.path.join(www, "resources", sha1[:2], sha1)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(tmp, target)
+        objects[f"minecraft/bench/{i}.ogg"] = {"hash": sha1, "size": size}
+    index_path = os.path.join(www, "indexes", "bench.json")
+    os.makedirs(os.path.dirname(index_path))
+    with open(index_path, "w") as f:
+        json.dump({"objects": objects}, f)
+    with open(index_path, "rb") as f:
+        index_sha1 = hashlib.sha1(f.read()).hexdigest()
+
+    client_sha1, client_size = _write_blob(os.path.join(www, "client.jar"), 256 * 1024, "client")
+    version = {
+        "id": BENCH_VERSION, "type": "release", "releaseTime": "2024-01-01T00:00:00+00:00",
+        "mainClass": "net.minecraft.client.main.Main", "assets": "bench",
+        "assetIndex": {"id": "bench", "url": f"{base}/indexes/bench.json", "sha1": index_sha1},
+        "downloads": {"client": {"url": f"{base}/client.jar", "sha1": client_sha1, "size": client_size}},
+        "javaVersion": {"majorVersion": 17},
+        "libraries": libraries,
+        "minecraftArguments": "--username ${auth_player_name} --version ${version_name} --gameDir ${game_directory} "
+                              "--assetsDir ${assets_root} --assetIndex ${assets_index_name} --uuid ${auth_uuid} "
+                              "--accessToken ${auth_access_token} --userType ${user_type}"
+    }
+    with open(os.path.join(www, f"{BENCH_VERSION}.json"), "w") as f:
+        json.dump(version, f)
+    with open(os.path.join(www, "version_manifest_v2.json"), "w") as f:
+        json.dump({"latest": {"release": BENCH_VERSION},
+                   "versions": [{"id": BENCH_VERSION, "type": "release", "url": f"{base}/{BENCH_VERSION}.json"}]}, f)
+    with open(os.path.join(www, "maven-metadata.xml"), "w") as f:
+        builds = f"<version>{FORGE_VERSION}</version>" + \
+                 "".join(f"<version>1.{m}.{p}-40.0.{n}</version>" for m in range(12, 21) for p in range(3) for n in range(50))
+        f.write(f"<metadata><versioning><versions>{builds}</versions></versioning></metadata>")
+
+    # Installed versions to scan: the Forge install plus filler versions
+    forge_id = f"{BENCH_VERSION}-forge-99.0.0"
+    filler = {"type": "release", "libraries": libraries[:50], "mainClass": "x"}
+    for i in range(args.versions):
+        version_id = forge_id if i == 0 else f"filler-{i}"
+        data = dict(filler, id=version_id, releaseTime=f"2020-01-{i % 28 + 1:02d}T00:00:00+00:00")
+        if i == 0:
+            data = {"id": forge_id, "inheritsFrom": BENCH_VERSION, "type": "release", "libraries": [],
+                    "releaseTime": version["releaseTime"], "mainClass": "cpw.mods.bootstraplauncher.BootstrapLauncher"}
+        path = os.path.join(mc_dir, "versions", version_id, f"{version_id}.json")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    mods_dir = os.path.join(mc_dir, "profiles", BENCH_VERSION, "mods")
+    os.makedirs(mods_dir)
+    for i in range(args.mods):
+        _write_mod_jar(os.path.join(mods_dir, f"mod{i}.jar"), f"mod{i}", depends=("fabric-api",) if i % 3 else ())
+
+    # A Modrinth pack whose mods come from the stand-in, plus some overrides
+    files = []
+    for i in range(args.pack_mods):
+        jar = os.path.join(www, "modrinth", f"packmod{i}.jar")
+        os.makedirs(os.path.dirname(jar), exist_ok=True)
+        _write_mod_jar(jar, f"packmod{i}")
+        with open(jar, "rb") as f:
+            data = f.read()
+        files.append({"path": f"mods/packmod{i}.jar", "hashes": {"sha1": hashlib.sha1(data).hexdigest()},
+                      "downloads": [f"https://cdn.modrinth.com/data/packmod{i}.jar"], "fileSize": len(data)})
+    pack_path = os.path.join(workdir, "bench.mrpack")
+    with zipfile.ZipFile(pack_path, "w") as zf:
+        zf.writestr("modrinth.index.json", json.dumps({"formatVersion": 1, "game": "minecraft", "name": "Bench Pack",
+                                                       "versionId": "1", "files": files,
+                                                       "dependencies": {"minecraft": BENCH_VERSION, "fabric-loader": "0.15.0"}}))
+        for i in range(args.pack_mods * 4):
+            zf.writestr(f"overrides/config/pack{i}.toml", f"value = {i}\n" * 20)
+
+    return {"server": server, "base": base, "www": www, "mc_dir": mc_dir, "mods_dir": mods_dir, "pack": pack_path,
+            "forge_id": forge_id}
+
+
+###############################################################################
+# STAGES
+###############################################################################
+class BenchRunner:
+    """Times stages and collects their results."""
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = {}
+
+    def measure(self, name, fn, setup=None, repeat=None, items=None):
+        """Runs setup() (untimed) then fn() (timed) repeat times."""
+        runs = []
+        for _ in range(repeat or self.repeat):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            fn()
+            runs.append((time.perf_counter() - started) * 1000)
+        self.results[name] = {"runs_ms": [round(r, 3) for r in runs], "median_ms": round(statistics.median(runs), 3),
+                              "min_ms": round(min(runs), 3)}
+        if items is not None:
+            self.results[name]["items"] = items
+        print(f"{name:<34}{self.results[name]['median_ms']:>12.2f} ms  (min {self.results[name]['min_ms']:.2f})", file=sys.stderr)
+
+    def skip(self, name, reason):
+        self.results[name] = {"skipped": reason}
+        print(f"{name:<34}{'skipped':>12}     ({reason})", file=sys.stderr)
+
+
+def run_benchmarks(fixture, args):
+    bench = BenchRunner(args.repeat)
+    mc_dir = fixture["mc_dir"]
+    base = fixture["base"]
+
+    # load_config: what launcher.load_config does on first use
+    config_path = os.path.abspath("launcher_config.json")
+    seed = default_config()
+    seed.update({"minecraft_directory": mc_dir, "java_path": sys.executable, "class_data_sharing": False, "ram_auto": False,
+                 "accounts": [{"type": "offline", "name": f"Player{i}", "uuid": f"{i:08d}-0000-0000-0000-000000000000"} for i in range(20)],
+                 "active_account_uuid": "00000000-0000-0000-0000-000000000000"})
+    with open(config_path, "w") as f:
+        json.dump(seed, f, indent=4)
+    bench.measure("load_config", lambda: ConfigStore(config_path, default_config()))
+    config = ConfigStore(config_path, default_config())
+    bench.measure("config_save_burst", lambda: ([config.save() for _ in range(1000)], config.flush()), items=1000)
+
+    # load_installed_versions: the background scan behind the version list
+    index_holder = {}
+    def reset_version_index():
+        if os.path.exists(os.path.join("launcher_cache", "installed_versions.json")):
+            os.remove(os.path.join("launcher_cache", "installed_versions.json"))
+        index_holder["index"] = InstalledVersionIndex()
+    bench.measure("installed_versions_cold", lambda: index_holder["index"].scan(mc_dir), setup=reset_version_index, items=args.versions)
+    warm_index = InstalledVersionIndex()
+    warm_index.scan(mc_dir)
+    bench.measure("installed_versions_warm", lambda: warm_index.scan(mc_dir), items=args.versions)
+
+    # Version install: parallel prefetch from the stand-in, first into an empty directory, then a no-op re-check
+    manifest_url = f"{base}/version_manifest_v2.json"
+    install_dir = os.path.abspath("install_target")
+    def reset_install():
+        shutil.rmtree(install_dir, ignore_errors=True)
+        shutil.rmtree("launcher_store", ignore_errors=True)
+        shutil.rmtree("launcher_cache", ignore_errors=True)
+    def install():
+        with DownloadEngine(store=SharedStore()) as engine:
+            prefetch_version(engine, BENCH_VERSION, install_dir, manifest_url, f"{base}/resources")
+    items = args.libraries + args.assets + 1
+    bench.measure("version_install_cold", install, setup=reset_install, repeat=max(1, args.repeat // 2), items=items)
+    bench.measure("version_install_verify", install, items=items)
+    # The launch stages below use the installed copy
+    for name in ("libraries", "assets"):
+        shutil.rmtree(os.path.join(mc_dir, name), ignore_errors=True)
+        shutil.copytree(os.path.join(install_dir, name), os.path.join(mc_dir, name))
+    shutil.copytree(os.path.join(install_dir, "versions", BENCH_VERSION), os.path.join(mc_dir, "versions", BENCH_VERSION))
+
+    # Loader install: the Forge catalogue refresh and the per-launch "already installed" check.
+    # A cold Forge/Fabric install runs the real installers and is not benchmarked here.
+    catalogue = ForgeCatalogue(metadata_url=f"{base}/maven-metadata.xml")
+    bench.measure("forge_catalogue_refresh", catalogue.refresh)
+    pipeline = LaunchPipeline(config)
+    pipeline.forge_catalogue = catalogue
+    pipeline.loader_ledger.record(mc_dir, BENCH_VERSION, "Forge", FORGE_VERSION, fixture["forge_id"])
+    callback = {"setStatus": lambda text: None, "setProgress": lambda val: None, "setMax": lambda val: None}
+    bench.measure("loader_install_cached", lambda: pipeline.install_mod_loader(BENCH_VERSION, "Forge", mc_dir, callback))
+
+    # get_minecraft_command, uncached and through the launch plan cache
+    options = {"username": "Player0", "uuid": "00000000-0000-0000-0000-000000000000", "token": "",
+               "gameDirectory": os.path.join(mc_dir, "profiles", BENCH_VERSION), "executablePath": sys.executable,
+               "jvmArguments": ["-Xmx2048M", "-Xms2048M"]}
+    try:
+        if launcher_core.minecraft_launcher_lib is None:
+            raise ImportError("not installed")
+        build_command = launcher_core.minecraft_launcher_lib.command.get_minecraft_command
+    except ImportError as e:
+        bench.skip("get_minecraft_command", f"minecraft_launcher_lib unavailable ({e})")
+        bench.skip("launch_plan_cached", "needs minecraft_launcher_lib")
+    else:
+        bench.measure("get_minecraft_command", lambda: build_command(fixture["forge_id"], mc_dir, options))
+        plans = LaunchPlanCache()
+        plans.get_command(fixture["forge_id"], mc_dir, options, build_command)
+        bench.measure("launch_plan_cached", lambda: plans.get_command(fixture["forge_id"], mc_dir, options, build_command))
+
+    # load_modpack: a Modrinth pack whose mods come from the stand-in, fresh and re-imported
+    profile_dir = os.path.abspath("pack_profile")
+    def reset_pack():
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        shutil.rmtree("launcher_store", ignore_errors=True)
+    def import_pack():
+        with DownloadEngine(store=SharedStore()) as engine:
+            ModpackImporter(engine, mirrors={"https://cdn.modrinth.com/data/": f"{base}/modrinth/"}).import_pack(fixture["pack"], profile_dir)
+    bench.measure("load_modpack_cold", import_pack, setup=reset_pack, items=args.pack_mods)
+    bench.measure("load_modpack_reimport", import_pack, items=args.pack_mods)
+
+    # Mod metadata index over the profile's mods folder
+    def reset_mod_index():
+        if os.path.exists(os.path.join("launcher_cache", "mod_index.json")):
+            os.remove(os.path.join("launcher_cache", "mod_index.json"))
+    bench.measure("mod_index_cold", lambda: ModIndex().scan(fixture["mods_dir"]), setup=reset_mod_index, items=args.mods)
+    mod_index = ModIndex()
+    mod_index.scan(fixture["mods_dir"])
+    bench.measure("mod_index_warm", lambda: mod_index.scan(fixture["mods_dir"]), items=args.mods)
+
+    # Console append path: game output through the pump into the console buffer, then one GUI drain
+    line = "[12:00:00] [Render thread/INFO]: Loaded texture minecraft:textures/block/stone.png\n"
+    payload = (line * args.console_lines).encode()
+    def console_path():
+        buffer = ConsoleBuffer(log_path=os.path.abspath("console.log"))
+        read_fd, write_fd = os.pipe()
+        def writer():
+            with os.fdopen(write_fd, "wb") as pipe:
+                pipe.write(payload)
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        with os.fdopen(read_fd, "rb", buffering=0) as stream:
+            OutputPump(stream, lambda lines: buffer.append("".join(lines))).run()
+        writer_thread.join()
+        buffer.drain()
+        buffer.close()
+    bench.measure("console_append", console_path, items=args.console_lines)
+
+    return bench.results
+
+
+###############################################################################
+# REPORTING
+###############################################################################
+def compare(results, baseline, tolerance, min_delta_ms=1.0):
+    """Lists the stages whose median got slower than the baseline by more than tolerance (and min_delta_ms)."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("stages", {}).get(name, {})
+        if "median_ms" not in result or "median_ms" not in before:
+            continue
+        delta = result["median_ms"] - before["median_ms"]
+        if delta > min_delta_ms and result["median_ms"] > before["median_ms"] * (1 + tolerance):
+            regressions.append({"stage": name, "baseline_ms": before["median_ms"], "median_ms": result["median_ms"],
+                                "change": round(result["median_ms"] / before["median_ms"] - 1, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the launcher pipeline against a synthetic game directory.")
+    parser.add_argument("--versions", type=int, default=50, help="installed versions to scan (default: 50)")
+    parser.add_argument("--libraries", type=int, default=200, help="libraries in the benchmark version (default: 200)")
+    parser.add_argument("--assets", type=int, default=2000, help="asset objects in the benchmark version (default: 2000)")
+    parser.add_argument("--mods", type=int, default=100, help="jars in the profile's mods folder (default: 100)")
+    parser.add_argument("--pack-mods", type=int, default=30, help="mods downloaded by the benchmark modpack (default: 30)")
+    parser.add_argument("--console-lines", type=int, default=100000, help="game output lines for the console path (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage; the median is reported (default: 5)")
+    parser.add_argument("--output", help="write the results as JSON to this file (default: stdout)")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline (default: 0.25)")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic directory and print where it is")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="clauncher-bench-")
+    previous_cwd = os.getcwd()
+    # Caches, the shared store and the config are all relative paths; keep them inside the fixture
+    os.chdir(workdir)
+    try:
+        print(f"Building the synthetic game directory in {workdir}...", file=sys.stderr)
+        fixture = build_fixture(workdir, args)
+        results = run_benchmarks(fixture, args)
+        fixture["server"].shutdown()
+    finally:
+        os.chdir(previous_cwd)
+        if args.keep:
+            print(f"Kept {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "benchmark": "launcher",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "keep")},
+        "stages": results
+    }
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.tolerance)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['stage']}: {regression['baseline_ms']:.2f} ms -> {regression['median_ms']:.2f} ms "
+                  f"(+{regression['change']:.0%})", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
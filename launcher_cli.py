@@ -0,0 +1,91 @@
+# Command Launcher Client V2.0 - Headless CLI
+#
+# Launches an installed version without Qt, using the same pipeline as the GUI
+# (account resolution, mod loader install, command build, process supervision).
+#
+# Examples:
+#   python launcher_cli.py --version 1.20.1
+#   python launcher_cli.py --version 1.20.1 --profile testing --dry-run
+#   python launcher_cli.py --version 1.20.1 --json > launch.jsonl
+
+import sys
+import json
+import time
+import shlex
+import argparse
+
+from launcher_core import ConfigStore, CONFIG_FILE, default_config, LaunchPipeline, LaunchError, masked_command
+
+
+class StatusReporter:
+    """Writes launch status either as readable text on stderr or as JSON lines on stdout."""
+    def __init__(self, as_json, stream):
+        self.as_json = as_json
+        self.stream = stream
+        self.started = time.perf_counter()
+
+    def event(self, name, **fields):
+        if self.as_json:
+            fields = dict(event=name, time=round(time.perf_counter() - self.started, 3), **fields)
+            self.stream.write(json.dumps(fields) + "\n")
+            self.stream.flush()
+        elif name == "progress":
+            sys.stderr.write(f"[{fields['done']}/{fields['total']}] {fields['text']}\n" if fields["total"] else f"{fields['text']}\n")
+        elif name == "output":
+            sys.stderr.write(fields["text"])
+        elif name == "error":
+            sys.stderr.write(f"Error: {fields['message']}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Launch an installed Minecraft version without the GUI.")
+    parser.add_argument("--version", required=True, help="installed Minecraft version to launch, e.g. 1.20.1")
+    parser.add_argument("--profile", help="profile folder to use as the game directory (defaults to the version)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the launch command instead of starting the game, without installing or saving anything")
+    parser.add_argument("--json", action="store_true", help="report status as JSON lines on stdout")
+    parser.add_argument("--config", default=CONFIG_FILE, help=f"config file to use (default: {CONFIG_FILE})")
+    args = parser.parse_args(argv)
+
+    # Keep stdout for the command / JSON; the pipeline's own messages go to stderr
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    reporter = StatusReporter(args.json, out)
+
+    config = ConfigStore(args.config, default_config())
+    pipeline = LaunchPipeline(config,
+                              on_progress=lambda done, total, text: reporter.event("progress", done=done, total=total, text=text),
+                              on_output=lambda text: reporter.event("output", text=text))
+    try:
+        plan = pipeline.prepare(args.version, args.profile, dry_run=args.dry_run)
+        command = masked_command(plan["command"], plan["token"])
+        reporter.event("prepared", version=plan["launch_version_id"], mod_loader=plan["mod_loader"],
+                       account=plan["account"], profile_dir=plan["profile_dir"], java=plan["java_path"],
+                       command=command)
+        if args.dry_run:
+            if not args.json:
+                out.write(shlex.join(command) + "\n")
+            return 0
+
+        return_code, report = pipeline.run(plan)
+        reporter.event("exited", code=return_code, crash_report=report)
+        if report and not args.json:
+            sys.stderr.write(f"\nMinecraft crashed (exit code {return_code}).\n\n{report}\n")
+        return return_code
+    except LaunchError as e:
+        reporter.event("error", message=str(e))
+        return 1
+    except Exception as e:
+        reporter.event("error", message=f"An error occurred during launch: {e}")
+        return 1
+    except KeyboardInterrupt:
+        if pipeline.process and pipeline.process.poll() is None:
+            pipeline.process.terminate()
+        reporter.event("error", message="Interrupted")
+        return 130
+    finally:
+        config.flush() # Refreshed MSA tokens
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3349 @@
+# Command Launcher Client V2.0 - Core
+#
+# Qt-free building blocks used by launcher.py (downloads, caches and install
+# helpers). Nothing in here may import PyQt5 so it can be reused headless.
+
+import os
+import sys
+import json
+import time
+import shutil
+import zlib
+import codecs
+import zipfile
+import hashlib
+import platform
+import threading
+import subprocess
+import glob
+import re
+import collections
+import struct
+import gzip
+import importlib.util
+import base64
+import xml.etree.ElementTree as ET
+import http.client
+import multiprocessing
+from urllib.parse import urlsplit, urljoin
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+def lazy_import(name):
+    """Returns a module whose code only runs on first attribute access.
+
+    Raises ImportError right away if the module isn't installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# Only needed by the server status dashboard, and slow to import
+asyncio = lazy_import("asyncio")
+
+# Needed for installs, logins and launches; its own imports are slow
+try:
+    minecraft_launcher_lib = lazy_import("minecraft_launcher_lib")
+except ImportError:
+    minecraft_launcher_lib = None
+
+# Optional dependency for server status pings, imported on first ping
+MCSTATUS_AVAILABLE = importlib.util.find_spec("mcstatus") is not None
+
+# tomllib is only in the standard library from Python 3.11 on
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+
+USER_AGENT = "CommandLauncher/2.0"
+
+# Mojang endpoints. Every function taking one of these accepts an override so the
+# whole pipeline can be pointed at a local HTTP stand-in.
+VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+RESOURCES_URL = "https://resources.download.minecraft.net"
+LIBRARIES_URL = "https://libraries.minecraft.net"
+FORGE_METADATA_URL = "https://maven.minecraftforge.net/net/minecraftforge/forge/maven-metadata.xml"
+CURSEFORGE_API_URL = "https://api.curseforge.com"
+
+
+###############################################################################
+# DOWNLOAD ENGINE
+###############################################################################
+class DownloadError(Exception):
+    """Raised when one or more files could not be downloaded."""
+
+
+def sha1_of_file(path, chunk_size=1024 * 1024):
+    """Returns the hex SHA-1 of a file, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadJob:
+    """A single file to fetch: where from, where to, and what it should hash to."""
+    __slots__ = ("url", "path", "sha1", "size")
+
+    def __init__(self, url, path, sha1=None, size=None):
+        self.url = url
+        self.path = path
+        self.sha1 = sha1
+        self.size = size
+
+    def is_satisfied(self):
+        """True if the destination already holds the expected file."""
+        if not os.path.isfile(self.path):
+            return False
+        if self.size is not None and os.path.getsize(self.path) != self.size:
+            return False
+        if self.sha1:
+            return sha1_of_file(self.path) == self.sha1
+        return True
+
+
+class DownloadEngine:
+    """Downloads many files over a bounded worker pool.
+
+    Each worker thread keeps one keep-alive connection per host, so a batch of
+    thousands of assets costs a handful of TLS handshakes instead of one per file.
+    progress_callback(done, total, text) is called from the thread that calls run().
+    With a SharedStore, hashed files are linked from the store before touching the
+    network and every verified download is added to it.
+    """
+    MAX_REDIRECTS = 5
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, max_workers=16, timeout=30, retries=3, progress_callback=None, store=None):
+        self.max_workers = max_workers
+        self.store = store
+        self.timeout = timeout
+        self.retries = retries
+        self.progress_callback = progress_callback
+        self._local = threading.local()
+        self._all_connections = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes every pooled connection."""
+        with self._lock:
+            for conn in self._all_connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._all_connections = []
+        self._local = threading.local()
+
+    def _get_connection(self, scheme, netloc):
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(netloc, timeout=self.timeout)
+            connections[(scheme, netloc)] = conn
+            with self._lock:
+                self._all_connections.append(conn)
+        return conn
+
+    def _drop_connection(self, scheme, netloc):
+        conn = getattr(self._local, "connections", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def open(self, url, headers=None):
+        """Issues a GET on a pooled connection and returns the response, following redirects.
+
+        The caller must read the response to the end so the connection can be reused.
+        """
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+            request_headers.update(headers or {})
+
+            conn = self._get_connection(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", target, headers=request_headers)
+                response = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                # Stale keep-alive connection; reconnect once and retry the request
+                self._drop_connection(parts.scheme, parts.netloc)
+                conn = self._get_connection(parts.scheme, parts.netloc)
+                conn.request("GET", target, headers=request_headers)
+                response = conn.getresponse()
+
+            if response.status in (301, 302, 303, 307, 308):
+                location = response.getheader("Location")
+                response.read()
+                if not location:
+                    raise DownloadError(f"Redirect without location from {url}")
+                url = urljoin(url, location)
+                continue
+            return response
+        raise DownloadError(f"Too many redirects for {url}")
+
+    def fetch(self, url, headers=None):
+        """Returns the body of url as bytes."""
+        response = self.open(url, headers)
+        body = response.read()
+        if response.status != 200:
+            raise DownloadError(f"HTTP {response.status} for {url}")
+        return body
+
+    def fetch_json(self, url, headers=None):
+        return json.loads(self.fetch(url, headers).decode("utf-8"))
+
+    def download(self, job):
+        """Downloads one job to disk, verifying its hash. Skips files that are already correct."""
+        if job.is_satisfied():
+            if self.store is not None and job.sha1:
+                self.store.adopt(job.path, job.sha1, verified=True)
+            return False
+        if self.store is not None and job.sha1 and self.store.link_into(job.sha1, job.path, job.size):
+            return False
+        os.makedirs(os.path.dirname(job.path) or ".", exist_ok=True)
+        tmp_path = f"{job.path}.{threading.get_ident()}.part"
+        last_error = None
+        for _ in range(self.retries):
+            try:
+                response = self.open(job.url)
+                if response.status != 200:
+                    response.read()
+                    raise DownloadError(f"HTTP {response.status} for {job.url}")
+                digest = hashlib.sha1()
+                with open(tmp_path, "wb") as f:
+                    for chunk in iter(lambda: response.read(self.CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        f.write(chunk)
+                if job.sha1 and digest.hexdigest() != job.sha1:
+                    raise DownloadError(f"Checksum mismatch for {job.url}: expected {job.sha1}, got {digest.hexdigest()}")
+                os.replace(tmp_path, job.path)
+                if self.store is not None and job.sha1:
+                    self.store.adopt(job.path, job.sha1, verified=True)
+                return True
+            except (DownloadError, http.client.HTTPException, OSError) as e:
+                last_error = e
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise DownloadError(str(last_error))
+
+    def run(self, jobs, status="Downloading"):
+        """Downloads all jobs in parallel and reports aggregate progress.
+
+        Returns the number of files actually fetched. Raises DownloadError listing
+        every failed file once the whole batch has been attempted.
+        """
+        unique = {}
+        for job in jobs:
+            unique.setdefault(os.path.normcase(os.path.abspath(job.path)), job)
+        jobs = list(unique.values())
+        total = len(jobs)
+        done = 0
+        fetched = 0
+        failures = []
+        self._report(0, total, f"{status}: 0/{total}")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.download, job): job for job in jobs}
+            for future in as_completed(futures):
+                done += 1
+                try:
+                    if future.result():
+                        fetched += 1
+                except Exception as e:
+                    failures.append(f"{futures[future].url}: {e}")
+                self._report(done, total, f"{status}: {done}/{total}")
+        if failures:
+            raise DownloadError(f"{len(failures)} file(s) failed to download:\n" + "\n".join(failures[:10]))
+        return fetched
+
+    def _report(self, done, total, text):
+        if self.progress_callback:
+            self.progress_callback(done, total, text)
+
+
+###############################################################################
+# VERSION INSTALL PLANNING
+###############################################################################
+def _os_name():
+    system = platform.system()
+    if system == "Windows":
+        return "windows"
+    if system == "Darwin":
+        return "osx"
+    return "linux"
+
+
+def default_minecraft_directory():
+    """The standard .minecraft location for this OS."""
+    home = os.path.expanduser("~")
+    if platform.system() == "Windows":
+        return os.path.join(os.getenv("APPDATA", os.path.join(home, "AppData", "Roaming")), ".minecraft")
+    if platform.system() == "Darwin":
+        return os.path.join(home, "Library", "Application Support", "minecraft")
+    return os.path.join(home, ".minecraft")
+
+
+def _installed_version_info(mc_dir, name):
+    data = read_json_file(os.path.join(mc_dir, "versions", name, name + ".json"))
+    if not isinstance(data, dict):
+        return None
+    return {"id": data.get("id", name), "type": data.get("type", ""), "releaseTime": data.get("releaseTime", "")}
+
+
+def installed_versions(mc_dir):
+    """Lists the versions in mc_dir/versions as {"id", "type", "releaseTime"} dicts, newest first."""
+    versions = []
+    try:
+        names = os.listdir(os.path.join(mc_dir, "versions"))
+    except OSError:
+        return versions
+    for name in names:
+        info = _installed_version_info(mc_dir, name)
+        if info:
+            versions.append(info)
+    versions.sort(key=lambda v: v["releaseTime"], reverse=True)
+    return versions
+
+
+def rules_allow(rules):
+    """Evaluates a version JSON rule list for the current OS (features are treated as unset)."""
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        if "features" in rule:
+            continue
+        os_rule = rule.get("os", {})
+        if "name" in os_rule and os_rule["name"] != _os_name():
+            continue
+        if os_rule.get("arch") == "x86" and platform.architecture()[0] != "32bit":
+            continue
+        allowed = rule.get("action") == "allow"
+    return allowed
+
+
+def native_classifier(library):
+    """Returns the natives classifier of a library for this OS, or None."""
+    classifier = library.get("natives", {}).get(_os_name())
+    if classifier is None:
+        return None
+    return classifier.replace("${arch}", "32" if platform.architecture()[0] == "32bit" else "64")
+
+
+def maven_path(name):
+    """Turns a maven coordinate (group:artifact:version[:classifier][@ext]) into a relative path."""
+    name, _, ext = name.partition("@")
+    parts = name.split(":")
+    if len(parts) < 3:
+        return None
+    group, artifact, version = parts[:3]
+    classifier = f"-{parts[3]}" if len(parts) > 3 else ""
+    return os.path.join(*group.split("."), artifact, version, f"{artifact}-{version}{classifier}.{ext or 'jar'}")
+
+
+def version_chain(version_id, mc_dir):
+    """Returns the parsed JSONs of a locally installed version and everything it inherits from."""
+    chain = []
+    current = version_id
+    while current and current not in [data.get("id") for data in chain]:
+        data = read_json_file(os.path.join(mc_dir, "versions", current, f"{current}.json"))
+        if not isinstance(data, dict):
+            break
+        data.setdefault("id", current)
+        chain.append(data)
+        current = data.get("inheritsFrom")
+    return chain
+
+
+def version_files(version_id, mc_dir):
+    """Paths of the files a launch of version_id relies on: version JSONs, client jars and libraries."""
+    paths = []
+    for data in version_chain(version_id, mc_dir):
+        paths.append(os.path.join(mc_dir, "versions", data["id"], f"{data['id']}.json"))
+        if "downloads" in data:
+            paths.append(os.path.join(mc_dir, "versions", data["id"], f"{data['id']}.jar"))
+        for lib in data.get("libraries", []):
+            if not rules_allow(lib.get("rules")):
+                continue
+            artifact = lib.get("downloads", {}).get("artifact")
+            if artifact and artifact.get("path"):
+                paths.append(os.path.join(mc_dir, "libraries", artifact["path"]))
+            elif "downloads" not in lib and "name" in lib:
+                relative = maven_path(lib["name"])
+                if relative:
+                    paths.append(os.path.join(mc_dir, "libraries", relative))
+    return paths
+
+
+def library_jobs(libraries, mc_dir):
+    """Builds download jobs for every library artifact (and native) allowed on this OS."""
+    jobs = []
+    for lib in libraries:
+        if not rules_allow(lib.get("rules")):
+            continue
+        downloads = lib.get("downloads", {})
+        artifact = downloads.get("artifact")
+        if artifact and artifact.get("url") and artifact.get("path"):
+            jobs.append(DownloadJob(artifact["url"], os.path.join(mc_dir, "libraries", artifact["path"]),
+                                    artifact.get("sha1"), artifact.get("size")))
+        classifier = native_classifier(lib)
+        native = downloads.get("classifiers", {}).get(classifier) if classifier else None
+        if native and native.get("url") and native.get("path"):
+            jobs.append(DownloadJob(native["url"], os.path.join(mc_dir, "libraries", native["path"]),
+                                    native.get("sha1"), native.get("size")))
+    return jobs
+
+
+def asset_jobs(asset_index, mc_dir, resources_url=RESOURCES_URL):
+    """Builds download jobs for every object listed in an asset index."""
+    jobs = []
+    for obj in asset_index.get("objects", {}).values():
+        file_hash = obj["hash"]
+        jobs.append(DownloadJob(f"{resources_url}/{file_hash[:2]}/{file_hash}",
+                                os.path.join(mc_dir, "assets", "objects", file_hash[:2], file_hash),
+                                file_hash, obj.get("size")))
+    return jobs
+
+
+def ensure_version_json(engine, version_id, mc_dir, manifest_url=VERSION_MANIFEST_URL):
+    """Makes sure versions/<id>/<id>.json exists locally and returns its parsed contents."""
+    json_path = os.path.join(mc_dir, "versions", version_id, f"{version_id}.json")
+    if not os.path.isfile(json_path):
+        manifest_cache = ManifestCache(manifest_url=manifest_url)
+        entry = next((v for v in manifest_cache.cached_versions() if v["id"] == version_id), None)
+        if entry is None:
+            _, versions = manifest_cache.revalidate(engine)
+            entry = next((v for v in versions if v["id"] == version_id), None)
+        if entry is None:
+            raise DownloadError(f"Version {version_id} not found in the version manifest")
+        engine.download(DownloadJob(entry["url"], json_path, entry.get("sha1")))
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def collect_version_jobs(version_id, mc_dir, engine=None, manifest_url=VERSION_MANIFEST_URL, resources_url=RESOURCES_URL):
+    """Lists the download jobs for a version and everything it inherits from.
+
+    With an engine, missing version JSONs and asset indexes are fetched first.
+    Without one, only files already on disk are considered.
+    """
+    jobs = []
+    seen = set()
+    current = version_id
+    while current and current not in seen:
+        seen.add(current)
+        if engine is not None:
+            data = ensure_version_json(engine, current, mc_dir, manifest_url)
+        else:
+            json_path = os.path.join(mc_dir, "versions", current, f"{current}.json")
+            if not os.path.isfile(json_path):
+                break
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        jobs.extend(library_jobs(data.get("libraries", []), mc_dir))
+
+        if "assetIndex" in data:
+            index = data["assetIndex"]
+            index_path = os.path.join(mc_dir, "assets", "indexes", f"{data.get('assets', index['id'])}.json")
+            if engine is not None:
+                engine.download(DownloadJob(index["url"], index_path, index.get("sha1")))
+            if os.path.isfile(index_path):
+                with open(index_path, "r", encoding="utf-8") as f:
+                    jobs.extend(asset_jobs(json.load(f), mc_dir, resources_url))
+
+        client = data.get("downloads", {}).get("client")
+        if client:
+            jobs.append(DownloadJob(client["url"], os.path.join(mc_dir, "versions", data["id"], f"{data['id']}.jar"),
+                                    client.get("sha1"), client.get("size")))
+
+        logging_file = data.get("logging", {}).get("client", {}).get("file")
+        if logging_file:
+            jobs.append(DownloadJob(logging_file["url"], os.path.join(mc_dir, "assets", "log_configs", logging_file["id"]),
+                                    logging_file.get("sha1"), logging_file.get("size")))
+
+        current = data.get("inheritsFrom")
+    return jobs
+
+
+def prefetch_version(engine, version_id, mc_dir, manifest_url=VERSION_MANIFEST_URL, resources_url=RESOURCES_URL):
+    """Downloads everything a version needs (libraries, assets, client jar) in one parallel batch.
+
+    Files already present with the right hash are skipped, so the install step that
+    follows only has to verify them and extract natives.
+    """
+    jobs = collect_version_jobs(version_id, mc_dir, engine, manifest_url, resources_url)
+    return engine.run(jobs, status=f"Downloading {version_id}")
+
+
+###############################################################################
+# SHARED CONTENT-ADDRESSED STORE
+###############################################################################
+SHARED_STORE_DIR = "launcher_store"
+
+
+def _reflink(src, dst):
+    """Copy-on-write clone of src to dst (Linux FICLONE). Returns False if unsupported."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    FICLONE = 0x40049409
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+def link_or_copy(src, dst):
+    """Places src at dst as a hardlink, falling back to a reflink and then a plain copy."""
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp_path = f"{dst}.{threading.get_ident()}.link"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        if not _reflink(src, tmp_path):
+            shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+class SharedStore:
+    """A global SHA-1 keyed object store shared by every Minecraft directory.
+
+    Objects live at <root>/<first two hex chars>/<sha1> and are linked into each
+    minecraft_directory, so a file is downloaded and kept on disk only once.
+    Objects are only ever added after their hash was verified.
+    """
+    def __init__(self, root=SHARED_STORE_DIR):
+        self.root = os.path.abspath(root)
+
+    def path_for(self, sha1):
+        return os.path.join(self.root, sha1[:2], sha1)
+
+    def has(self, sha1):
+        return os.path.isfile(self.path_for(sha1))
+
+    def link_into(self, sha1, dest, size=None):
+        """Materializes an object at dest. Returns False if the store doesn't have it."""
+        src = self.path_for(sha1)
+        try:
+            if size is not None and os.path.getsize(src) != size:
+                return False
+            link_or_copy(src, dest)
+            return True
+        except OSError:
+            return False
+
+    def adopt(self, path, sha1, verified=False):
+        """Adds a file to the store. Unless verified, its hash is checked first."""
+        if not sha1 or self.has(sha1):
+            return
+        if not verified and sha1_of_file(path) != sha1:
+            return
+        try:
+            link_or_copy(path, self.path_for(sha1))
+        except OSError as e:
+            print(f"Warning: Could not add {path} to the shared store: {e}")
+
+
+def link_version_from_store(store, version_id, mc_dir):
+    """Links every file of an already-described version that is missing on disk but present in the store.
+
+    Returns the number of files linked.
+    """
+    linked = 0
+    for job in collect_version_jobs(version_id, mc_dir):
+        if job.sha1 and not os.path.isfile(job.path) and store.link_into(job.sha1, job.path, job.size):
+            linked += 1
+    return linked
+
+
+def adopt_version_into_store(store, version_id, mc_dir):
+    """Adds every verified file of an installed version to the store. Returns the number added."""
+    adopted = 0
+    for job in collect_version_jobs(version_id, mc_dir):
+        if job.sha1 and os.path.isfile(job.path) and not store.has(job.sha1):
+            store.adopt(job.path, job.sha1)
+            adopted += store.has(job.sha1)
+    return adopted
+
+
+###############################################################################
+# ON-DISK CACHES
+###############################################################################
+CACHE_DIR = "launcher_cache"
+
+
+def read_json_file(path, default=None):
+    """Reads a JSON file, returning default if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json_file(path, data, indent=None):
+    """Writes JSON through a temp file and an atomic rename so readers never see a partial file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
+
+
+class ManifestCache:
+    """On-disk copy of the Mojang version manifest, revalidated with a conditional GET."""
+    def __init__(self, cache_dir=CACHE_DIR, manifest_url=VERSION_MANIFEST_URL):
+        name = "version_manifest.json"
+        if manifest_url != VERSION_MANIFEST_URL:
+            name = f"version_manifest_{hashlib.sha1(manifest_url.encode('utf-8')).hexdigest()[:12]}.json"
+        self.path = os.path.join(cache_dir, name)
+        self.manifest_url = manifest_url
+
+    def load(self):
+        """Returns the cached record ({"etag", "last_modified", "manifest"}) or None."""
+        record = read_json_file(self.path)
+        if not isinstance(record, dict) or "manifest" not in record:
+            return None
+        return record
+
+    def cached_versions(self):
+        record = self.load()
+        return record["manifest"].get("versions", []) if record else []
+
+    def revalidate(self, engine=None):
+        """Asks the server whether the manifest changed since it was cached.
+
+        Returns (changed, versions). A 304 answer costs one round trip and no body.
+        """
+        record = self.load()
+        headers = {}
+        if record:
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                headers["If-Modified-Since"] = record["last_modified"]
+
+        own_engine = engine is None
+        engine = engine or DownloadEngine(max_workers=1, timeout=10)
+        try:
+            response = engine.open(self.manifest_url, headers)
+            body = response.read()
+            if response.status == 304 and record:
+                return False, record["manifest"].get("versions", [])
+            if response.status != 200:
+                raise DownloadError(f"HTTP {response.status} for {self.manifest_url}")
+            manifest = json.loads(body.decode("utf-8"))
+            write_json_file(self.path, {
+                "etag": response.getheader("ETag"),
+                "last_modified": response.getheader("Last-Modified"),
+                "manifest": manifest
+            })
+            changed = record is None or record["manifest"] != manifest
+            return changed, manifest.get("versions", [])
+        finally:
+            if own_engine:
+                engine.close()
+
+
+class InstalledVersionIndex:
+    """installed_versions() backed by launcher_cache/installed_versions.json.
+
+    The versions folder is only listed again when its mtime changes, and a version
+    JSON is only parsed again when its size or mtime changes, so a rescan of an
+    unchanged install is one stat per version. Safe to use from several threads.
+    """
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, "installed_versions.json")
+        self.lock = threading.Lock()
+        self.cache = read_json_file(self.path, {})
+        if not isinstance(self.cache, dict):
+            self.cache = {}
+
+    def cached(self, mc_dir):
+        """The result of the last scan of mc_dir, without touching the disk, or None."""
+        with self.lock:
+            entry = self.cache.get(os.path.abspath(mc_dir))
+            return self._sorted(entry) if entry else None
+
+    @staticmethod
+    def _sorted(entry):
+        versions = [v["info"] for v in entry["versions"].values() if v["info"]]
+        versions.sort(key=lambda v: v["releaseTime"], reverse=True)
+        return versions
+
+    def scan(self, mc_dir):
+        """Same result as installed_versions(mc_dir), reusing everything that hasn't changed."""
+        key = os.path.abspath(mc_dir)
+        versions_dir = os.path.join(mc_dir, "versions")
+        with self.lock:
+            entry = self.cache.get(key) or {"mtime_ns": None, "versions": {}}
+        try:
+            dir_mtime = os.stat(versions_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        changed = dir_mtime != entry["mtime_ns"]
+        if dir_mtime is None:
+            names = []
+        elif changed:
+            names = os.listdir(versions_dir)
+        else:
+            names = list(entry["versions"])
+
+        known = {}
+        for name in names:
+            try:
+                st = os.stat(os.path.join(versions_dir, name, name + ".json"))
+            except OSError:
+                # Kept so a JSON written later (mid-install) is still picked up
+                known[name] = {"size": None, "mtime_ns": None, "info": None}
+                continue
+            cached = entry["versions"].get(name)
+            if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+                known[name] = cached
+            else:
+                known[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "info": _installed_version_info(mc_dir, name)}
+                changed = True
+        changed = changed or len(known) != len(entry["versions"])
+
+        entry = {"mtime_ns": dir_mtime, "versions": known}
+        with self.lock:
+            self.cache[key] = entry
+            if changed:
+                try:
+                    write_json_file(self.path, self.cache)
+                except OSError as e:
+                    print(f"Warning: Could not save the installed version cache: {e}")
+        return self._sorted(entry)
+
+
+def _version_key(version):
+    """Sort key for dotted version strings such as 47.2.0 (non-numeric parts sort first)."""
+    return tuple(int(part) if part.isdigit() else -1 for part in version.replace("-", ".").split("."))
+
+
+class ForgeCatalogue:
+    """Persisted list of Forge builds indexed by Minecraft version.
+
+    Lookups are a dict access. The list is refreshed in the background once it
+    is older than ttl, and a stale or offline catalogue is still used.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, metadata_url=FORGE_METADATA_URL, ttl=24 * 3600):
+        self.path = os.path.join(cache_dir, "forge_versions.json")
+        self.metadata_url = metadata_url
+        self.ttl = ttl
+        self.fetched_at = 0
+        self.index = {}
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        record = read_json_file(self.path)
+        if isinstance(record, dict) and isinstance(record.get("versions"), list):
+            self._set_versions(record["versions"], record.get("fetched_at", 0))
+
+    def _set_versions(self, versions, fetched_at):
+        index = {}
+        for forge_version in versions:
+            # Forge versions look like "1.20.1-47.2.0"; index on the exact Minecraft part so
+            # "1.20" never picks up a "1.20.1" build.
+            mc_version, sep, build = forge_version.partition("-")
+            if sep:
+                index.setdefault(mc_version, []).append(forge_version)
+        for builds in index.values():
+            builds.sort(key=lambda v: _version_key(v.partition("-")[2]), reverse=True)
+        with self._lock:
+            self.index = index
+            self.fetched_at = fetched_at
+
+    def is_stale(self):
+        return time.time() - self.fetched_at > self.ttl
+
+    def refresh(self, engine=None):
+        """Downloads the Forge maven metadata and rewrites the cache."""
+        own_engine = engine is None
+        engine = engine or DownloadEngine(max_workers=1, timeout=15)
+        try:
+            root = ET.fromstring(engine.fetch(self.metadata_url))
+        finally:
+            if own_engine:
+                engine.close()
+        versions = [node.text.strip() for node in root.iter("version") if node.text]
+        fetched_at = time.time()
+        write_json_file(self.path, {"fetched_at": fetched_at, "versions": versions})
+        self._set_versions(versions, fetched_at)
+        return versions
+
+    def refresh_in_background(self):
+        """Starts a refresh unless one is already running."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        def worker():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: Could not refresh the Forge version list: {e}")
+        self._refresh_thread = threading.Thread(target=worker, daemon=True)
+        self._refresh_thread.start()
+
+    def builds_for(self, mc_version):
+        """All Forge builds for a Minecraft version, newest first."""
+        if not self.index:
+            # Nothing cached yet: this one time we have to wait for the network
+            self.refresh()
+        elif self.is_stale():
+            self.refresh_in_background()
+        return list(self.index.get(mc_version, []))
+
+    def latest_for(self, mc_version):
+        """The newest Forge build for a Minecraft version, or None."""
+        builds = self.builds_for(mc_version)
+        return builds[0] if builds else None
+
+
+def forge_installed_version_id(mc_dir, forge_version):
+    """Returns the versions/ folder name a Forge build was installed under."""
+    mc_version, _, build = forge_version.partition("-")
+    for candidate in (f"{mc_version}-forge-{build}", f"{mc_version}-forge{mc_version}-{build}", forge_version):
+        if os.path.isfile(os.path.join(mc_dir, "versions", candidate, f"{candidate}.json")):
+            return candidate
+    return forge_version
+
+
+class LoaderInstallLedger:
+    """Remembers which mod loader installs are already on disk.
+
+    Entries are keyed by (minecraft_directory, Minecraft version, loader, loader
+    version) and hold the installed version ID plus the size and mtime of every file
+    it relies on. An entry only counts while all of those files are unchanged.
+    """
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, "loader_installs.json")
+        self.entries = read_json_file(self.path, {})
+        if not isinstance(self.entries, dict):
+            self.entries = {}
+
+    @staticmethod
+    def _key(mc_dir, mc_version, loader, loader_version):
+        return "|".join([os.path.abspath(mc_dir), mc_version, loader, loader_version])
+
+    @staticmethod
+    def _snapshot(version_id, mc_dir):
+        files = {}
+        for path in version_files(version_id, mc_dir):
+            st = os.stat(path)
+            files[path] = [st.st_size, st.st_mtime_ns]
+        return files
+
+    def lookup(self, mc_dir, mc_version, loader, loader_version):
+        """Returns the installed version ID, or None if the install is missing or was modified."""
+        entry = self.entries.get(self._key(mc_dir, mc_version, loader, loader_version))
+        if not entry:
+            return None
+        for path, (size, mtime_ns) in entry["files"].items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                return None
+        return entry["version_id"]
+
+    def record(self, mc_dir, mc_version, loader, loader_version, version_id):
+        """Stores a completed install. Raises OSError if one of its files is missing."""
+        self.entries[self._key(mc_dir, mc_version, loader, loader_version)] = {
+            "version_id": version_id,
+            "files": self._snapshot(version_id, mc_dir)
+        }
+        write_json_file(self.path, self.entries)
+
+
+###############################################################################
+# LAUNCH PLAN CACHE
+###############################################################################
+# Per-launch options are swapped for these markers before the command is built,
+# so one cached argument vector serves every account and token.
+LAUNCH_PLACEHOLDERS = {
+    "token": "@@CL_TOKEN@@",
+    "username": "@@CL_USERNAME@@",
+    "uuid": "@@CL_UUID@@",
+}
+# Heap and GC flags change with the mod count and settings; they are left out of the
+# key and spliced in right after the Java executable, where the builder puts them.
+LAUNCH_JVM_OPTION = "jvmArguments"
+
+
+def version_json_digest(version_id, mc_dir):
+    """SHA-1 over the raw bytes of a version JSON and every JSON it inherits from, or None if one is missing."""
+    digest = hashlib.sha1()
+    seen = set()
+    current = version_id
+    while current and current not in seen:
+        seen.add(current)
+        try:
+            with open(os.path.join(mc_dir, "versions", current, f"{current}.json"), "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        digest.update(current.encode("utf-8") + b"\0" + raw)
+        try:
+            current = json.loads(raw.decode("utf-8")).get("inheritsFrom")
+        except ValueError:
+            return None
+    return digest.hexdigest()
+
+
+class LaunchPlanCache:
+    """Remembers fully resolved launch commands.
+
+    The key covers the version JSON chain, the Minecraft directory and every launch
+    option except the per-launch ones in LAUNCH_PLACEHOLDERS and the JVM arguments,
+    so a hit only needs those values substituted back in.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=32):
+        self.path = os.path.join(cache_dir, "launch_plans.json")
+        self.max_entries = max_entries
+        self.entries = read_json_file(self.path, {})
+        if not isinstance(self.entries, dict):
+            self.entries = {}
+
+    def plan_key(self, version_id, mc_dir, options):
+        json_digest = version_json_digest(version_id, mc_dir)
+        if json_digest is None:
+            return None
+        stable_options = {k: v for k, v in options.items() if k not in LAUNCH_PLACEHOLDERS and k != LAUNCH_JVM_OPTION}
+        material = json.dumps([version_id, os.path.abspath(mc_dir), json_digest, stable_options], sort_keys=True, default=str)
+        return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+    def get_command(self, version_id, mc_dir, options, build_command, save=True):
+        """Returns the launch command, calling build_command(version_id, mc_dir, options) only on a miss.
+
+        With save=False the cache is only read; a miss is built but not remembered.
+        """
+        key = self.plan_key(version_id, mc_dir, options)
+        if key is None:
+            # Let the builder raise its usual "version not found" error
+            return [str(arg) for arg in build_command(version_id, mc_dir, options)]
+
+        entry = self.entries.get(key)
+        if entry is None:
+            template_options = dict(options)
+            template_options.update(LAUNCH_PLACEHOLDERS)
+            template_options[LAUNCH_JVM_OPTION] = []
+            entry = {"command": [str(arg) for arg in build_command(version_id, mc_dir, template_options)]}
+            if save:
+                self.entries[key] = entry
+        if save:
+            entry["used"] = time.time()
+            self._trim()
+            try:
+                write_json_file(self.path, self.entries)
+            except OSError as e:
+                print(f"Warning: Could not save the launch plan cache: {e}")
+
+        values = {marker: str(options.get(name, "")) for name, marker in LAUNCH_PLACEHOLDERS.items()}
+        command = []
+        for arg in entry["command"]:
+            if "@@CL_" in arg:
+                for marker, value in values.items():
+                    arg = arg.replace(marker, value)
+            command.append(arg)
+        command[1:1] = [str(arg) for arg in options.get(LAUNCH_JVM_OPTION, [])]
+        return command
+
+    def _trim(self):
+        if len(self.entries) <= self.max_entries:
+            return
+        by_age = sorted(self.entries, key=lambda k: self.entries[k].get("used", 0))
+        for key in by_age[:len(self.entries) - self.max_entries]:
+            del self.entries[key]
+
+
+###############################################################################
+# CONSOLE BUFFER
+###############################################################################
+OUTPUT_POLICIES = ("keep", "sample", "drop")
+
+
+def limit_lines(lines, budget, policy):
+    """Cuts lines down to budget for display: "keep" returns them all, "sample" keeps an
+    evenly spaced subset and "drop" the first ones. Lossy policies add a note line."""
+    excess = len(lines) - budget
+    if policy not in ("sample", "drop") or excess <= 0:
+        return lines
+    if policy == "drop":
+        kept = lines[:budget]
+        note = f"[Launcher] Output too fast: dropped {excess} line(s)\n"
+    else:
+        step = len(lines) / budget
+        kept = [lines[int(i * step)] for i in range(budget)]
+        note = f"[Launcher] Output too fast: showing 1 in {step:.1f} lines ({excess} skipped)\n"
+    kept.append(note)
+    return kept
+
+
+class ConsoleBuffer:
+    """Thread-safe sink for console text that the GUI drains in batches.
+
+    Every write goes to a disk-backed log for this session, the newest max_lines lines
+    are kept in memory, and drain() hands back everything written since the last call
+    as one string. With a lossy policy, drain() returns at most max_lines_per_drain
+    lines (see limit_lines); the log always gets everything.
+    """
+    LOG_DIR = os.path.join(CACHE_DIR, "logs")
+    KEEP_LOGS = 10
+
+    def __init__(self, log_path=None, max_lines=5000, policy="keep", max_lines_per_drain=None):
+        if log_path is None:
+            # One file per session so a second launcher (or the next start) can't clobber this one
+            log_path = os.path.join(self.LOG_DIR, time.strftime("console-%Y%m%d-%H%M%S") + f"-{os.getpid()}.log")
+            self._prune_logs(self.LOG_DIR, self.KEEP_LOGS - 1)
+        self.log_path = log_path
+        os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+        self._log = open(self.log_path, "w", encoding="utf-8", errors="replace")
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_lines = 0
+        self.recent = collections.deque(maxlen=max_lines)
+        self.policy = policy if policy in OUTPUT_POLICIES else "sample"
+        self.max_lines_per_drain = max_lines_per_drain
+        self.bytes_written = 0
+
+    @staticmethod
+    def _prune_logs(log_dir, keep):
+        """Deletes all but the newest keep session logs in log_dir."""
+        logs = sorted(glob.glob(os.path.join(log_dir, "console-*.log")), key=os.path.getmtime, reverse=True)
+        for path in logs[keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _limited(self, text):
+        return "".join(limit_lines(text.splitlines(keepends=True), self.max_lines_per_drain, self.policy))
+
+    def append(self, text):
+        """Queues text from any thread."""
+        if not text:
+            return
+        with self._lock:
+            self._pending.append(text)
+            self.recent.extend(text.splitlines())
+            if self._log is not None:
+                self._log.write(text)
+            self.bytes_written += len(text.encode("utf-8", "replace"))
+            if self.policy != "keep" and self.max_lines_per_drain:
+                self._pending_lines += text.count("\n")
+                if self._pending_lines > 4 * self.max_lines_per_drain:
+                    # The GUI is falling behind; cut the backlog down now so it can't grow without bound
+                    self._pending = [self._limited("".join(self._pending))]
+                    self._pending_lines = self._pending[0].count("\n")
+
+    def drain(self):
+        """Returns everything appended since the last drain (empty string if nothing)."""
+        with self._lock:
+            if not self._pending:
+                return ""
+            text = "".join(self._pending)
+            self._pending = []
+            self._pending_lines = 0
+        if self.policy != "keep" and self.max_lines_per_drain:
+            text = self._limited(text)
+        return text
+
+    def tail(self, count):
+        """The last count lines held in memory."""
+        with self._lock:
+            return list(self.recent)[-count:]
+
+    def save_to(self, path):
+        """Streams the full session log to path."""
+        with self._lock:
+            self._log.flush()
+            with open(self.log_path, "rb") as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def masked_command(command, token):
+    """The launch command with the access token blanked out, for printing and logs."""
+    return [arg.replace(token, "<access token>") if token else arg for arg in command]
+
+
+###############################################################################
+# PROCESS OUTPUT PUMP
+###############################################################################
+class OutputPump:
+    """Drains a child process' binary stdout and delivers decoded lines in batches.
+
+    A reader thread keeps the pipe empty at all times so the game never blocks on a
+    full pipe. Lines are decoded incrementally and every line is handed to
+    on_batch(lines) at most once per batch_interval; rate limiting for display is up
+    to the consumer (see limit_lines). tap(lines), if given, sees each batch first.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, stream, on_batch, batch_interval=0.05, encoding="utf-8", tap=None):
+        self.stream = stream
+        self.on_batch = on_batch
+        self.tap = tap
+        self.batch_interval = batch_interval
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._partial = ""
+        self._pending = []
+        self._lock = threading.Lock()
+        self._data_ready = threading.Event()
+        self._eof = threading.Event()
+
+    def _read_loop(self):
+        fd = self.stream.fileno()
+        try:
+            while True:
+                chunk = os.read(fd, self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._feed(self._decoder.decode(chunk))
+        except OSError:
+            pass
+        finally:
+            self._feed(self._decoder.decode(b"", final=True), final=True)
+            self._eof.set()
+            self._data_ready.set()
+
+    def _feed(self, text, final=False):
+        text = self._partial + text
+        lines = text.splitlines(keepends=True)
+        # A trailing "\r" may be the first half of a "\r\n" split across two reads
+        if lines and not final and (lines[-1].endswith("\r") or not lines[-1].endswith("\n")):
+            self._partial = lines.pop()
+        else:
+            self._partial = ""
+        if lines:
+            with self._lock:
+                self._pending.extend(lines)
+            self._data_ready.set()
+
+    def run(self):
+        """Pumps until the stream reaches EOF. Call from the thread that should deliver batches."""
+        reader = threading.Thread(target=self._read_loop, daemon=True)
+        reader.start()
+        while True:
+            self._data_ready.wait()
+            finished = self._eof.is_set()
+            with self._lock:
+                lines, self._pending = self._pending, []
+                self._data_ready.clear()
+            if lines:
+                if self.tap:
+                    self.tap(lines)
+                self.on_batch(lines)
+            if finished:
+                break
+            # Let output accumulate so a chatty game costs one delivery per interval
+            self._eof.wait(self.batch_interval)
+        reader.join()
+
+
+###############################################################################
+# CRASH ANALYZER
+###############################################################################
+# (id, regex, title, hint). All patterns are compiled into one alternation so every
+# line is checked against every signature in a single regex pass.
+CRASH_SIGNATURES = [
+    ("out_of_memory",
+     r"java\.lang\.OutOfMemoryError|Could not reserve enough space for .*object heap|There is insufficient memory for the Java Runtime",
+     "Out of memory",
+     "Give the game more RAM in Settings, or remove memory-hungry mods and shaders."),
+    ("java_version",
+     r"UnsupportedClassVersionError|compiled by a more recent version of the Java Runtime|requires Java \d+|Unrecognized option: --add-opens",
+     "Wrong Java version",
+     "This version needs a different Java. Clear the custom Java path or point it at the required Java version."),
+    ("mixin_conflict",
+     r"MixinApplyError|InvalidMixinException|Mixin (?:apply|transformation) (?:for mod \S+ )?failed|org\.spongepowered\.asm\.mixin\.(?:transformer\.)?throwables",
+     "Mixin conflict",
+     "Two mods are patching the same game code. Remove recently added mods one by one to find the pair."),
+    ("missing_dependency",
+     r"which is missing!|Missing or unsupported mandatory dependencies|MissingModsException|requires (?:any version|version \S+) of \S+|Could not find required mod",
+     "Missing mod dependency",
+     "A mod needs another mod (or a different version of it) that isn't installed."),
+    ("duplicate_mod",
+     r"DuplicateModsFoundException|Found duplicate mods|Duplicate mods? found",
+     "Duplicate mods",
+     "The same mod is installed twice. Keep only one copy in the mods folder."),
+    ("incompatible_loader",
+     r"Incompatible mods? found|Incompatible mod set|not compatible with (?:Fabric|Forge)|requires (?:fabric|forge)(?:loader)? ",
+     "Incompatible mods or loader",
+     "A mod was made for another Minecraft version or mod loader."),
+    ("gl_error",
+     r"GLFW error|No OpenGL context|Pixel format not accelerated|OpenGL \S+ (?:is )?not supported|GL_OUT_OF_MEMORY|Failed to create (?:the )?(?:display|window)",
+     "Graphics driver / OpenGL error",
+     "Update your graphics drivers, and disable shaders if you use them."),
+    ("corrupt_file",
+     r"java\.util\.zip\.ZipException|invalid LOC header|zip END header not found|Invalid or corrupt jarfile",
+     "Corrupted game or mod file",
+     "A jar is damaged. Verify the installation or re-download the affected mod."),
+    ("native_crash",
+     r"A fatal error has been detected by the Java Runtime Environment|EXCEPTION_ACCESS_VIOLATION|SIGSEGV \(0xb\)",
+     "JVM native crash",
+     "The Java process itself crashed, usually because of a graphics driver or a native mod. Check the hs_err log."),
+]
+
+
+class CrashAnalyzer:
+    """Streams game output and crash reports through a precompiled signature matcher.
+
+    on_finding(finding) is called the first time each signature matches, while the
+    game is still running. Nothing is buffered beyond the current line.
+    """
+    def __init__(self, on_finding=None, signatures=CRASH_SIGNATURES):
+        self.on_finding = on_finding
+        self.signatures = {sig_id: (title, hint) for sig_id, _, title, hint in signatures}
+        self.pattern = re.compile("|".join(f"(?P<{sig_id}>{regex})" for sig_id, regex, _, _ in signatures))
+        self.findings = {}
+
+    def feed(self, lines, source="game output"):
+        """Checks an iterable of lines. Returns the number of matching lines."""
+        search = self.pattern.search
+        matched = 0
+        for line in lines:
+            m = search(line)
+            if m is not None:
+                matched += 1
+                self._record(m.lastgroup, line, source)
+        return matched
+
+    def _record(self, sig_id, line, source):
+        finding = self.findings.get(sig_id)
+        if finding is not None:
+            finding["count"] += 1
+            return
+        title, hint = self.signatures[sig_id]
+        finding = self.findings[sig_id] = {
+            "id": sig_id,
+            "title": title,
+            "hint": hint,
+            "line": line.strip()[:300],
+            "source": source,
+            "count": 1
+        }
+        if self.on_finding:
+            self.on_finding(finding)
+
+    def scan_file(self, path):
+        """Streams one log or crash report through the matcher."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return self.feed(f, source=os.path.basename(path))
+        except OSError:
+            return 0
+
+    def scan_crash_reports(self, game_dir, since=0):
+        """Scans crash reports and JVM hs_err logs written to game_dir after since (a timestamp)."""
+        paths = glob.glob(os.path.join(game_dir, "crash-reports", "*.txt")) + glob.glob(os.path.join(game_dir, "hs_err_pid*.log"))
+        scanned = []
+        for path in sorted(paths, key=os.path.getmtime):
+            if os.path.getmtime(path) >= since:
+                self.scan_file(path)
+                scanned.append(path)
+        return scanned
+
+    def summary(self):
+        """A readable report of everything found, or an empty string."""
+        if not self.findings:
+            return ""
+        parts = [f"- {f['title']}: {f['hint']}\n  ({f['source']}: {f['line']})" for f in self.findings.values()]
+        return "The crash analyzer found the following problem(s):\n" + "\n".join(parts)
+
+
+###############################################################################
+# JAVA RUNTIME INDEX
+###############################################################################
+def required_java_major(version_id, mc_dir, default=8):
+    """The javaVersion.majorVersion a version (or one it inherits from) asks for."""
+    for data in version_chain(version_id, mc_dir):
+        major = data.get("javaVersion", {}).get("majorVersion")
+        if major:
+            return int(major)
+    return default
+
+
+def java_candidate_paths(mc_dir=None):
+    """Every java executable we can find without running anything."""
+    exe = "java.exe" if sys.platform == "win32" else "java"
+    patterns = []
+    if sys.platform == "win32":
+        for root in filter(None, [os.getenv("ProgramFiles"), os.getenv("ProgramFiles(x86)")]):
+            for vendor in ("Java", "Eclipse Adoptium", "Microsoft", "Zulu", "BellSoft", "Amazon Corretto"):
+                patterns.append(os.path.join(root, vendor, "*", "bin", exe))
+    elif sys.platform == "darwin":
+        patterns += ["/Library/Java/JavaVirtualMachines/*/Contents/Home/bin/java",
+                     os.path.expanduser("~/Library/Java/JavaVirtualMachines/*/Contents/Home/bin/java"),
+                     "/Library/Internet Plug-Ins/JavaAppletPlugin.plugin/Contents/Home/bin/java"]
+    else:
+        patterns += ["/usr/lib/jvm/*/bin/java", "/usr/lib64/jvm/*/bin/java", "/opt/*/bin/java",
+                     os.path.expanduser("~/.sdkman/candidates/java/*/bin/java")]
+    if mc_dir:
+        # Runtimes installed by minecraft_launcher_lib / the official launcher
+        patterns.append(os.path.join(mc_dir, "runtime", "*", "*", "*", "bin", exe))
+
+    paths = []
+    for pattern in patterns:
+        paths.extend(glob.glob(pattern))
+    if os.getenv("JAVA_HOME"):
+        paths.append(os.path.join(os.getenv("JAVA_HOME"), "bin", exe))
+    path_java = shutil.which("java")
+    if path_java:
+        paths.append(path_java)
+
+    unique = []
+    seen = set()
+    for path in paths:
+        real = os.path.realpath(path)
+        if real not in seen and os.path.isfile(real):
+            seen.add(real)
+            unique.append(real)
+    return unique
+
+
+def _probe_unsupported_gcs(path, major, timeout):
+    """GC presets with a probe_flag that this JVM refuses to start with."""
+    unsupported = []
+    for name, preset in GC_PRESETS.items():
+        if "probe_flag" not in preset or major < preset["min_java"]:
+            continue
+        try:
+            result = subprocess.run([path, preset["probe_flag"], "-version"], stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL, timeout=timeout)
+            if result.returncode != 0:
+                unsupported.append(name)
+        except (OSError, subprocess.SubprocessError):
+            unsupported.append(name)
+    return unsupported
+
+
+def probe_java(path, timeout=15):
+    """Runs java -XshowSettings:properties -version and returns the interesting properties, or None.
+
+    Also lists the GC presets the build can't start with under "unsupported_gcs".
+    """
+    try:
+        result = subprocess.run([path, "-XshowSettings:properties", "-version"], stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    props = {}
+    for line in result.stdout.decode("utf-8", errors="replace").splitlines():
+        key, sep, value = line.strip().partition(" = ")
+        if sep:
+            props[key] = value.strip()
+    spec = props.get("java.specification.version")
+    if not spec:
+        return None
+    # Java 8 and older report "1.8"
+    major = int(spec.split(".")[1]) if spec.startswith("1.") else int(spec.split(".")[0])
+    return {
+        "major": major,
+        "version": props.get("java.version", spec),
+        "vendor": props.get("java.vendor", ""),
+        "arch": props.get("os.arch", ""),
+        "bits": props.get("sun.arch.data.model", ""),
+        "unsupported_gcs": _probe_unsupported_gcs(path, major, timeout)
+    }
+
+
+class JavaRuntimeIndex:
+    """Cached index of installed JVMs keyed by major version.
+
+    Candidates are found by globbing, then probed in parallel. Probe results, failed
+    ones included, are cached with the executable's mtime and reused until the file
+    changes, so a warm refresh is a glob and a stat per JVM. find() is a dict lookup.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_workers=8):
+        self.path = os.path.join(cache_dir, "java_runtimes.json")
+        self.max_workers = max_workers
+        self.runtimes = read_json_file(self.path, {})
+        if not isinstance(self.runtimes, dict):
+            self.runtimes = {}
+        self.by_major = {}
+        self._build_table()
+
+    def refresh(self, mc_dir=None, extra_paths=()):
+        """Re-discovers JVMs, probing only new or modified executables."""
+        candidates = java_candidate_paths(mc_dir) + [p for p in extra_paths if p and os.path.isfile(p)]
+        runtimes = {}
+        to_probe = []
+        for path in candidates:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            cached = self.runtimes.get(path)
+            # Entries from before GC support was probed are probed again
+            if cached and cached.get("mtime_ns") == mtime_ns and (cached.get("failed") or "unsupported_gcs" in cached):
+                runtimes[path] = cached
+            else:
+                to_probe.append((path, mtime_ns))
+
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(lambda item: (item, probe_java(item[0])), to_probe)
+                for (path, mtime_ns), info in results:
+                    # Remember failures too, so a broken JVM isn't run again on every launch
+                    info = info or {"failed": True}
+                    info["mtime_ns"] = mtime_ns
+                    runtimes[path] = info
+
+        changed = runtimes != self.runtimes
+        self.runtimes = runtimes
+        self._build_table()
+        if changed:
+            try:
+                write_json_file(self.path, self.runtimes)
+            except OSError as e:
+                print(f"Warning: Could not save the Java runtime index: {e}")
+        return {path: info for path, info in self.runtimes.items() if not info.get("failed")}
+
+    def _build_table(self):
+        # Best runtime per exact major: prefer 64-bit, then the newest update
+        best = {}
+        for path, info in self.runtimes.items():
+            if info.get("failed"):
+                continue
+            rank = (info.get("bits") == "64", _version_key(info.get("version", "")))
+            current = best.get(info["major"])
+            if current is None or rank > current[0]:
+                best[info["major"]] = (rank, path)
+        # Fill every major up to the newest one, falling back to the closest newer runtime
+        table = {}
+        fallback = None
+        for major in range(max(best, default=0), 0, -1):
+            if major in best:
+                fallback = best[major][1]
+            table[major] = fallback
+        self.by_major = table
+
+    def find(self, major):
+        """The best executable for a Java major version (exact, else the closest newer one), or None.
+
+        Compare major_of() of the result with major to tell a fallback from an exact match.
+        """
+        return self.by_major.get(major)
+
+    def info_of(self, path):
+        """The probe result for a given executable, probing it if it isn't indexed yet. None if unknown."""
+        real = os.path.realpath(path)
+        info = self.runtimes.get(real)
+        try:
+            mtime_ns = os.stat(real).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        stale = info is None or info.get("mtime_ns") != mtime_ns or not (info.get("failed") or "unsupported_gcs" in info)
+        if stale and mtime_ns is not None:
+            info = probe_java(real) or {"failed": True}
+            info["mtime_ns"] = mtime_ns
+            self.runtimes[real] = info
+            self._build_table()
+        if info is None or info.get("failed"):
+            return None
+        return info
+
+    def major_of(self, path):
+        """The major version of a given executable, probing it if it isn't indexed yet. None if unknown."""
+        info = self.info_of(path)
+        return info["major"] if info else None
+
+    def unsupported_gcs(self, path):
+        """GC presets the executable can't start with (see GC_PRESETS' probe_flag)."""
+        info = self.info_of(path)
+        return info.get("unsupported_gcs", []) if info else []
+
+
+###############################################################################
+# MEMORY ALLOCATION AND GC PRESETS
+###############################################################################
+def system_memory_mb():
+    """Returns (total, available) physical memory in MB, or (None, None) if unknown."""
+    try:
+        if sys.platform.startswith("linux"):
+            info = {}
+            with open("/proc/meminfo", "r") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    info[key] = int(value.split()[0]) // 1024
+            return info.get("MemTotal"), info.get("MemAvailable", info.get("MemFree"))
+        if sys.platform == "win32":
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullTotalPhys // 2**20, status.ullAvailPhys // 2**20
+        if sys.platform == "darwin":
+            total = int(subprocess.check_output(["sysctl", "-n", "hw.memsize"])) // 2**20
+            vm_stat = subprocess.check_output(["vm_stat"]).decode()
+            page_size = int(re.search(r"page size of (\d+)", vm_stat).group(1))
+            free_pages = sum(int(m) for m in re.findall(r"Pages (?:free|inactive|speculative):\s+(\d+)", vm_stat))
+            return total, free_pages * page_size // 2**20
+    except Exception:
+        pass
+    return None, None
+
+
+def count_mods(game_dir):
+    """Number of mod jars in a profile's mods folder."""
+    try:
+        return sum(1 for entry in os.scandir(os.path.join(game_dir, "mods")) if entry.name.endswith(".jar") and entry.is_file())
+    except OSError:
+        return 0
+
+
+def minecraft_minor(version_id):
+    """The minor release number of a version ID ("1.20.1" -> 20), or None for snapshots and odd IDs."""
+    m = re.search(r"(?:^|-)1\.(\d+)(?:\.\d+)?(?:$|-)", version_id)
+    return int(m.group(1)) if m else None
+
+
+def recommend_heap_mb(version_id, mod_count, memory=None, minimum=1024, maximum=16384):
+    """Chooses a heap size from the version, the number of mods and the memory that is actually free.
+
+    memory is a (total, available) pair in MB as returned by system_memory_mb().
+    """
+    minor = minecraft_minor(version_id)
+    if minor is not None and minor < 13:
+        base = 1024
+    elif minor is not None and minor < 18:
+        base = 2048
+    else:
+        base = 2560 # 1.18+ world generation is noticeably heavier
+    wanted = base + mod_count * 48
+
+    total, available = memory if memory is not None else system_memory_mb()
+    if available:
+        # Stay within what is free right now, leaving room for the JVM's own overhead
+        wanted = min(wanted, int(available * 0.8))
+    if total:
+        wanted = min(wanted, total - 2048)
+    wanted = max(minimum, min(maximum, wanted))
+    return wanted - wanted % 256
+
+
+def _g1_region_size_mb(heap_mb):
+    # Aim for roughly 2048 regions, as G1 does, but clamp to its 4-32 MB sweet spot
+    size = 4
+    while size < 32 and heap_mb / size > 2048:
+        size *= 2
+    return size
+
+
+GC_PRESETS = {
+    "g1": {
+        "label": "G1 (balanced, recommended)",
+        "min_java": 8,
+    },
+    "zgc": {
+        "label": "ZGC (lowest pauses, large heaps)",
+        "min_java": 17,
+    },
+    "shenandoah": {
+        "label": "Shenandoah (low pauses, OpenJDK builds only)",
+        "min_java": 17,
+        "probe_flag": "-XX:+UseShenandoahGC", # Oracle builds leave it out and refuse to start
+    },
+    "parallel": {
+        "label": "Parallel (throughput, older versions)",
+        "min_java": 8,
+    },
+    "default": {
+        "label": "JVM default",
+        "min_java": 8,
+    },
+}
+
+
+def gc_preset_args(preset, heap_mb, java_major=None, unsupported=()):
+    """JVM flags for a GC preset. Falls back to G1 if the Java runtime is too old for the preset or lacks it."""
+    if preset not in GC_PRESETS:
+        preset = "g1"
+    if java_major is not None and java_major < GC_PRESETS[preset]["min_java"]:
+        print(f"Warning: The {GC_PRESETS[preset]['label']} preset needs Java {GC_PRESETS[preset]['min_java']}+, using G1 instead.")
+        preset = "g1"
+    elif preset in unsupported:
+        print(f"Warning: This Java build doesn't include the {GC_PRESETS[preset]['label']} collector, using G1 instead.")
+        preset = "g1"
+
+    if preset == "g1":
+        # Short pauses with a large young generation, the usual tuning for Minecraft's allocation pattern
+        return ["-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", "-XX:MaxGCPauseMillis=200",
+                "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC",
+                "-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40",
+                f"-XX:G1HeapRegionSize={_g1_region_size_mb(heap_mb)}M", "-XX:G1ReservePercent=20",
+                "-XX:G1HeapWastePercent=5", "-XX:G1MixedGCCountTarget=4",
+                "-XX:InitiatingHeapOccupancyPercent=15", "-XX:G1MixedGCLiveThresholdPercent=90",
+                "-XX:G1RSetUpdatingPauseTimePercent=5", "-XX:SurvivorRatio=32", "-XX:+PerfDisableSharedMem",
+                "-XX:MaxTenuringThreshold=1"]
+    if preset == "zgc":
+        args = ["-XX:+UseZGC", "-XX:+DisableExplicitGC"]
+        if java_major is not None and 21 <= java_major < 23:
+            args.append("-XX:+ZGenerational") # Default from Java 23 on
+        return args
+    if preset == "shenandoah":
+        return ["-XX:+UseShenandoahGC", "-XX:+DisableExplicitGC"]
+    if preset == "parallel":
+        return ["-XX:+UseParallelGC", "-XX:+DisableExplicitGC"]
+    return []
+
+
+###############################################################################
+# CLASS DATA SHARING (AppCDS)
+###############################################################################
+class CdsArchiveManager:
+    """Records a dynamic AppCDS archive on the first launch of a classpath and reuses it afterwards.
+
+    Archives are keyed on the Java executable (path and mtime), the classpath, the
+    module path and the collector flags, so any change to them records a new archive
+    instead of reusing a stale one. Needs Java 13+ for -XX:ArchiveClassesAtExit.
+    Each recording JVM writes its own temp file, renamed into place by finish() once
+    the game exits, so concurrent launches never share a half-written archive. Only
+    max_archives archives are kept because each one can be 100 MB or more; archives
+    of games still running (see acquire()) are never pruned.
+    """
+    MIN_JAVA = 13
+    STALE_RECORDING = 24 * 3600 # Temp files of launches that never finished are removed after this
+
+    def __init__(self, cache_dir=CACHE_DIR, max_archives=6):
+        self.archive_dir = os.path.join(cache_dir, "cds")
+        self.max_archives = max_archives
+        self.lock = threading.Lock()
+        self.in_use = collections.Counter()
+
+    @staticmethod
+    def _arg_after(command, *flags):
+        for flag in flags:
+            if flag in command:
+                i = command.index(flag)
+                if i + 1 < len(command):
+                    return command[i + 1]
+        return ""
+
+    def archive_key(self, command):
+        java = os.path.realpath(command[0])
+        try:
+            java_stamp = str(os.stat(java).st_mtime_ns)
+        except OSError:
+            java_stamp = ""
+        gc_flags = sorted(arg for arg in command if arg.startswith("-XX:+Use") and arg.endswith("GC"))
+        material = "\0".join([java, java_stamp, self._arg_after(command, "-cp", "-classpath"),
+                              self._arg_after(command, "-p", "--module-path")] + gc_flags)
+        return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+    def archive_args(self, command, java_major, dry_run=False):
+        """JVM flags to insert after the executable: use the archive if it exists, otherwise record it.
+
+        Returns (flags, archive path, temp path being recorded or None); the paths go to acquire()/finish().
+        A dry run returns the same kind of flags without touching the archive folder.
+        """
+        if java_major is None or java_major < self.MIN_JAVA:
+            return [], None, None
+        archive = os.path.join(os.path.abspath(self.archive_dir), f"{self.archive_key(command)}.jsa")
+        if os.path.isfile(archive) and os.path.getsize(archive) > 0:
+            if not dry_run:
+                os.utime(archive) # Mark as recently used for pruning
+            # -Xshare:auto makes an unusable archive a warning instead of a startup failure
+            return [f"-XX:SharedArchiveFile={archive}", "-Xshare:auto"], archive, None
+        if dry_run:
+            return [f"-XX:ArchiveClassesAtExit={archive}.part"], archive, None
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self.prune()
+        recording = f"{archive}.{os.getpid()}-{threading.get_ident()}-{time.time_ns()}.part"
+        return [f"-XX:ArchiveClassesAtExit={recording}"], archive, recording
+
+    def acquire(self, archive):
+        """Marks an archive as used by a running game so prune() leaves it alone."""
+        with self.lock:
+            self.in_use[archive] += 1
+
+    def finish(self, archive, recording=None):
+        """Releases an acquire() and moves a finished recording into place (the first one wins)."""
+        with self.lock:
+            self.in_use[archive] -= 1
+            if self.in_use[archive] <= 0:
+                del self.in_use[archive]
+            if not recording:
+                return
+            try:
+                if os.path.isfile(recording) and os.path.getsize(recording) > 0 and not os.path.isfile(archive):
+                    os.replace(recording, archive)
+                elif os.path.exists(recording):
+                    os.remove(recording)
+            except OSError as e:
+                print(f"Warning: Could not store the class data sharing archive: {e}")
+
+    def prune(self):
+        """Deletes the least recently used archives beyond max_archives, and abandoned recordings."""
+        try:
+            entries = list(os.scandir(self.archive_dir))
+        except OSError:
+            return
+        now = time.time()
+        with self.lock:
+            for entry in entries:
+                if entry.name.endswith(".part") and now - entry.stat().st_mtime > self.STALE_RECORDING:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+            archives = [entry.path for entry in entries if entry.name.endswith(".jsa")]
+            archives.sort(key=os.path.getmtime, reverse=True)
+            for path in archives[self.max_archives - 1:]:
+                if path in self.in_use:
+                    continue # A running JVM has it mapped
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+###############################################################################
+# INTEGRITY VERIFIER
+###############################################################################
+def _sha1_or_none(path):
+    """sha1_of_file for the worker pool: None if the file can't be read, so one bad file doesn't stop the pass."""
+    try:
+        return sha1_of_file(path)
+    except OSError:
+        return None
+
+
+class IntegrityVerifier:
+    """Checks the SHA-1 of every library, asset and client jar of a version against its manifests.
+
+    Hashes are remembered with each file's (inode, size, mtime), so a later run only
+    rehashes files that changed. Hashing runs on a process pool, or on threads if
+    processes aren't available. repair() re-downloads just the bad files.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_workers=None):
+        self.path = os.path.join(cache_dir, "verified_files.json")
+        self.max_workers = max_workers or max(2, min(8, os.cpu_count() or 2))
+        self.hashes = read_json_file(self.path, {})
+        if not isinstance(self.hashes, dict):
+            self.hashes = {}
+
+    def _hash_all(self, paths, progress):
+        results = {}
+        def collect(executor, todo, digests):
+            with executor:
+                for path, digest in zip(todo, digests):
+                    results[path] = digest
+                    progress(len(results), len(paths), f"Verifying: {len(results)}/{len(paths)}")
+        pool = None
+        try:
+            # Forking a process that runs Qt and other threads can deadlock, so workers are spawned.
+            # They start when the work is submitted, so map() belongs to setting the pool up.
+            pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            digests = pool.map(_sha1_or_none, paths, chunksize=32)
+        except (OSError, NotImplementedError) as e:
+            print(f"Warning: Worker processes are not available ({e}), hashing on threads")
+            if pool is not None:
+                pool.shutdown(wait=False)
+        else:
+            try:
+                collect(pool, paths, digests)
+                return results
+            except BrokenProcessPool as e:
+                print(f"Warning: A hashing worker process died ({e}), finishing on threads")
+        remaining = [p for p in paths if p not in results]
+        threads = ThreadPoolExecutor(max_workers=self.max_workers)
+        collect(threads, remaining, threads.map(_sha1_or_none, remaining))
+        return results
+
+    def verify(self, version_id, mc_dir, progress_callback=None):
+        """Returns the DownloadJobs whose files are missing or don't match their hash."""
+        progress = progress_callback or (lambda *args: None)
+        bad = []
+        to_hash = {}
+        for job in collect_version_jobs(version_id, mc_dir):
+            if not job.sha1:
+                continue
+            try:
+                st = os.stat(job.path)
+            except OSError:
+                bad.append(job)
+                continue
+            stamp = [st.st_ino, st.st_size, st.st_mtime_ns]
+            cached = self.hashes.get(job.path)
+            if cached and cached[:3] == stamp:
+                if cached[3] != job.sha1:
+                    bad.append(job)
+                continue
+            to_hash[job.path] = (job, stamp)
+
+        if to_hash:
+            paths = list(to_hash)
+            for path, digest in self._hash_all(paths, progress).items():
+                job, stamp = to_hash[path]
+                if digest is None:
+                    # Unreadable, like a file we couldn't stat; nothing worth caching
+                    bad.append(job)
+                    continue
+                self.hashes[path] = stamp + [digest]
+                if digest != job.sha1:
+                    bad.append(job)
+            try:
+                write_json_file(self.path, self.hashes)
+            except OSError as e:
+                print(f"Warning: Could not save the verification cache: {e}")
+        return bad
+
+    def repair(self, bad_jobs, engine):
+        """Deletes and re-downloads bad files. A corrupt object shared through the store is dropped too."""
+        for job in bad_jobs:
+            self.hashes.pop(job.path, None)
+            if not os.path.isfile(job.path):
+                continue
+            store = engine.store
+            if store is not None and store.has(job.sha1) and os.path.samefile(store.path_for(job.sha1), job.path):
+                os.remove(store.path_for(job.sha1))
+            os.remove(job.path)
+        return engine.run(bad_jobs, status="Repairing")
+
+
+###############################################################################
+# MODPACK EXTRACTION
+###############################################################################
+def _crc32_of_file(path, chunk_size=1024 * 1024):
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc & 0xFFFFFFFF
+
+
+def _safe_member_path(dest_dir, name):
+    """Where a zip member should go inside dest_dir, or None if it would escape it."""
+    parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".")]
+    if not parts or ".." in parts or ":" in parts[0]:
+        return None
+    target = os.path.abspath(os.path.join(dest_dir, *parts))
+    if not target.startswith(os.path.abspath(dest_dir) + os.sep):
+        return None
+    return target
+
+
+def extract_modpack(zip_path, dest_dir, progress_callback=None, max_workers=4, prefix=""):
+    """Extracts a zip into dest_dir on a thread pool, skipping files that are already up to date.
+
+    A member is skipped when a file of the same size and CRC32 already exists, so
+    re-importing an updated pack only writes what changed. Members are streamed to
+    a temp file and renamed into place. With a prefix, only members under it are
+    extracted, with the prefix stripped. Members whose path would escape dest_dir
+    are not extracted. Returns (written, skipped, rejected).
+    """
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        members = [info for info in zf.infolist() if not info.is_dir() and info.filename.startswith(prefix)]
+    total = len(members)
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def open_zip():
+        # ZipFile handles aren't safe to share between threads, so each worker gets its own
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path, "r")
+            with handles_lock:
+                handles.append(zf)
+        return zf
+
+    def extract_member(info):
+        target = _safe_member_path(dest_dir, info.filename[len(prefix):])
+        if target is None:
+            print(f"Warning: Skipping unsafe path in modpack: {info.filename}")
+            return "rejected"
+        if os.path.isfile(target) and os.path.getsize(target) == info.file_size and _crc32_of_file(target) == info.CRC:
+            return "skipped"
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{threading.get_ident()}.part"
+        with open_zip().open(info) as src, open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp_path, target)
+        return "written"
+
+    counts = {"written": 0, "skipped": 0, "rejected": 0}
+    done = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(extract_member, info) for info in members]
+            for future in as_completed(futures):
+                done += 1
+                counts[future.result()] += 1
+                if progress_callback:
+                    progress_callback(done, total, f"Extracting modpack: {done}/{total}")
+    finally:
+        for zf in handles:
+            zf.close()
+    return counts["written"], counts["skipped"], counts["rejected"]
+
+
+###############################################################################
+# MODPACK MANIFEST IMPORT (Modrinth / CurseForge)
+###############################################################################
+MODRINTH_INDEX = "modrinth.index.json"
+CURSEFORGE_MANIFEST = "manifest.json"
+
+
+def detect_modpack_format(zip_path):
+    """Returns "modrinth", "curseforge" or "zip" for a plain archive."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        names = set(zf.namelist())
+        if MODRINTH_INDEX in names:
+            return "modrinth"
+        if CURSEFORGE_MANIFEST in names:
+            try:
+                manifest = json.loads(zf.read(CURSEFORGE_MANIFEST).decode("utf-8"))
+            except ValueError:
+                return "zip"
+            if manifest.get("manifestType") == "minecraftModpack":
+                return "curseforge"
+    return "zip"
+
+
+class ModpackImporter:
+    """Imports Modrinth (.mrpack) and CurseForge modpacks into a profile directory.
+
+    The listed mods are fetched concurrently through a DownloadEngine, so hashes are
+    verified and, with a SharedStore on the engine, every mod is downloaded once for
+    all profiles. mirrors maps URL prefixes to replacements (e.g. a local stand-in
+    for https://cdn.modrinth.com), and curseforge_api_url can be overridden the same way.
+    """
+    def __init__(self, engine, curseforge_api_url=CURSEFORGE_API_URL, curseforge_api_key="", mirrors=None):
+        self.engine = engine
+        self.curseforge_api_url = curseforge_api_url.rstrip("/")
+        self.curseforge_api_key = curseforge_api_key
+        self.mirrors = mirrors or {}
+
+    def _rewrite(self, url):
+        for original, replacement in self.mirrors.items():
+            if url.startswith(original):
+                return replacement + url[len(original):]
+        return url
+
+    def import_pack(self, zip_path, profile_dir, progress_callback=None):
+        """Imports any supported pack. Returns a summary dict of what was done."""
+        pack_format = detect_modpack_format(zip_path)
+        summary = {"format": pack_format, "name": os.path.basename(zip_path), "downloaded": 0,
+                   "written": 0, "skipped": 0, "rejected": 0, "minecraft": None, "loader": None, "manual": []}
+        if pack_format == "zip":
+            summary["written"], summary["skipped"], summary["rejected"] = extract_modpack(zip_path, profile_dir, progress_callback)
+            return summary
+
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            if pack_format == "modrinth":
+                jobs, prefixes = self._modrinth_jobs(json.loads(zf.read(MODRINTH_INDEX).decode("utf-8")), profile_dir, summary)
+            else:
+                jobs, prefixes = self._curseforge_jobs(json.loads(zf.read(CURSEFORGE_MANIFEST).decode("utf-8")), profile_dir, summary)
+
+        summary["downloaded"] = self.engine.run(jobs, status="Downloading mods")
+        # Overrides are applied after the downloads so a pack can replace a downloaded file
+        for prefix in prefixes:
+            written, skipped, rejected = extract_modpack(zip_path, profile_dir, progress_callback, prefix=prefix)
+            summary["written"] += written
+            summary["skipped"] += skipped
+            summary["rejected"] += rejected
+        return summary
+
+    def _modrinth_jobs(self, index, profile_dir, summary):
+        summary["name"] = index.get("name", summary["name"])
+        dependencies = index.get("dependencies", {})
+        summary["minecraft"] = dependencies.get("minecraft")
+        for loader in ("fabric-loader", "quilt-loader", "forge", "neoforge"):
+            if loader in dependencies:
+                summary["loader"] = f"{loader} {dependencies[loader]}"
+        jobs = []
+        for entry in index.get("files", []):
+            if entry.get("env", {}).get("client") == "unsupported":
+                continue
+            target = _safe_member_path(profile_dir, entry.get("path", ""))
+            urls = entry.get("downloads", [])
+            if target is None or not urls:
+                print(f"Warning: Skipping invalid modpack entry: {entry.get('path')}")
+                summary["rejected"] += 1
+                continue
+            jobs.append(DownloadJob(self._rewrite(urls[0]), target, entry.get("hashes", {}).get("sha1"), entry.get("fileSize")))
+        return jobs, ["overrides/", "client-overrides/"]
+
+    def _curseforge_jobs(self, manifest, profile_dir, summary):
+        summary["name"] = manifest.get("name", summary["name"])
+        minecraft = manifest.get("minecraft", {})
+        summary["minecraft"] = minecraft.get("version")
+        primary = next((l["id"] for l in minecraft.get("modLoaders", []) if l.get("primary")), None)
+        summary["loader"] = primary
+        files = [f for f in manifest.get("files", []) if f.get("required", True)]
+        if files and not self.curseforge_api_key:
+            raise DownloadError("CurseForge modpacks need a CurseForge API key (curseforge_api_key in the launcher config).")
+
+        headers = {"x-api-key": self.curseforge_api_key, "Accept": "application/json"}
+        def resolve(entry):
+            url = f"{self.curseforge_api_url}/v1/mods/{entry['projectID']}/files/{entry['fileID']}"
+            return self.engine.fetch_json(url, headers)["data"]
+
+        jobs = []
+        with ThreadPoolExecutor(max_workers=self.engine.max_workers) as executor:
+            for entry, data in zip(files, executor.map(resolve, files)):
+                target = _safe_member_path(os.path.join(profile_dir, "mods"), data.get("fileName", ""))
+                if not data.get("downloadUrl") or target is None:
+                    # The author disabled third-party downloads; the user has to fetch it by hand
+                    summary["manual"].append(data.get("displayName") or f"{entry['projectID']}/{entry['fileID']}")
+                    continue
+                sha1 = next((h["value"] for h in data.get("hashes", []) if h.get("algo") == 1), None)
+                jobs.append(DownloadJob(self._rewrite(data["downloadUrl"]), target, sha1, data.get("fileLength")))
+        return jobs, [manifest.get("overrides", "overrides").rstrip("/") + "/"]
+
+
+###############################################################################
+# MOD METADATA INDEX
+###############################################################################
+# IDs provided by the game or the loader itself, never by a jar in mods/
+BUILTIN_MOD_IDS = {"minecraft", "java", "fabricloader", "fabric-loader", "quilt_loader", "forge", "neoforge", "fml",
+                   "mcp", "javafml", "lowcodefml"}
+
+
+def _parse_toml(text):
+    if tomllib is not None:
+        return tomllib.loads(text)
+    # Minimal fallback for older Pythons: [[mods]] entries only, no dependencies
+    mods = []
+    for block in re.split(r"^\s*\[\[mods\]\]\s*$", text, flags=re.M)[1:]:
+        block = re.split(r"^\s*\[", block, flags=re.M)[0]
+        fields = dict(re.findall(r'^\s*(\w+)\s*=\s*"([^"]*)"', block, flags=re.M))
+        mods.append(fields)
+    return {"mods": mods}
+
+
+def _manifest_version(zf):
+    try:
+        manifest = zf.read("META-INF/MANIFEST.MF").decode("utf-8", errors="replace")
+    except KeyError:
+        return None
+    m = re.search(r"^Implementation-Version:\s*(\S+)", manifest, flags=re.M)
+    return m.group(1) if m else None
+
+
+def read_mod_metadata(path):
+    """Reads the loader metadata of one mod jar. Only the central directory and the metadata files are read."""
+    mods = []
+    with zipfile.ZipFile(path, "r") as zf:
+        names = set(zf.namelist())
+        if "fabric.mod.json" in names:
+            data = json.loads(zf.read("fabric.mod.json").decode("utf-8", errors="replace"), strict=False)
+            mods.append({"id": data.get("id"), "name": data.get("name", data.get("id")), "version": str(data.get("version", "")),
+                         "loader": "fabric", "depends": sorted(data.get("depends", {})), "breaks": sorted(data.get("breaks", {})),
+                         "provides": sorted(data.get("provides", []))})
+        if "quilt.mod.json" in names:
+            loader = json.loads(zf.read("quilt.mod.json").decode("utf-8", errors="replace")).get("quilt_loader", {})
+            depends = [d if isinstance(d, str) else d.get("id") for d in loader.get("depends", [])]
+            breaks = [d if isinstance(d, str) else d.get("id") for d in loader.get("breaks", [])]
+            mods.append({"id": loader.get("id"), "name": loader.get("metadata", {}).get("name", loader.get("id")),
+                         "version": str(loader.get("version", "")), "loader": "quilt",
+                         "depends": sorted(filter(None, depends)), "breaks": sorted(filter(None, breaks))})
+        for toml_name, loader_name in (("META-INF/mods.toml", "forge"), ("META-INF/neoforge.mods.toml", "neoforge")):
+            if toml_name not in names:
+                continue
+            data = _parse_toml(zf.read(toml_name).decode("utf-8", errors="replace"))
+            for mod in data.get("mods", []):
+                version = mod.get("version", "")
+                if "${file.jarVersion}" in version:
+                    version = _manifest_version(zf) or version
+                deps = data.get("dependencies", {}).get(mod.get("modId"), [])
+                required = [d.get("modId") for d in deps if d.get("mandatory", d.get("type", "required") == "required")]
+                incompatible = [d.get("modId") for d in deps if d.get("type") == "incompatible"]
+                mods.append({"id": mod.get("modId"), "name": mod.get("displayName", mod.get("modId")), "version": version,
+                             "loader": loader_name, "depends": sorted(filter(None, required)),
+                             "breaks": sorted(filter(None, incompatible))})
+        if not mods and "mcmod.info" in names:
+            data = json.loads(zf.read("mcmod.info").decode("utf-8", errors="replace"), strict=False)
+            entries = data.get("modList", []) if isinstance(data, dict) else data
+            for mod in entries:
+                mods.append({"id": mod.get("modid"), "name": mod.get("name", mod.get("modid")), "version": str(mod.get("version", "")),
+                             "loader": "forge", "depends": sorted(set(mod.get("requiredMods", []) + mod.get("dependencies", []))),
+                             "breaks": []})
+    return [m for m in mods if m.get("id")]
+
+
+class ModIndex:
+    """Cached metadata of the jars in a mods folder.
+
+    Results are cached by path, size and mtime in launcher_cache/mod_index.json,
+    so a rescan of an unchanged folder is one scandir and a stat per jar. Paths are
+    normalized (absolute, case-folded on Windows) so any spelling of a folder
+    shares its entries.
+    """
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, "mod_index.json")
+        self.cache = read_json_file(self.path, {})
+        if not isinstance(self.cache, dict):
+            self.cache = {}
+
+    def scan(self, mods_dir):
+        """Returns one dict per mod found (a jar may contain several), each with its "file"."""
+        mods = []
+        changed = False
+        folder = os.path.normcase(os.path.abspath(mods_dir))
+        try:
+            entries = [e for e in os.scandir(mods_dir) if e.name.endswith(".jar") and e.is_file()]
+        except OSError:
+            return mods
+        seen = set()
+        for entry in entries:
+            st = entry.stat()
+            key = os.path.join(folder, os.path.normcase(entry.name))
+            seen.add(key)
+            cached = self.cache.get(key)
+            if cached is None or cached["size"] != st.st_size or cached["mtime_ns"] != st.st_mtime_ns:
+                try:
+                    found = read_mod_metadata(entry.path)
+                    error = None
+                except Exception as e:
+                    found, error = [], str(e)
+                cached = self.cache[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "mods": found, "error": error}
+                changed = True
+            for mod in cached["mods"]:
+                mods.append(dict(mod, file=entry.name))
+            if cached.get("error"):
+                mods.append({"id": None, "name": entry.name, "version": "", "loader": None, "depends": [], "breaks": [],
+                             "file": entry.name, "error": cached["error"]})
+        # Forget jars that were removed from this folder
+        for path in [p for p in self.cache if os.path.dirname(p) == folder and p not in seen]:
+            del self.cache[path]
+            changed = True
+        if changed:
+            try:
+                write_json_file(self.path, self.cache)
+            except OSError as e:
+                print(f"Warning: Could not save the mod index: {e}")
+        return mods
+
+    @staticmethod
+    def conflicts(mods):
+        """Readable descriptions of duplicate mods, missing dependencies, declared incompatibilities and mixed loaders."""
+        problems = []
+        by_id = {}
+        for mod in mods:
+            if mod.get("error"):
+                problems.append(f"{mod['file']} could not be read: {mod['error']}")
+            elif mod["id"]:
+                by_id.setdefault(mod["id"], []).append(mod)
+        for mod_id, copies in sorted(by_id.items()):
+            if len({m["file"] for m in copies}) > 1:
+                problems.append(f"Duplicate mod '{mod_id}' in: " + ", ".join(sorted({m["file"] for m in copies})))
+
+        provided = set(by_id) | BUILTIN_MOD_IDS
+        for mod in mods:
+            provided.update(mod.get("provides", []))
+        has_fabric_api = "fabric-api" in provided or "fabric" in provided
+        for mod in mods:
+            for dep in mod.get("depends", []):
+                # Fabric API's modules are nested jars that aren't indexed on their own
+                if dep in provided or (has_fabric_api and dep.startswith("fabric-")):
+                    continue
+                problems.append(f"'{mod['id']}' ({mod['file']}) requires '{dep}', which is not installed")
+            for other in mod.get("breaks", []):
+                if other in by_id:
+                    problems.append(f"'{mod['id']}' ({mod['file']}) is incompatible with '{other}'")
+
+        # Quilt loads Fabric mods; a jar shipping several metadata files works on any of them
+        families_per_file = {}
+        for mod in mods:
+            if mod.get("loader"):
+                family = "fabric" if mod["loader"] == "quilt" else mod["loader"]
+                families_per_file.setdefault(mod["file"], set()).add(family)
+        if families_per_file and not set.intersection(*families_per_file.values()):
+            loaders = sorted(set.union(*families_per_file.values()))
+            problems.append("Mods for different loaders are mixed: " + ", ".join(loaders))
+        return problems
+
+
+###############################################################################
+# SERVER STATUS
+###############################################################################
+def _read_nbt_payload(data, pos, tag):
+    """Decodes one NBT payload of the given tag type. Returns (value, new position)."""
+    if tag == 1:
+        return struct.unpack_from(">b", data, pos)[0], pos + 1
+    if tag == 2:
+        return struct.unpack_from(">h", data, pos)[0], pos + 2
+    if tag == 3:
+        return struct.unpack_from(">i", data, pos)[0], pos + 4
+    if tag == 4:
+        return struct.unpack_from(">q", data, pos)[0], pos + 8
+    if tag == 5:
+        return struct.unpack_from(">f", data, pos)[0], pos + 4
+    if tag == 6:
+        return struct.unpack_from(">d", data, pos)[0], pos + 8
+    if tag == 7:
+        length = struct.unpack_from(">i", data, pos)[0]
+        return data[pos + 4:pos + 4 + length], pos + 4 + length
+    if tag == 8:
+        length = struct.unpack_from(">H", data, pos)[0]
+        return data[pos + 2:pos + 2 + length].decode("utf-8", "replace"), pos + 2 + length
+    if tag == 9:
+        item_tag, length = struct.unpack_from(">bi", data, pos)
+        pos += 5
+        items = []
+        for _ in range(max(length, 0)):
+            item, pos = _read_nbt_payload(data, pos, item_tag)
+            items.append(item)
+        return items, pos
+    if tag == 10:
+        compound = {}
+        while True:
+            child_tag = data[pos]
+            pos += 1
+            if child_tag == 0:
+                return compound, pos
+            name, pos = _read_nbt_payload(data, pos, 8)
+            compound[name], pos = _read_nbt_payload(data, pos, child_tag)
+    if tag in (11, 12):
+        length = struct.unpack_from(">i", data, pos)[0]
+        size = 4 if tag == 11 else 8
+        values = struct.unpack_from(f">{length}{'i' if tag == 11 else 'q'}", data, pos + 4)
+        return list(values), pos + 4 + length * size
+    raise ValueError(f"Unknown NBT tag {tag}")
+
+def read_servers_dat(path):
+    """Returns the [{"name", "address"}] entries of a servers.dat file, or [] if it can't be read."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        if not data or data[0] != 10:
+            return []
+        _, pos = _read_nbt_payload(data, 1, 8)
+        root, _ = _read_nbt_payload(data, pos, 10)
+    except (OSError, ValueError, IndexError, struct.error) as e:
+        print(f"Warning: Could not read {path}: {e}")
+        return []
+    servers = []
+    for entry in root.get("servers", []):
+        if isinstance(entry, dict) and entry.get("ip"):
+            servers.append({"name": entry.get("name") or entry["ip"], "address": entry["ip"]})
+    return servers
+
+class ServerStatusMonitor:
+    """Pings many servers concurrently and keeps a rolling history per address.
+
+    The last status and up to history_size samples of (time, latency, players online,
+    max players) per server are kept in launcher_cache/server_status.json.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, history_size=120, max_concurrency=32):
+        self.path = os.path.join(cache_dir, "server_status.json")
+        self.history_size = history_size
+        self.max_concurrency = max_concurrency
+        self.lock = threading.Lock()
+        self.servers = read_json_file(self.path, {})
+        if not isinstance(self.servers, dict):
+            self.servers = {}
+
+    def last_status(self, address):
+        with self.lock:
+            return self.servers.get(address, {}).get("last")
+
+    def history(self, address):
+        with self.lock:
+            return list(self.servers.get(address, {}).get("history", []))
+
+    @staticmethod
+    async def _status(address, timeout):
+        from mcstatus import JavaServer
+        server = await JavaServer.async_lookup(address, timeout=timeout)
+        status = await server.async_status(tries=1)
+        motd = status.motd.to_plain() if hasattr(status, "motd") else str(status.description)
+        return {"online": True, "latency": round(status.latency, 1), "players": status.players.online,
+                "max_players": status.players.max, "version": status.version.name, "motd": motd.strip()}
+
+    async def _poll_one(self, semaphore, address, timeout, on_result):
+        async with semaphore:
+            try:
+                status = await asyncio.wait_for(self._status(address, timeout), timeout)
+            except asyncio.TimeoutError:
+                status = {"online": False, "error": f"No answer within {timeout:g}s"}
+            except Exception as e:
+                status = {"online": False, "error": str(e) or e.__class__.__name__}
+        status["time"] = time.time()
+        self._record(address, status)
+        if on_result:
+            on_result(address, status)
+        return address, status
+
+    async def _poll_all(self, addresses, timeout, on_result):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._poll_one(semaphore, a, timeout, on_result) for a in addresses))
+        return dict(results)
+
+    def poll(self, addresses, timeout=5.0, on_result=None, loop=None):
+        """Pings every address at once, each with its own timeout. Returns {address: status}.
+
+        on_result(address, status) is called from the polling thread as each answer arrives.
+        A caller polling repeatedly can pass its own event loop to reuse it.
+        """
+        if not MCSTATUS_AVAILABLE:
+            raise RuntimeError("mcstatus library not found. Please run: pip install mcstatus")
+        addresses = list(dict.fromkeys(a.strip() for a in addresses if a.strip()))
+        if not addresses:
+            return {}
+        if loop is None:
+            results = asyncio.run(self._poll_all(addresses, timeout, on_result))
+        else:
+            results = loop.run_until_complete(self._poll_all(addresses, timeout, on_result))
+        with self.lock:
+            try:
+                write_json_file(self.path, self.servers)
+            except OSError as e:
+                print(f"Warning: Could not save server status cache: {e}")
+        return results
+
+    def _record(self, address, status):
+        sample = [round(status["time"], 1), status.get("latency"), status.get("players"), status.get("max_players")]
+        with self.lock:
+            entry = self.servers.setdefault(address, {"history": []})
+            entry["last"] = status
+            entry["history"] = (entry.get("history", []) + [sample])[-self.history_size:]
+
+    def stats(self, address):
+        """Averages over the kept history: latency, players, load (players/max) and the share of successful pings."""
+        samples = self.history(address)
+        online = [s for s in samples if s[1] is not None]
+        if not online:
+            return {"samples": len(samples), "uptime": 0.0, "latency": None, "players": None, "load": None}
+        loads = [s[2] / s[3] for s in online if s[3]]
+        return {
+            "samples": len(samples),
+            "uptime": len(online) / len(samples),
+            "latency": sum(s[1] for s in online) / len(online),
+            "players": sum(s[2] for s in online) / len(online),
+            "load": sum(loads) / len(loads) if loads else 0.0
+        }
+
+    def least_loaded(self, addresses):
+        """The currently online address with the lowest average load, ties broken by latency, or None."""
+        candidates = []
+        for address in addresses:
+            last = self.last_status(address)
+            stats = self.stats(address)
+            if last and last.get("online") and stats["latency"] is not None:
+                candidates.append((stats["load"], stats["latency"], address))
+        return min(candidates)[2] if candidates else None
+
+
+###############################################################################
+# CONFIG STORE
+###############################################################################
+class ConfigStore(dict):
+    """The launcher config as one shared dict that saves itself atomically.
+
+    Top-level writes take the store's lock and mark it changed, so flush() writes
+    them even without a save(); callers changing nested values (an account record,
+    say) from another thread should hold `lock` while doing so and call save().
+    save() only schedules a write, so bursts of changes end up as one write done
+    off the calling thread; flush() writes immediately.
+    """
+    def __init__(self, path, defaults=None, delay=0.5):
+        super().__init__(defaults or {})
+        self.path = path
+        self.delay = delay
+        self.lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        if os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                super().update(data)
+            except Exception as e:
+                print(f"Warning: Could not load config file. Using defaults. Error: {e}")
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            super().__setitem__(key, value)
+            self._dirty = True
+
+    def __delitem__(self, key):
+        with self.lock:
+            super().__delitem__(key)
+            self._dirty = True
+
+    def setdefault(self, key, default=None):
+        with self.lock:
+            if key not in self:
+                super().__setitem__(key, default)
+                self._dirty = True
+            return super().__getitem__(key)
+
+    def update(self, *args, **kwargs):
+        with self.lock:
+            super().update(*args, **kwargs)
+            self._dirty = True
+
+    def pop(self, key, *default):
+        with self.lock:
+            if key in self:
+                self._dirty = True
+            return super().pop(key, *default)
+
+    def popitem(self):
+        with self.lock:
+            item = super().popitem()
+            self._dirty = True
+            return item
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+            self._dirty = True
+
+    def save(self):
+        """Marks the config as changed and schedules a write after `delay` seconds."""
+        with self.lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Writes pending changes now through a temp file and an atomic rename."""
+        with self._write_lock:
+            with self.lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                text = json.dumps(self, indent=4)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                with self.lock:
+                    self._dirty = True
+                print(f"Error: Failed to save config: {e}")
+
+
+###############################################################################
+# STARTUP PROFILING
+###############################################################################
+class StartupProfiler:
+    """Records named checkpoints from process start and reports the time spent between them."""
+    def __init__(self, start=None, enabled=True):
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+
+    def mark(self, label):
+        if self.enabled:
+            self.marks.append((label, time.perf_counter()))
+
+    def report(self):
+        """Returns the checkpoints as a text table: time since the previous checkpoint and since start."""
+        lines = [f"{'stage':<40}{'step ms':>10}{'total ms':>10}"]
+        previous = self.start
+        for label, at in self.marks:
+            lines.append(f"{label:<40}{(at - previous) * 1000:>10.1f}{(at - self.start) * 1000:>10.1f}")
+            previous = at
+        slowest = sorted(((at - prev, label) for (label, at), prev in
+                          zip(self.marks, [self.start] + [at for _, at in self.marks])), reverse=True)[:3]
+        if slowest:
+            lines.append("slowest: " + ", ".join(f"{label} ({step * 1000:.0f} ms)" for step, label in slowest))
+        return "\n".join(lines)
+
+
+###############################################################################
+# MICROSOFT TOKEN CACHE
+###############################################################################
+MSA_TOKEN_LIFETIME = 24 * 60 * 60 # Minecraft access tokens last a day when no expiry can be read
+MSA_LAUNCH_MARGIN = 5 * 60 # A token must stay valid at least this long to be used for a launch
+MSA_REFRESH_AHEAD = 60 * 60 # The background refresher renews tokens this long before they expire
+
+
+def jwt_expiry(token):
+    """The "exp" claim (epoch seconds) of a JWT, or None if token isn't one."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def apply_msa_login(account, auth_data):
+    """Stores a login/refresh response on an account record, including when its token expires."""
+    now = time.time()
+    expires_at = jwt_expiry(auth_data["access_token"])
+    if expires_at is None:
+        expires_at = now + float(auth_data.get("expires_in") or MSA_TOKEN_LIFETIME)
+    account.update({
+        "token": auth_data["access_token"],
+        "refresh_token": auth_data.get("refresh_token") or account.get("refresh_token", ""),
+        "token_expires_at": expires_at,
+        "token_refreshed_at": now
+    })
+
+
+def msa_token_valid(account, margin=MSA_LAUNCH_MARGIN):
+    """Whether the stored token can be used for at least margin more seconds."""
+    return bool(account.get("token")) and account.get("token_expires_at", 0) - margin > time.time()
+
+
+class MsaTokenRefresher:
+    """Keeps the MSA accounts in a ConfigStore supplied with valid tokens.
+
+    A background thread renews every token refresh_ahead seconds before it expires,
+    so launches find a valid token and skip the Microsoft round trips. ensure_valid()
+    is the synchronous fallback for a token that is already (nearly) expired. The
+    expiry check and the refresh happen under a per-account lock, so a launch and
+    the background thread never refresh the same account twice.
+    refresh_login(refresh_token) must return a dict with "access_token" and "refresh_token".
+    """
+    def __init__(self, config, refresh_login=None, refresh_ahead=MSA_REFRESH_AHEAD, check_interval=15 * 60, on_error=None):
+        self.config = config
+        self.refresh_login = refresh_login or (lambda token: minecraft_launcher_lib.microsoft_account.refresh_login(token))
+        self.refresh_ahead = refresh_ahead
+        self.check_interval = check_interval
+        self.on_error = on_error or (lambda account, error: print(f"Warning: Could not refresh the login of {account.get('name')}: {error}"))
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+
+    def _lock_for(self, account):
+        with self._locks_guard:
+            return self._locks.setdefault(account["uuid"], threading.Lock())
+
+    def refresh(self, account, margin=None):
+        """Renews one account's token and saves the config. Raises on failure.
+
+        With a margin, nothing happens if the token is still valid for margin more
+        seconds (it may have been renewed while we waited for the lock). Returns True
+        if it refreshed.
+        """
+        with self._lock_for(account):
+            if margin is not None and msa_token_valid(account, margin):
+                return False
+            auth_data = self.refresh_login(account["refresh_token"])
+            with self.config.lock:
+                apply_msa_login(account, auth_data)
+        self.config.save()
+        return True
+
+    def ensure_valid(self, account, margin=MSA_LAUNCH_MARGIN):
+        """Refreshes the account's token unless it is valid for margin more seconds. Returns True if it refreshed."""
+        return self.refresh(account, margin)
+
+    def _msa_accounts(self):
+        with self.config.lock:
+            return [acc for acc in self.config.get("accounts", []) if acc.get("type") == "msa" and acc.get("refresh_token")]
+
+    def refresh_due(self):
+        """Renews every token that expires within refresh_ahead. Returns seconds until the next one is due."""
+        next_due = self.check_interval
+        for account in self._msa_accounts():
+            if "token_expires_at" not in account and jwt_expiry(account.get("token", "")):
+                # Accounts saved before expiries were tracked
+                with self.config.lock:
+                    account["token_expires_at"] = jwt_expiry(account["token"])
+                self.config.save()
+            due_in = account.get("token_expires_at", 0) - self.refresh_ahead - time.time()
+            if due_in <= 0:
+                try:
+                    self.refresh(account, self.refresh_ahead)
+                    due_in = account["token_expires_at"] - self.refresh_ahead - time.time()
+                except Exception as e:
+                    self.on_error(account, e)
+                    continue # Retried at the next check
+            next_due = min(next_due, max(due_in, 1))
+        return next_due
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="msa-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop = True
+        self._wake.set()
+
+    def wake(self):
+        """Re-checks now, e.g. after an account was added."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop:
+            delay = self.refresh_due()
+            self._wake.wait(delay)
+            self._wake.clear()
+
+
+###############################################################################
+# LAUNCH PIPELINE
+###############################################################################
+CONFIG_FILE = "launcher_config.json"
+
+
+def default_config():
+    """The launcher's config defaults; values saved in CONFIG_FILE override them."""
+    return {
+        "minecraft_directory": default_minecraft_directory(),
+        "ram": 4096,  # Increased default RAM
+        "ram_auto": True, # Size the heap from free memory, mod count and version instead of "ram"
+        "gc_preset": "g1", # One of GC_PRESETS
+        "class_data_sharing": True, # Record/reuse an AppCDS archive per classpath (Java 13+)
+        "curseforge_api_key": "", # Needed to import CurseForge modpacks
+        "mod_loader": "None",
+        "extra_jvm_args": "",
+        "java_path": "", # New: For custom Java executable
+        "fabric_loader_version": "", # Empty means the latest loader at first install
+        "console_overflow_policy": "sample", # What the console shows of game output beyond the rate below: keep/sample/drop (the log keeps everything)
+        "console_max_lines_per_second": 5000,
+        "telemetry_interval": 1.0, # Seconds between /proc samples of the running game (Linux)
+        "max_instances": 16, # Most game instances the Instances window runs at once
+        "watched_servers": [], # Extra servers for the status dashboard: [{"name": "...", "address": "..."}]
+        "accounts": [], # New structure: [{"uuid": "...", "name": "...", "type": "offline/msa", ...}]
+        "active_account_uuid": "" # New: To track the currently selected account
+    }
+
+
+def get_profile_path(mc_dir, version_id):
+    """Returns the path for a specific profile/instance."""
+    return os.path.join(mc_dir, "profiles", version_id)
+
+
+class LaunchError(Exception):
+    """A launch step failed; the message is meant for the user."""
+
+
+def seed_profile_mods(source_profile, profile):
+    """Links the jars of source_profile/mods that profile/mods doesn't have yet. Never removes anything."""
+    source_mods = os.path.join(source_profile, "mods")
+    target_mods = os.path.join(profile, "mods")
+    if not os.path.isdir(source_mods):
+        return 0
+    os.makedirs(target_mods, exist_ok=True)
+    linked = 0
+    for name in os.listdir(source_mods):
+        src = os.path.join(source_mods, name)
+        dst = os.path.join(target_mods, name)
+        if os.path.isfile(src) and not os.path.exists(dst):
+            link_or_copy(src, dst)
+            linked += 1
+    return linked
+
+
+class LaunchPipeline:
+    """Everything between pressing Play and the game exiting, without any UI.
+
+    on_progress(done, total, text) and on_output(text) are called from whichever
+    thread runs the pipeline. prepare() resolves the account, installs the mod
+    loader and builds the command; run() starts the game and supervises it.
+    prepare(dry_run=True) builds the same command without changing anything on disk.
+    Pipelines share their caches, and prepare() runs one at a time process-wide.
+    """
+    # Loader installs and the on-disk caches are shared by every launch; games still run side by side
+    prepare_lock = threading.RLock()
+    _shared_caches = None
+
+    def __init__(self, config, on_progress=None, on_output=None, token_refresher=None):
+        self.config = config
+        self.on_progress = on_progress or (lambda done, total, text: None)
+        self.on_output = on_output or (lambda text: None)
+        self.token_refresher = token_refresher or MsaTokenRefresher(config)
+        self.process = None
+        with LaunchPipeline.prepare_lock:
+            if LaunchPipeline._shared_caches is None:
+                LaunchPipeline._shared_caches = (ForgeCatalogue(), LoaderInstallLedger(), LaunchPlanCache(),
+                                                 JavaRuntimeIndex(), CdsArchiveManager())
+        (self.forge_catalogue, self.loader_ledger, self.launch_plans,
+         self.java_index, self.cds_archives) = LaunchPipeline._shared_caches
+
+    def resolve_account(self, refresh=True):
+        """Returns the active account, refreshing an MSA login only if its token is (nearly) expired."""
+        active_uuid = self.config.get("active_account_uuid")
+        if not active_uuid:
+            raise LaunchError("No account selected. Please select an account in the Account Manager.")
+        account = next((acc for acc in self.config["accounts"] if acc["uuid"] == active_uuid), None)
+        if not account:
+            raise LaunchError("Active account not found. Please re-select it in the Account Manager.")
+
+        if account["type"] == "msa" and not msa_token_valid(account):
+            if not refresh:
+                self.on_output("[Launcher] The Microsoft login has expired and would be refreshed before launching.\n")
+                return account
+            try:
+                self.on_progress(0, 0, "Refreshing Microsoft login...")
+                self.token_refresher.ensure_valid(account)
+            except Exception as e:
+                raise LaunchError(f"Failed to refresh Microsoft login: {e}\nPlease try adding the account again.")
+        return account
+
+    def prepare(self, version_id, profile=None, dry_run=False):
+        """Resolves everything a launch needs. Returns a plan dict for run().
+
+        profile names the profile folder to use as the game directory; it defaults to version_id.
+        A dry run skips the loader install, the MSA refresh, folder creation and the launch
+        plan and CDS caches; what they would have done is reported through on_output.
+        """
+        with LaunchPipeline.prepare_lock:
+            return self._prepare(version_id, profile, dry_run)
+
+    def _prepare(self, version_id, profile, dry_run):
+        account = self.resolve_account(refresh=not dry_run)
+
+        # Potentially install Fabric or Forge
+        mod_loader = self.config.get("mod_loader", "None")
+        mc_dir = self.config.get("minecraft_directory")
+        callback = {
+            "setStatus": lambda text: self.on_progress(0, 0, text),
+            "setProgress": lambda val: self.on_progress(val, 100, f"Installing {mod_loader}..."),
+            "setMax": lambda val: None
+        }
+        try:
+            launch_version_id = self.install_mod_loader(version_id, mod_loader, mc_dir, callback, dry_run)
+        except Exception as e:
+            raise LaunchError(f"Failed to install {mod_loader}: {str(e)}")
+
+        # Build Launch Options
+        profile_dir = get_profile_path(mc_dir, profile or version_id)
+        java_path = self.config.get("java_path") or self.find_java_executable(launch_version_id, mc_dir)
+
+        # Ensure Java executable exists
+        if not os.path.isfile(java_path):
+            raise LaunchError(f"Java executable not found at: {java_path}\nPlease set a valid Java path in Settings.")
+
+        options = {
+            "username": account["name"],
+            "uuid": account["uuid"],
+            "token": account.get("token", ""), # Empty for offline
+            "jvmArguments": self.build_jvm_arguments(version_id, profile_dir, java_path),
+            "gameDirectory": profile_dir,
+            "executablePath": java_path
+        }
+
+        extra_jvm_args = self.config.get("extra_jvm_args", "").strip()
+        if extra_jvm_args:
+            options["jvmArguments"].extend(extra_jvm_args.split())
+
+        server_address = self.config.get("server", "").strip()
+        if server_address:
+            try:
+                host, port = server_address.split(":")
+                options["server"] = host
+                options["port"] = str(int(port))
+            except ValueError:
+                options["server"] = server_address
+                options["port"] = "25565"
+
+        # Ensure profile directory and its mods folder exist
+        if not dry_run:
+            os.makedirs(os.path.join(profile_dir, "mods"), exist_ok=True)
+
+        try:
+            # Repeat launches reuse the resolved argument vector; only account fields are re-substituted
+            command = self.launch_plans.get_command(launch_version_id, mc_dir, options,
+                                                    minecraft_launcher_lib.command.get_minecraft_command, save=not dry_run)
+        except minecraft_launcher_lib.exceptions.VersionNotFound:
+            raise LaunchError(f"Version '{launch_version_id}' not found. It might be corrupted or a loader failed to install. Try reinstalling it.")
+        cds_archive = cds_recording = None
+        if self.config.get("class_data_sharing", True):
+            cds_args, cds_archive, cds_recording = self.cds_archives.archive_args(command, self.java_index.major_of(java_path), dry_run)
+            command[1:1] = cds_args
+
+        return {
+            "version_id": version_id,
+            "launch_version_id": launch_version_id,
+            "mod_loader": mod_loader,
+            "account": account["name"],
+            "profile_dir": profile_dir,
+            "java_path": java_path,
+            "token": options["token"],
+            "cds_archive": cds_archive,
+            "cds_recording": cds_recording,
+            "dry_run": dry_run,
+            "command": command
+        }
+
+    def run(self, plan, limits=None, label="game", on_started=None):
+        """Starts the game from a prepare() plan and streams its output until it exits.
+
+        limits is an optional InstanceLimits; on_started(pid) is called once the process exists.
+        Returns (exit code, crash analysis summary or "").
+        """
+        if plan.get("dry_run"):
+            raise LaunchError("A dry-run plan can't be launched; prepare it again without dry_run.")
+        # HotSpot writes hs_err_pid*.log to the working directory by default; send it where the crash analyzer looks
+        error_file = os.path.join(os.path.abspath(plan["profile_dir"]), "hs_err_pid%p.log")
+        command = plan["command"][:1] + [f"-XX:ErrorFile={error_file}"] + plan["command"][1:]
+        popen_kwargs, after_spawn, cleanup, warnings = {}, None, None, []
+        if limits:
+            command, popen_kwargs, after_spawn, cleanup, warnings = limits.apply(command, label)
+        # The console is saved to disk, so keep the access token out of it
+        print(f"[Launcher] Launching with command: {' '.join(masked_command(command, plan['token']))}")
+        self.on_output(f"Launching Minecraft {plan['launch_version_id']}...\n")
+
+        launch_started = time.time()
+        cds_archive = plan.get("cds_archive")
+        if cds_archive:
+            self.cds_archives.acquire(cds_archive)
+        try:
+            self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0, **popen_kwargs)
+            if after_spawn:
+                after_spawn(self.process.pid)
+            for warning in warnings:
+                self.on_output(f"[Launcher] {warning}\n")
+            if on_started:
+                on_started(self.process.pid)
+            return self._supervise(plan, launch_started)
+        finally:
+            if cds_archive:
+                self.cds_archives.finish(cds_archive, plan.get("cds_recording"))
+            if cleanup:
+                cleanup()
+
+    def _supervise(self, plan, launch_started):
+        """Pumps the running game's output until it exits. Returns (exit code, crash summary)."""
+        # Stream every line in batches; the console applies the overflow policy when it renders
+        analyzer = CrashAnalyzer(on_finding=self.on_crash_finding)
+        pump = OutputPump(self.process.stdout, lambda lines: self.on_output("".join(lines)), tap=analyzer.feed)
+        pump.run()
+
+        # Wait for process to finish
+        self.process.stdout.close()
+        return_code = self.process.wait()
+
+        report = ""
+        if return_code != 0:
+            self.on_output(f"\nMinecraft exited with error code: {return_code}")
+            analyzer.scan_crash_reports(plan["profile_dir"], launch_started)
+            report = analyzer.summary()
+        else:
+            self.on_output("\nMinecraft exited successfully")
+        return return_code, report
+
+    def on_crash_finding(self, finding):
+        self.on_output(f"[Crash Analyzer] {finding['title']}: {finding['hint']}\n")
+
+    def build_jvm_arguments(self, version_id, profile_dir, java_path):
+        """Heap size and garbage collector flags for this launch."""
+        if self.config.get("ram_auto", True):
+            ram_mb = recommend_heap_mb(version_id, count_mods(profile_dir))
+            print(f"[Launcher] Automatic RAM: {ram_mb} MB")
+        else:
+            ram_mb = self.config.get("ram", 4096)
+        java_major = self.java_index.major_of(java_path)
+        return [f"-Xmx{ram_mb}M", f"-Xms{ram_mb}M"] + gc_preset_args(self.config.get("gc_preset", "g1"), ram_mb, java_major,
+                                                                     self.java_index.unsupported_gcs(java_path))
+
+    def install_mod_loader(self, version_id, mod_loader, mc_dir, callback, dry_run=False):
+        """Installs Fabric or Forge unless the install ledger shows it is already on disk.
+
+        Returns the version ID to launch. A dry run only reports a missing install and
+        returns version_id.
+        """
+        if mod_loader == "Fabric":
+            # Unpinned Fabric installs are recorded as "latest" so we don't ask the network every launch
+            loader_version = self.config.get("fabric_loader_version") or "latest"
+        elif mod_loader == "Forge":
+            loader_version = self.forge_catalogue.latest_for(version_id)
+            if not loader_version:
+                raise Exception(f"No Forge version found for Minecraft {version_id}")
+        else:
+            return version_id
+
+        installed_id = self.loader_ledger.lookup(mc_dir, version_id, mod_loader, loader_version)
+        if installed_id:
+            return installed_id
+        if dry_run:
+            self.on_output(f"[Launcher] {mod_loader} {loader_version} would be installed first; "
+                           f"showing the command for plain {version_id}.\n")
+            return version_id
+
+        self.on_progress(0, 0, f"Installing {mod_loader}...")
+        # Pull anything the shared store already has so the loader installer
+        # only hits the network for files no Minecraft directory has seen yet.
+        store = SharedStore()
+        link_version_from_store(store, version_id, mc_dir)
+        if mod_loader == "Fabric":
+            fabric_version = loader_version
+            if fabric_version == "latest":
+                fabric_version = minecraft_launcher_lib.fabric.get_latest_loader_version()
+            minecraft_launcher_lib.fabric.install_fabric(version_id, mc_dir, loader_version=fabric_version, callback=callback)
+            installed_id = f"fabric-loader-{fabric_version}-{version_id}"
+        else:
+            minecraft_launcher_lib.forge.install_forge_version(loader_version, mc_dir, callback=callback)
+            installed_id = forge_installed_version_id(mc_dir, loader_version)
+        adopt_version_into_store(store, installed_id, mc_dir)
+
+        try:
+            self.loader_ledger.record(mc_dir, version_id, mod_loader, loader_version, installed_id)
+        except OSError as e:
+            print(f"Warning: Could not record the {mod_loader} install: {e}")
+        return installed_id
+
+    def find_java_executable(self, version_id, mc_dir):
+        """Finds a Java executable matching the version's javaVersion.majorVersion"""
+        major = required_java_major(version_id, mc_dir)
+        self.java_index.refresh(mc_dir) # Only new or modified JVMs get probed
+        java_path = self.java_index.find(major)
+        if java_path:
+            found_major = self.java_index.major_of(java_path)
+            if found_major != major:
+                self.on_output(f"[Launcher] {version_id} requires Java {major}, which isn't installed; "
+                               f"using Java {found_major} ({java_path}) instead.\n")
+            return java_path
+
+        # Last resort: whatever is on PATH
+        print(f"[Launcher] No Java {major} runtime found, falling back to the Java on PATH.")
+        return shutil.which("java") or "java"
+
+
+###############################################################################
+# INSTANCE SUPERVISOR
+###############################################################################
+def parse_cpu_list(text):
+    """Parses a CPU list such as "0-3,6" into a sorted list of CPU numbers. Raises ValueError."""
+    cpus = set()
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(n) for n in part.split("-", 1))
+            cpus.update(range(first, last + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def available_cpus():
+    """The CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def split_cpus(cpus, count):
+    """Splits cpus into count contiguous groups of (nearly) equal size; groups repeat if there are too few CPUs."""
+    if not cpus or count <= 0:
+        return [None] * max(count, 0)
+    if count > len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(count)]
+    size, extra = divmod(len(cpus), count)
+    groups, start = [], 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(cpus[start:end])
+        start = end
+    return groups
+
+
+def _cgroup2_dir():
+    """This process's cgroup v2 directory, or None on cgroup v1 only / non-Linux systems."""
+    try:
+        with open("/proc/self/cgroup", "r") as f:
+            own = next((line.strip()[3:] for line in f if line.startswith("0::")), None)
+        with open("/proc/self/mounts", "r") as f:
+            mount = next((line.split()[1] for line in f if line.split()[2:3] == ["cgroup2"]), None)
+    except OSError:
+        return None
+    if own is None or mount is None:
+        return None
+    return os.path.join(mount, own.lstrip("/"))
+
+
+class InstanceLimits:
+    """CPU affinity, nice level and memory cap for one game process.
+
+    Affinity and niceness are applied by wrapping the command in taskset/nice, so
+    every JVM thread inherits them; without those tools they are set on the child's
+    pid right after it starts (Linux/Unix; on Windows nice > 0 maps to a lower
+    priority class). The memory cap uses a cgroup v2 next to the launcher's own when that is
+    writable, else a transient systemd user scope; otherwise it is not enforced.
+    """
+    def __init__(self, cpus=None, nice=0, memory_mb=None):
+        self.cpus = list(cpus) if cpus else None
+        self.nice = nice
+        self.memory_mb = memory_mb or None
+
+    def describe(self):
+        parts = []
+        if self.cpus:
+            parts.append("CPUs " + ",".join(str(c) for c in self.cpus))
+        if self.nice:
+            parts.append(f"nice {self.nice}")
+        if self.memory_mb:
+            parts.append(f"max {self.memory_mb} MB")
+        return ", ".join(parts) or "none"
+
+    def _create_cgroup(self, label):
+        own = _cgroup2_dir()
+        if not own:
+            return None
+        # Processes can't live in a cgroup whose controllers are delegated, so use a sibling
+        parent = os.path.dirname(own.rstrip("/"))
+        try:
+            with open(os.path.join(parent, "cgroup.subtree_control"), "r") as f:
+                if "memory" not in f.read().split():
+                    return None
+            path = os.path.join(parent, f"clauncher-{re.sub(r'[^A-Za-z0-9_.-]', '_', label)}-{os.getpid()}")
+            os.makedirs(path, exist_ok=True)
+            with open(os.path.join(path, "memory.max"), "w") as f:
+                f.write(str(self.memory_mb * 1024 * 1024))
+            return path
+        except OSError:
+            return None
+
+    @staticmethod
+    def _systemd_scope_available():
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "")
+        return bool(shutil.which("systemd-run")) and os.path.exists(os.path.join(runtime_dir, "systemd", "private"))
+
+    def apply(self, command, label):
+        """Returns (command, Popen keyword arguments, after_spawn(pid), cleanup(), warnings)."""
+        kwargs = {}
+        warnings = []
+        cgroup_path = None
+
+        set_nice = set_cpus = False
+
+        if os.name == "posix":
+            # No preexec_fn: running Python between fork and exec can deadlock a threaded (Qt) process
+            prefix = []
+            if self.nice:
+                if shutil.which("nice"):
+                    prefix += ["nice", "-n", str(self.nice)]
+                else:
+                    set_nice = True
+            if self.cpus:
+                if shutil.which("taskset"):
+                    prefix += ["taskset", "-c", ",".join(str(c) for c in self.cpus)]
+                elif hasattr(os, "sched_setaffinity"):
+                    set_cpus = True
+                else:
+                    warnings.append("CPU affinity is not supported on this system")
+            command = prefix + command
+        elif sys.platform.startswith("win"):
+            if self.nice:
+                kwargs["creationflags"] = subprocess.IDLE_PRIORITY_CLASS if self.nice >= 15 else subprocess.BELOW_NORMAL_PRIORITY_CLASS
+            if self.cpus:
+                warnings.append("CPU affinity is not supported on Windows")
+
+        if self.memory_mb:
+            cgroup_path = self._create_cgroup(label)
+            if not cgroup_path:
+                if self._systemd_scope_available():
+                    command = ["systemd-run", "--user", "--scope", "--quiet", "-p", f"MemoryMax={self.memory_mb}M", "--"] + command
+                else:
+                    warnings.append(f"The {self.memory_mb} MB memory cap can't be enforced here (no writable cgroup v2 or systemd user session)")
+
+        def after_spawn(pid):
+            try:
+                if set_nice:
+                    os.setpriority(os.PRIO_PROCESS, pid, self.nice)
+                if set_cpus:
+                    os.sched_setaffinity(pid, self.cpus)
+            except OSError as e:
+                warnings.append(f"Could not apply the CPU/priority limits: {e}")
+            if cgroup_path:
+                try:
+                    with open(os.path.join(cgroup_path, "cgroup.procs"), "w") as f:
+                        f.write(str(pid))
+                except OSError as e:
+                    warnings.append(f"Could not apply the memory cap: {e}")
+
+        def cleanup():
+            if cgroup_path:
+                try:
+                    os.rmdir(cgroup_path)
+                except OSError:
+                    pass
+
+        return command, kwargs, after_spawn, cleanup, warnings
+
+
+class GameInstance:
+    """One supervised game process and its state."""
+    FINISHED_STATES = ("exited", "crashed", "failed")
+
+    def __init__(self, name, version_id, profile, limits):
+        self.name = name
+        self.version_id = version_id
+        self.profile = profile
+        self.limits = limits
+        self.state = "starting"
+        self.pid = None
+        self.return_code = None
+        self.crash_report = ""
+        self.pipeline = None
+        self.thread = None
+
+    @property
+    def active(self):
+        # True from registration on, so a launch that hasn't started its thread yet still counts
+        return self.state not in GameInstance.FINISHED_STATES
+
+
+class InstanceSupervisor:
+    """Launches and watches several game instances at once, each with its own output stream.
+
+    on_output(name, text) and on_state(name, state, detail) are called from the
+    instances' threads. States: "preparing", "running", "exited", "crashed", "failed".
+    """
+    def __init__(self, config, on_output=None, on_state=None, token_refresher=None, max_instances=None):
+        self.config = config
+        self.max_instances = max_instances or config.get("max_instances", 16)
+        self.token_refresher = token_refresher or MsaTokenRefresher(config)
+        self.on_output = on_output or (lambda name, text: None)
+        self.on_state = on_state or (lambda name, state, detail: None)
+        self.instances = {}
+        self.lock = threading.Lock()
+
+    def launch(self, name, version_id, profile=None, limits=None):
+        """Starts an instance in the background.
+
+        Raises ValueError if name is already running or max_instances are. Both checks and
+        the registration happen under one lock, so concurrent launches can't overshoot.
+        """
+        with self.lock:
+            existing = self.instances.get(name)
+            if existing and existing.active:
+                raise ValueError(f"Instance '{name}' is already running")
+            if sum(1 for i in self.instances.values() if i.active) >= self.max_instances:
+                raise ValueError(f"Already running {self.max_instances} instances, the most allowed")
+            instance = GameInstance(name, version_id, profile or version_id, limits or InstanceLimits())
+            self.instances[name] = instance
+        instance.pipeline = LaunchPipeline(
+            self.config,
+            on_progress=lambda done, total, text: self.on_state(name, "preparing", text),
+            on_output=lambda text: self.on_output(name, text),
+            token_refresher=self.token_refresher)
+        instance.thread = threading.Thread(target=self._run, args=(instance,), name=f"instance-{name}", daemon=True)
+        instance.thread.start()
+        return instance
+
+    def _set_state(self, instance, state, detail=""):
+        instance.state = state
+        self.on_state(instance.name, state, detail)
+
+    def _run(self, instance):
+        self._set_state(instance, "preparing")
+        try:
+            if instance.profile != instance.version_id:
+                mc_dir = self.config.get("minecraft_directory")
+                seed_profile_mods(get_profile_path(mc_dir, instance.version_id), get_profile_path(mc_dir, instance.profile))
+            plan = instance.pipeline.prepare(instance.version_id, instance.profile)
+            instance.return_code, instance.crash_report = instance.pipeline.run(
+                plan, limits=instance.limits, label=instance.name,
+                on_started=lambda pid: self._started(instance, pid))
+            if instance.return_code == 0:
+                self._set_state(instance, "exited", "Exited normally")
+            else:
+                self._set_state(instance, "crashed", instance.crash_report or f"Exit code {instance.return_code}")
+        except Exception as e:
+            self._set_state(instance, "failed", str(e))
+
+    def _started(self, instance, pid):
+        instance.pid = pid
+        self._set_state(instance, "running", f"PID {pid}, limits: {instance.limits.describe()}")
+
+    def stop(self, name):
+        """Asks an instance's game to exit (SIGTERM / TerminateProcess)."""
+        instance = self.instances.get(name)
+        process = instance.pipeline.process if instance and instance.pipeline else None
+        if process and process.poll() is None:
+            process.terminate()
+
+    def stop_all(self):
+        for name in list(self.instances):
+            self.stop(name)
+
+    def running(self):
+        with self.lock:
+            return [i for i in self.instances.values() if i.active]
+
+
+###############################################################################
+# PROCESS TELEMETRY
+###############################################################################
+TELEMETRY_COLUMNS = ("time", "cpu_percent", "rss_mb", "swap_mb", "threads", "major_faults_per_s",
+                     "read_mb_per_s", "write_mb_per_s", "system_available_mb")
+
+
+class ProcessSampler:
+    """Samples a running process from /proc (Linux) on a background thread.
+
+    Each sample holds CPU use (100 = one full core), RSS, swap, thread count, major
+    page faults and disk I/O rates of the process, plus the system's available memory.
+    Samples are kept column by column, max_samples per column, and can be exported
+    with export(). The /proc files stay open and are re-read in place each interval.
+    """
+    def __init__(self, pid, interval=1.0, on_sample=None, max_samples=3600):
+        self.pid = pid
+        self.interval = interval
+        self.on_sample = on_sample
+        self.columns = {name: collections.deque(maxlen=max_samples) for name in TELEMETRY_COLUMNS}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self._stop = threading.Event()
+        self._thread = None
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    @staticmethod
+    def supported():
+        return os.path.isfile("/proc/self/stat")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"sampler-{self.pid}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        fds = {}
+        try:
+            for name in ("stat", "status", "io"):
+                try:
+                    fds[name] = os.open(f"/proc/{self.pid}/{name}", os.O_RDONLY)
+                except OSError:
+                    if name == "stat":
+                        return
+            try:
+                fds["meminfo"] = os.open("/proc/meminfo", os.O_RDONLY)
+            except OSError:
+                pass
+            previous = None
+            while not self._stop.is_set():
+                try:
+                    raw = self._read(fds)
+                except (OSError, ValueError, IndexError):
+                    return # The process is gone
+                if previous:
+                    sample = self._sample(previous, raw)
+                    with self.lock:
+                        for name, value in zip(TELEMETRY_COLUMNS, sample):
+                            self.columns[name].append(value)
+                    if self.on_sample:
+                        self.on_sample(dict(zip(TELEMETRY_COLUMNS, sample)))
+                previous = raw
+                self._stop.wait(self.interval)
+        finally:
+            for fd in fds.values():
+                os.close(fd)
+
+    def _read(self, fds):
+        now = time.time()
+        stat = os.pread(fds["stat"], 4096, 0).decode()
+        if not stat:
+            raise ValueError("empty stat")
+        fields = stat[stat.rindex(")") + 2:].split()
+        raw = {
+            "time": now,
+            "cpu_ticks": int(fields[11]) + int(fields[12]),
+            "major_faults": int(fields[9]),
+            "threads": int(fields[17]),
+            "rss": int(fields[21]) * self._page_size,
+            "swap": 0, "read": 0, "write": 0, "available": 0
+        }
+        if "status" in fds:
+            for line in os.pread(fds["status"], 8192, 0).decode().splitlines():
+                if line.startswith("VmSwap:"):
+                    raw["swap"] = int(line.split()[1]) * 1024
+        if "io" in fds:
+            for line in os.pread(fds["io"], 4096, 0).decode().splitlines():
+                key, _, value = line.partition(":")
+                if key == "read_bytes":
+                    raw["read"] = int(value)
+                elif key == "write_bytes":
+                    raw["write"] = int(value)
+        if "meminfo" in fds:
+            for line in os.pread(fds["meminfo"], 8192, 0).decode().splitlines():
+                if line.startswith("MemAvailable:"):
+                    raw["available"] = int(line.split()[1]) * 1024
+                    break
+        return raw
+
+    def _sample(self, previous, raw):
+        elapsed = max(raw["time"] - previous["time"], 1e-6)
+        mb = 1024 * 1024
+        return (
+            round(raw["time"] - self.started, 2),
+            round((raw["cpu_ticks"] - previous["cpu_ticks"]) / self._clock_ticks / elapsed * 100, 1),
+            round(raw["rss"] / mb, 1),
+            round(raw["swap"] / mb, 1),
+            raw["threads"],
+            round((raw["major_faults"] - previous["major_faults"]) / elapsed, 1),
+            round((raw["read"] - previous["read"]) / mb / elapsed, 2),
+            round((raw["write"] - previous["write"]) / mb / elapsed, 2),
+            round(raw["available"] / mb)
+        )
+
+    def series(self, name):
+        with self.lock:
+            return list(self.columns[name])
+
+    def export(self, path):
+        """Writes the samples column by column: gzip-compressed JSON, or CSV rows if path ends in .csv."""
+        with self.lock:
+            columns = {name: list(values) for name, values in self.columns.items()}
+        if path.endswith(".csv"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(",".join(TELEMETRY_COLUMNS) + "\n")
+                for row in zip(*(columns[name] for name in TELEMETRY_COLUMNS)):
+                    f.write(",".join(str(v) for v in row) + "\n")
+            return
+        data = {"pid": self.pid, "started": self.started, "interval": self.interval, "columns": columns}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
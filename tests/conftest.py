@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The launcher modules live at the repository root, next to this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _RouteHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive; no Nagle so small responses aren't held back
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append((self.path, dict(self.headers)))
+        route = self.server.routes.get(self.path)
+        if route is None:
+            status, headers, body = 404, {}, b"not found"
+        else:
+            status, headers, body = route(self) if callable(route) else route
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """A local HTTP/1.1 server. Fill server.routes with path -> (status, headers, body)
+    or path -> callable(handler) returning that tuple; server.requests and
+    server.connections record what clients did."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RouteHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.routes = {}
+    server.requests = []
+    server.connections = 0
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,26 @@
+import json
+
+import launcher_bench
+from launcher_bench import compare
+
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = {"stages": {"scan": {"median_ms": 10.0}, "tiny": {"median_ms": 0.1}, "gone": {"median_ms": 5.0}}}
+    results = {"scan": {"median_ms": 14.0}, "tiny": {"median_ms": 0.5}, "new": {"median_ms": 3.0},
+               "skipped": {"skipped": "needs minecraft_launcher_lib"}}
+    regressions = compare(results, baseline, tolerance=0.25)
+    assert regressions == [{"stage": "scan", "baseline_ms": 10.0, "median_ms": 14.0, "change": 0.4}]
+    assert compare(results, baseline, tolerance=0.5) == []
+
+
+def test_small_run_writes_a_report_and_compares_against_it(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    args = ["--versions", "3", "--libraries", "5", "--assets", "20", "--mods", "3", "--pack-mods", "2",
+            "--console-lines", "500", "--repeat", "1"]
+    assert launcher_bench.main(args + ["--output", "first.json"]) == 0
+    report = json.loads((tmp_path / "first.json").read_text())
+    assert report["parameters"]["versions"] == 3
+    assert report["stages"]["console_append"]["items"] == 500
+    assert launcher_bench.main(args + ["--output", "second.json", "--baseline", "first.json", "--tolerance", "1000"]) == 0
+    assert json.loads((tmp_path / "second.json").read_text())["regressions"] == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["first.json", "second.json"]
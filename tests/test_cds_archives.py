@@ -0,0 +1,78 @@
+import os
+import time
+
+from launcher_core import CdsArchiveManager
+
+
+def command(classpath="a.jar:b.jar", gc="-XX:+UseG1GC"):
+    return ["/usr/bin/java", "-Xmx2G", gc, "-cp", classpath, "net.minecraft.client.main.Main"]
+
+
+def test_key_changes_with_the_classpath_and_collector(tmp_path):
+    cds = CdsArchiveManager(str(tmp_path))
+    key = cds.archive_key(command())
+    assert key == cds.archive_key(command())
+    assert key != cds.archive_key(command(classpath="a.jar:c.jar"))
+    assert key != cds.archive_key(command(gc="-XX:+UseZGC"))
+    # Heap size doesn't change which classes are loaded
+    assert key == cds.archive_key(command()[:1] + ["-Xmx8G"] + command()[2:])
+
+
+def test_old_java_gets_no_flags(tmp_path):
+    assert CdsArchiveManager(str(tmp_path)).archive_args(command(), 11) == ([], None, None)
+    assert CdsArchiveManager(str(tmp_path)).archive_args(command(), None) == ([], None, None)
+
+
+def test_record_once_then_reuse(tmp_path):
+    cds = CdsArchiveManager(str(tmp_path))
+    flags, archive, first = cds.archive_args(command(), 17)
+    assert flags == [f"-XX:ArchiveClassesAtExit={first}"]
+    _, _, second = cds.archive_args(command(), 17)
+    assert first != second
+
+    # Two games recorded at once; the first to finish wins, the other recording is discarded
+    for recording in (first, second):
+        with open(recording, "wb") as f:
+            f.write(b"archive")
+    cds.acquire(archive)
+    cds.acquire(archive)
+    cds.finish(archive, first)
+    cds.finish(archive, second)
+    assert os.listdir(os.path.dirname(archive)) == [os.path.basename(archive)]
+    assert cds.in_use == {}
+
+    flags, same_archive, recording = cds.archive_args(command(), 17)
+    assert same_archive == archive and recording is None
+    assert flags == [f"-XX:SharedArchiveFile={archive}", "-Xshare:auto"]
+
+
+def test_empty_recording_is_not_kept(tmp_path):
+    cds = CdsArchiveManager(str(tmp_path))
+    _, archive, recording = cds.archive_args(command(), 17)
+    open(recording, "wb").close()
+    cds.acquire(archive)
+    cds.finish(archive, recording)
+    assert os.listdir(os.path.dirname(archive)) == []
+
+
+def test_prune_keeps_archives_in_use_and_drops_stale_recordings(tmp_path):
+    cds = CdsArchiveManager(str(tmp_path), max_archives=2)
+    os.makedirs(cds.archive_dir)
+    archives = []
+    for i in range(4):
+        path = os.path.join(cds.archive_dir, f"{i}.jsa")
+        with open(path, "wb") as f:
+            f.write(b"x")
+        os.utime(path, (1000 + i, 1000 + i))
+        archives.append(path)
+    stale = os.path.join(cds.archive_dir, "0.jsa.1-2-3.part")
+    fresh = os.path.join(cds.archive_dir, "3.jsa.4-5-6.part")
+    for path in (stale, fresh):
+        open(path, "wb").close()
+    old = time.time() - cds.STALE_RECORDING - 60
+    os.utime(stale, (old, old))
+
+    cds.acquire(archives[0])
+    cds.prune()
+    # Room is left for the archive about to be recorded; the oldest one is still mapped by a game
+    assert sorted(os.listdir(cds.archive_dir)) == ["0.jsa", "3.jsa", "3.jsa.4-5-6.part"]
@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+import launcher_core
+from launcher_core import ConfigStore
+
+
+def count_replaces(monkeypatch):
+    calls = []
+    real_replace = os.replace
+    def replace(src, dst):
+        calls.append(dst)
+        real_replace(src, dst)
+    monkeypatch.setattr(launcher_core.os, "replace", replace)
+    return calls
+
+
+def test_loads_over_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"ram": 8192}))
+    config = ConfigStore(str(path), {"ram": 4096, "gc_preset": "g1"})
+    assert config == {"ram": 8192, "gc_preset": "g1"}
+    path.write_text("{ not json")
+    assert ConfigStore(str(path), {"ram": 4096}) == {"ram": 4096}
+
+
+def test_a_burst_of_saves_is_one_write(tmp_path, monkeypatch):
+    writes = count_replaces(monkeypatch)
+    path = str(tmp_path / "config.json")
+    config = ConfigStore(path, {}, delay=0.05)
+    for i in range(20):
+        config["counter"] = i
+        config.save()
+    assert writes == []
+    deadline = time.time() + 5
+    while not writes and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert writes == [path]
+    assert json.load(open(path)) == {"counter": 19}
+
+
+def test_flush_writes_now_and_only_when_changed(tmp_path, monkeypatch):
+    writes = count_replaces(monkeypatch)
+    path = str(tmp_path / "sub" / "config.json")
+    config = ConfigStore(path, {"a": 1}, delay=60)
+    config.flush()
+    assert writes == []
+    config.setdefault("a", 2)
+    config.flush()
+    assert writes == []
+
+    config["a"] = 3
+    config.save()
+    config.flush()
+    assert len(writes) == 1
+    assert json.load(open(path)) == {"a": 3}
+    assert os.listdir(os.path.dirname(path)) == ["config.json"]
+
+
+def test_every_mutation_is_saved(tmp_path):
+    path = str(tmp_path / "config.json")
+    config = ConfigStore(path, {"a": 1, "b": 2, "c": 3})
+    config.update(d=4)
+    config.pop("a")
+    del config["b"]
+    config.setdefault("e", 5)
+    config.flush()
+    assert json.load(open(path)) == {"c": 3, "d": 4, "e": 5}
+
+
+def test_failed_write_keeps_the_old_file_and_retries(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"a": 1}))
+    config = ConfigStore(str(path))
+    config["a"] = 2
+
+    def fail(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(launcher_core.os, "replace", fail)
+    config.flush()
+    assert json.loads(path.read_text()) == {"a": 1}
+
+    monkeypatch.undo()
+    config.flush()
+    assert json.loads(path.read_text()) == {"a": 2}
@@ -0,0 +1,50 @@
+import os
+
+from launcher_core import ConsoleBuffer
+
+
+def test_drain_returns_everything_since_the_last_call(tmp_path):
+    buffer = ConsoleBuffer(log_path=str(tmp_path / "console.log"))
+    assert buffer.drain() == ""
+    buffer.append("one\n")
+    buffer.append("two\n")
+    assert buffer.drain() == "one\ntwo\n"
+    assert buffer.drain() == ""
+    buffer.close()
+
+
+def test_tail_keeps_only_the_newest_lines(tmp_path):
+    buffer = ConsoleBuffer(log_path=str(tmp_path / "console.log"), max_lines=3)
+    for i in range(10):
+        buffer.append(f"line {i}\n")
+    assert buffer.tail(2) == ["line 8", "line 9"]
+    assert buffer.tail(50) == ["line 7", "line 8", "line 9"]
+    buffer.close()
+
+
+def test_log_keeps_everything_and_counts_encoded_bytes(tmp_path):
+    buffer = ConsoleBuffer(log_path=str(tmp_path / "console.log"), max_lines=1)
+    buffer.append("héllo\n")
+    buffer.append("wörld ✓\n")
+    assert buffer.bytes_written == len("héllo\nwörld ✓\n".encode("utf-8"))
+    buffer.save_to(str(tmp_path / "saved.txt"))
+    assert (tmp_path / "saved.txt").read_text(encoding="utf-8") == "héllo\nwörld ✓\n"
+    buffer.close()
+
+
+def test_each_session_gets_its_own_log_and_old_ones_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(ConsoleBuffer, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(ConsoleBuffer, "KEEP_LOGS", 3)
+    for i in range(4):
+        old = tmp_path / f"console-2020010{i}-000000-1.log"
+        old.write_text(f"session {i}\n")
+        os.utime(old, (1000 + i, 1000 + i))
+
+    buffer = ConsoleBuffer()
+    buffer.append("this session\n")
+    buffer.close()
+    logs = sorted(os.listdir(tmp_path))
+    assert len(logs) == 3
+    assert os.path.basename(buffer.log_path) in logs
+    assert {"console-20200102-000000-1.log", "console-20200103-000000-1.log"} <= set(logs)
+    assert open(buffer.log_path).read() == "this session\n"
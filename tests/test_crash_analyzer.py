@@ -0,0 +1,61 @@
+import os
+import time
+
+import pytest
+
+from launcher_core import CRASH_SIGNATURES, CrashAnalyzer
+
+
+@pytest.mark.parametrize("line, sig_id", [
+    ("Exception in thread \"main\" java.lang.OutOfMemoryError: Java heap space", "out_of_memory"),
+    ("java.lang.UnsupportedClassVersionError: net/minecraft/client/main/Main has been compiled by a more recent version", "java_version"),
+    ("org.spongepowered.asm.mixin.transformer.throwables.MixinTransformerError: An unexpected critical error", "mixin_conflict"),
+    ("Mod 'Sodium Extra' (sodium-extra) 0.5.1 requires any version of sodium, which is missing!", "missing_dependency"),
+    ("net.fabricmc.loader.impl.FormattedException: Found duplicate mods", "duplicate_mod"),
+    ("[Render thread/ERROR]: GLFW error 65542: WGL: The driver does not appear to support OpenGL", "gl_error"),
+    ("java.util.zip.ZipException: invalid LOC header (bad signature)", "corrupt_file"),
+    ("# A fatal error has been detected by the Java Runtime Environment:", "native_crash"),
+])
+def test_signatures(line, sig_id):
+    analyzer = CrashAnalyzer()
+    assert analyzer.feed([line]) == 1
+    assert list(analyzer.findings) == [sig_id]
+
+
+def test_every_signature_has_a_title_and_hint():
+    for sig_id, regex, title, hint in CRASH_SIGNATURES:
+        assert sig_id.isidentifier() and title and hint
+
+
+def test_each_finding_is_reported_once_and_counted():
+    reported = []
+    analyzer = CrashAnalyzer(on_finding=reported.append)
+    lines = ["[main/INFO]: Loading 120 mods", "java.lang.OutOfMemoryError: Metaspace", "ok",
+             "java.lang.OutOfMemoryError: Java heap space"]
+    assert analyzer.feed(lines) == 2
+    assert [f["id"] for f in reported] == ["out_of_memory"]
+    assert analyzer.findings["out_of_memory"]["count"] == 2
+    assert analyzer.findings["out_of_memory"]["line"] == "java.lang.OutOfMemoryError: Metaspace"
+    assert "Out of memory" in analyzer.summary()
+
+
+def test_clean_output_has_no_summary():
+    analyzer = CrashAnalyzer()
+    assert analyzer.feed(["[main/INFO]: Setting user: Steve", "[Render thread/INFO]: Stopping!"]) == 0
+    assert analyzer.summary() == ""
+
+
+def test_scans_only_reports_written_since_the_launch(tmp_path):
+    reports = tmp_path / "crash-reports"
+    reports.mkdir()
+    old = reports / "crash-old.txt"
+    old.write_text("java.util.zip.ZipException: zip END header not found\n")
+    os.utime(old, (time.time() - 3600, time.time() - 3600))
+    launched = time.time() - 60
+    (tmp_path / "hs_err_pid123.log").write_text("#  SIGSEGV (0xb) at pc=0x00007f\n")
+
+    analyzer = CrashAnalyzer()
+    scanned = analyzer.scan_crash_reports(str(tmp_path), since=launched)
+    assert [os.path.basename(p) for p in scanned] == ["hs_err_pid123.log"]
+    assert list(analyzer.findings) == ["native_crash"]
+    assert analyzer.findings["native_crash"]["source"] == "hs_err_pid123.log"
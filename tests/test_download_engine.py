@@ -0,0 +1,78 @@
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+
+from launcher_core import DownloadEngine, DownloadError, DownloadJob
+
+
+def sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def test_downloads_in_parallel_over_reused_connections(tmp_path, http_server):
+    state = {"in_flight": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def slow(body):
+        def route(handler):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return 200, {}, body
+        return route
+
+    jobs = []
+    for i in range(40):
+        body = f"file {i}\n".encode() * 100
+        http_server.routes[f"/f{i}"] = slow(body)
+        jobs.append(DownloadJob(f"{http_server.url}/f{i}", str(tmp_path / f"f{i}"), sha1(body), len(body)))
+
+    with DownloadEngine(max_workers=4) as engine:
+        assert engine.run(jobs) == 40
+    for i, job in enumerate(jobs):
+        assert open(job.path, "rb").read() == f"file {i}\n".encode() * 100
+    assert state["peak"] > 1
+    # Keep-alive: one connection per worker thread, not one per file
+    assert len(http_server.requests) == 40
+    assert http_server.connections <= 4
+
+
+def test_checksum_mismatch_is_retried(tmp_path, http_server):
+    good = b"the real jar"
+    attempts = []
+
+    def flaky(handler):
+        attempts.append(1)
+        return 200, {}, good if len(attempts) > 1 else b"corrupted!!!"
+
+    http_server.routes["/lib.jar"] = flaky
+    job = DownloadJob(f"{http_server.url}/lib.jar", str(tmp_path / "libs" / "lib.jar"), sha1(good))
+    with DownloadEngine(max_workers=1) as engine:
+        assert engine.run([job]) == 1
+    assert len(attempts) == 2
+    assert open(job.path, "rb").read() == good
+
+
+def test_persistent_mismatch_fails_without_leaving_files(tmp_path, http_server):
+    http_server.routes["/bad.jar"] = (200, {}, b"always wrong")
+    job = DownloadJob(f"{http_server.url}/bad.jar", str(tmp_path / "bad.jar"), sha1(b"expected"))
+    with DownloadEngine(max_workers=1, retries=3) as engine:
+        with pytest.raises(DownloadError, match="1 file"):
+            engine.run([job])
+    assert len(http_server.requests) == 3
+    assert os.listdir(tmp_path) == []
+
+
+def test_satisfied_jobs_skip_the_network(tmp_path, http_server):
+    body = b"already here"
+    path = tmp_path / "done.bin"
+    path.write_bytes(body)
+    with DownloadEngine() as engine:
+        assert engine.run([DownloadJob(f"{http_server.url}/done.bin", str(path), sha1(body))]) == 0
+    assert http_server.requests == []
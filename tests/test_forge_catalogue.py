@@ -0,0 +1,27 @@
+import time
+
+from launcher_core import ForgeCatalogue
+
+
+def make_catalogue(tmp_path, versions):
+    catalogue = ForgeCatalogue(cache_dir=str(tmp_path))
+    catalogue._set_versions(versions, time.time())
+    return catalogue
+
+
+def test_minecraft_version_is_matched_exactly_not_by_prefix(tmp_path):
+    catalogue = make_catalogue(tmp_path, ["1.20.1-47.2.0", "1.20-46.0.14", "1.2.5-3.4.9.171"])
+    assert catalogue.builds_for("1.20") == ["1.20-46.0.14"]
+    assert catalogue.builds_for("1.20.1") == ["1.20.1-47.2.0"]
+    assert catalogue.builds_for("1.2") == []
+
+
+def test_builds_are_sorted_numerically_newest_first(tmp_path):
+    catalogue = make_catalogue(tmp_path, ["1.20.1-47.9.0", "1.20.1-47.10.0", "1.20.1-47.2.0"])
+    assert catalogue.latest_for("1.20.1") == "1.20.1-47.10.0"
+    assert catalogue.builds_for("1.20.1") == ["1.20.1-47.10.0", "1.20.1-47.9.0", "1.20.1-47.2.0"]
+
+
+def test_unknown_version_has_no_latest_build(tmp_path):
+    catalogue = make_catalogue(tmp_path, ["1.20.1-47.2.0"])
+    assert catalogue.latest_for("1.19.4") is None
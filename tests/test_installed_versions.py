@@ -0,0 +1,72 @@
+import json
+import os
+import shutil
+
+import launcher_core
+from launcher_core import InstalledVersionIndex, installed_versions
+
+
+def write_version(mc_dir, version_id, release_time, **extra):
+    os.makedirs(os.path.join(mc_dir, "versions", version_id), exist_ok=True)
+    with open(os.path.join(mc_dir, "versions", version_id, f"{version_id}.json"), "w") as f:
+        json.dump(dict(id=version_id, type="release", releaseTime=release_time, **extra), f)
+
+
+def ids(versions):
+    return [v["id"] for v in versions]
+
+
+def test_scan_matches_installed_versions(tmp_path):
+    mc_dir = str(tmp_path / "mc")
+    write_version(mc_dir, "1.19.4", "2023-03-14")
+    write_version(mc_dir, "1.20.1", "2023-06-12")
+    os.makedirs(os.path.join(mc_dir, "versions", "half-installed"))
+    index = InstalledVersionIndex(str(tmp_path / "cache"))
+    assert index.cached(mc_dir) is None
+    assert ids(index.scan(mc_dir)) == ids(installed_versions(mc_dir)) == ["1.20.1", "1.19.4"]
+    assert ids(InstalledVersionIndex(str(tmp_path / "cache")).cached(mc_dir)) == ["1.20.1", "1.19.4"]
+
+
+def test_unchanged_versions_are_not_parsed_again(tmp_path, monkeypatch):
+    mc_dir = str(tmp_path / "mc")
+    write_version(mc_dir, "1.20.1", "2023-06-12")
+    index = InstalledVersionIndex(str(tmp_path / "cache"))
+    index.scan(mc_dir)
+
+    parsed = []
+    real_info = launcher_core._installed_version_info
+    monkeypatch.setattr(launcher_core, "_installed_version_info", lambda mc_dir, name: parsed.append(name) or real_info(mc_dir, name))
+    assert ids(index.scan(mc_dir)) == ["1.20.1"]
+    assert parsed == []
+
+    write_version(mc_dir, "1.21", "2024-06-13")
+    write_version(mc_dir, "1.20.1", "2023-06-12", mainClass="net.minecraft.client.main.Main")
+    assert ids(index.scan(mc_dir)) == ["1.21", "1.20.1"]
+    assert sorted(parsed) == ["1.20.1", "1.21"]
+
+
+def test_picks_up_late_jsons_and_removed_versions(tmp_path):
+    mc_dir = str(tmp_path / "mc")
+    write_version(mc_dir, "1.20.1", "2023-06-12")
+    os.makedirs(os.path.join(mc_dir, "versions", "fabric-loader-0.15.0-1.20.1"))
+    index = InstalledVersionIndex(str(tmp_path / "cache"))
+    assert ids(index.scan(mc_dir)) == ["1.20.1"]
+
+    # The installer writes the JSON into a folder that already existed
+    write_version(mc_dir, "fabric-loader-0.15.0-1.20.1", "2023-06-13")
+    assert ids(index.scan(mc_dir)) == ["fabric-loader-0.15.0-1.20.1", "1.20.1"]
+
+    shutil.rmtree(os.path.join(mc_dir, "versions", "1.20.1"))
+    assert ids(index.scan(mc_dir)) == ["fabric-loader-0.15.0-1.20.1"]
+
+
+def test_each_directory_has_its_own_entry(tmp_path):
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    write_version(first, "1.20.1", "2023-06-12")
+    write_version(second, "1.8.9", "2015-12-03")
+    index = InstalledVersionIndex(str(tmp_path / "cache"))
+    index.scan(first)
+    index.scan(second)
+    assert ids(index.cached(first)) == ["1.20.1"]
+    assert ids(index.cached(second)) == ["1.8.9"]
+    assert index.scan(str(tmp_path / "missing")) == []
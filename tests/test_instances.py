@@ -0,0 +1,108 @@
+import os
+import threading
+
+import pytest
+
+import launcher_core
+from launcher_core import InstanceLimits, InstanceSupervisor, parse_cpu_list, split_cpus
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="nice/taskset are POSIX tools")
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-3,6") == [0, 1, 2, 3, 6]
+    assert parse_cpu_list(" 5, 1-2 ,1") == [1, 2, 5]
+    with pytest.raises(ValueError):
+        parse_cpu_list("a-b")
+
+
+def test_split_cpus():
+    assert split_cpus([0, 1, 2, 3, 4], 2) == [[0, 1, 2], [3, 4]]
+    assert split_cpus([0, 1], 3) == [[0], [1], [0]]
+    assert split_cpus([], 2) == [None, None]
+
+
+@posix_only
+def test_limits_wrap_the_command_in_nice_and_taskset(monkeypatch):
+    monkeypatch.setattr(launcher_core.shutil, "which", lambda tool: f"/usr/bin/{tool}")
+    command, kwargs, after_spawn, cleanup, warnings = InstanceLimits(cpus=[2, 3], nice=10).apply(["java", "-jar"], "a")
+    assert command == ["nice", "-n", "10", "taskset", "-c", "2,3", "java", "-jar"]
+    assert kwargs == {} and warnings == []
+
+
+@posix_only
+def test_limits_fall_back_to_setting_them_on_the_pid(monkeypatch):
+    monkeypatch.setattr(launcher_core.shutil, "which", lambda tool: None)
+    calls = []
+    monkeypatch.setattr(launcher_core.os, "setpriority", lambda which, pid, nice: calls.append(("nice", pid, nice)), raising=False)
+    monkeypatch.setattr(launcher_core.os, "sched_setaffinity", lambda pid, cpus: calls.append(("cpus", pid, list(cpus))), raising=False)
+    command, kwargs, after_spawn, cleanup, warnings = InstanceLimits(cpus=[1], nice=5).apply(["java"], "a")
+    assert command == ["java"]
+    after_spawn(1234)
+    assert calls == [("nice", 1234, 5), ("cpus", 1234, [1])]
+
+
+@posix_only
+def test_memory_cap_uses_a_systemd_scope_without_a_cgroup(monkeypatch):
+    monkeypatch.setattr(InstanceLimits, "_create_cgroup", lambda self, label: None)
+    monkeypatch.setattr(InstanceLimits, "_systemd_scope_available", staticmethod(lambda: True))
+    command, _, _, _, warnings = InstanceLimits(memory_mb=2048).apply(["java"], "a")
+    assert command == ["systemd-run", "--user", "--scope", "--quiet", "-p", "MemoryMax=2048M", "--", "java"]
+    monkeypatch.setattr(InstanceLimits, "_systemd_scope_available", staticmethod(lambda: False))
+    command, _, _, _, warnings = InstanceLimits(memory_mb=2048).apply(["java"], "a")
+    assert command == ["java"] and "can't be enforced" in warnings[0]
+
+
+@pytest.fixture
+def gated_supervisor(tmp_path, monkeypatch):
+    """A supervisor whose instances "run" until the gate opens."""
+    monkeypatch.chdir(tmp_path) # The pipelines' caches
+    monkeypatch.setattr(launcher_core.LaunchPipeline, "_shared_caches", None)
+    gate = threading.Event()
+    def run(self, instance):
+        self._set_state(instance, "running")
+        gate.wait(5)
+        self._set_state(instance, "exited")
+    monkeypatch.setattr(InstanceSupervisor, "_run", run)
+    supervisor = InstanceSupervisor({}, max_instances=3)
+    yield supervisor, gate
+    gate.set()
+
+
+def test_names_and_the_instance_limit_are_enforced(gated_supervisor):
+    supervisor, gate = gated_supervisor
+    supervisor.launch("a", "1.20.1")
+    with pytest.raises(ValueError, match="already running"):
+        supervisor.launch("a", "1.20.1")
+    supervisor.launch("b", "1.20.1")
+    supervisor.launch("c", "1.20.1")
+    with pytest.raises(ValueError, match="3 instances"):
+        supervisor.launch("d", "1.20.1")
+
+    gate.set()
+    for instance in list(supervisor.instances.values()):
+        instance.thread.join(5)
+    assert supervisor.running() == []
+    supervisor.launch("a", "1.20.1").thread.join(5)
+
+
+def test_concurrent_launches_cannot_overshoot(gated_supervisor):
+    supervisor, gate = gated_supervisor
+    start = threading.Barrier(8)
+    launched, refused = [], []
+
+    def launch(name):
+        start.wait()
+        try:
+            supervisor.launch(name, "1.20.1")
+            launched.append(name)
+        except ValueError:
+            refused.append(name)
+
+    threads = [threading.Thread(target=launch, args=("same" if i % 2 else f"i{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(launched) == 3 and len(refused) == 5
+    assert launched.count("same") <= 1
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+import launcher_core
+from launcher_core import DownloadEngine, IntegrityVerifier
+
+FILES = {"a": b"library a", "b": b"library b", "c": b"library c"}
+
+
+def sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def install(mc_dir, base_url):
+    """A version with three libraries on disk, all matching their manifest hashes."""
+    libraries = []
+    for name, data in FILES.items():
+        path = f"com/example/{name}/1.0/{name}-1.0.jar"
+        libraries.append({"name": f"com.example:{name}:1.0", "downloads": {"artifact": {
+            "path": path, "url": f"{base_url}/{name}.jar", "sha1": sha1(data), "size": len(data)}}})
+        os.makedirs(os.path.dirname(os.path.join(mc_dir, "libraries", path)), exist_ok=True)
+        with open(os.path.join(mc_dir, "libraries", path), "wb") as f:
+            f.write(data)
+    os.makedirs(os.path.join(mc_dir, "versions", "1.0"))
+    with open(os.path.join(mc_dir, "versions", "1.0", "1.0.json"), "w") as f:
+        json.dump({"id": "1.0", "libraries": libraries}, f)
+
+
+def library(mc_dir, name):
+    return os.path.join(mc_dir, "libraries", "com", "example", name, "1.0", f"{name}-1.0.jar")
+
+
+@pytest.fixture
+def mc_dir(tmp_path):
+    mc_dir = str(tmp_path / "mc")
+    install(mc_dir, "http://127.0.0.1:9")
+    return mc_dir
+
+
+@pytest.fixture
+def threads_only(monkeypatch):
+    def no_processes(*args, **kwargs):
+        raise NotImplementedError("no worker processes here")
+    monkeypatch.setattr(launcher_core, "ProcessPoolExecutor", no_processes)
+
+
+def test_hashes_on_worker_processes(tmp_path, mc_dir):
+    with open(library(mc_dir, "b"), "wb") as f:
+        f.write(b"tampered")
+    bad = IntegrityVerifier(str(tmp_path / "cache"), max_workers=2).verify("1.0", mc_dir)
+    assert [job.path for job in bad] == [library(mc_dir, "b")]
+
+
+def test_unchanged_files_are_not_hashed_again(tmp_path, mc_dir, threads_only):
+    assert IntegrityVerifier(str(tmp_path / "cache")).verify("1.0", mc_dir) == []
+    verifier = IntegrityVerifier(str(tmp_path / "cache"))
+    hashed = []
+    real_hash_all = verifier._hash_all
+    verifier._hash_all = lambda paths, progress: hashed.extend(paths) or real_hash_all(paths, progress)
+    assert verifier.verify("1.0", mc_dir) == []
+    assert hashed == []
+
+    with open(library(mc_dir, "c"), "wb") as f:
+        f.write(b"changed!!")
+    assert [job.path for job in verifier.verify("1.0", mc_dir)] == [library(mc_dir, "c")]
+    assert hashed == [library(mc_dir, "c")]
+    # The stamp of the bad file is cached too, so it stays bad without being rehashed
+    assert [job.path for job in verifier.verify("1.0", mc_dir)] == [library(mc_dir, "c")]
+    assert hashed == [library(mc_dir, "c")]
+
+
+def test_missing_and_unreadable_files_are_bad(tmp_path, mc_dir, threads_only):
+    os.remove(library(mc_dir, "a"))
+    os.remove(library(mc_dir, "b"))
+    os.mkdir(library(mc_dir, "b")) # stat() works, reading fails
+    verifier = IntegrityVerifier(str(tmp_path / "cache"))
+    assert sorted(job.path for job in verifier.verify("1.0", mc_dir)) == [library(mc_dir, "a"), library(mc_dir, "b")]
+    assert library(mc_dir, "b") not in verifier.hashes
+    assert library(mc_dir, "c") in verifier.hashes
+
+
+def test_repair_downloads_only_the_bad_files(tmp_path, http_server, threads_only):
+    mc_dir = str(tmp_path / "mc")
+    install(mc_dir, http_server.url)
+    for name, data in FILES.items():
+        http_server.routes[f"/{name}.jar"] = (200, {}, data)
+    with open(library(mc_dir, "a"), "wb") as f:
+        f.write(b"broken")
+    verifier = IntegrityVerifier(str(tmp_path / "cache"))
+    bad = verifier.verify("1.0", mc_dir)
+    with DownloadEngine() as engine:
+        assert verifier.repair(bad, engine) == 1
+    assert [path for path, _ in http_server.requests] == ["/a.jar"]
+    assert open(library(mc_dir, "a"), "rb").read() == FILES["a"]
+    assert verifier.verify("1.0", mc_dir) == []
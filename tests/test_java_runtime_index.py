@@ -0,0 +1,72 @@
+import os
+import stat
+import sys
+
+import pytest
+
+import launcher_core
+from launcher_core import JavaRuntimeIndex
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake JVMs are shell scripts")
+
+
+def fake_java(path, spec_version, log):
+    """A script that answers -XshowSettings:properties like a JVM of spec_version (None: broken) and logs each probe."""
+    if spec_version is None:
+        props = "echo 'Error: could not open lib/jvm.cfg' >&2; exit 1"
+    else:
+        props = (f"echo '    java.specification.version = {spec_version}' >&2; "
+                 f"echo '    java.version = {spec_version}.0.1' >&2; echo '    sun.arch.data.model = 64' >&2")
+    with open(path, "w") as f:
+        f.write(f'#!/bin/sh\nif [ "$1" = "-XshowSettings:properties" ]; then echo "$0" >> {log}; {props}; fi\nexit 0\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def probes(log):
+    return open(log).read().splitlines() if os.path.exists(log) else []
+
+
+@pytest.fixture(autouse=True)
+def no_system_jvms(monkeypatch):
+    monkeypatch.setattr(launcher_core, "java_candidate_paths", lambda mc_dir=None: [])
+
+
+def test_exact_major_first_then_the_closest_newer(tmp_path):
+    log = str(tmp_path / "probes.log")
+    java8 = fake_java(str(tmp_path / "java8"), "1.8", log)
+    java17 = fake_java(str(tmp_path / "java17"), "17", log)
+    java21 = fake_java(str(tmp_path / "java21"), "21", log)
+    index = JavaRuntimeIndex(str(tmp_path / "cache"))
+    index.refresh(extra_paths=[java21, java8, java17])
+    assert index.find(8) == java8
+    assert index.find(17) == java17
+    assert index.find(16) == java17
+    assert index.find(21) == java21
+    assert index.find(25) is None
+
+
+def test_probes_are_cached_until_the_executable_changes(tmp_path):
+    log = str(tmp_path / "probes.log")
+    java17 = fake_java(str(tmp_path / "java17"), "17", log)
+    JavaRuntimeIndex(str(tmp_path / "cache")).refresh(extra_paths=[java17])
+    index = JavaRuntimeIndex(str(tmp_path / "cache"))
+    index.refresh(extra_paths=[java17])
+    assert probes(log) == [java17]
+    assert index.find(17) == java17
+
+    os.utime(java17, ns=(1, 1))
+    index.refresh(extra_paths=[java17])
+    assert probes(log) == [java17, java17]
+
+
+def test_failed_probes_are_cached_too(tmp_path):
+    log = str(tmp_path / "probes.log")
+    broken = fake_java(str(tmp_path / "broken"), None, log)
+    java17 = fake_java(str(tmp_path / "java17"), "17", log)
+    index = JavaRuntimeIndex(str(tmp_path / "cache"))
+    assert list(index.refresh(extra_paths=[broken, java17])) == [java17]
+    JavaRuntimeIndex(str(tmp_path / "cache")).refresh(extra_paths=[broken, java17])
+    assert sorted(probes(log)) == sorted([broken, java17])
+    assert index.major_of(broken) is None
+    assert sorted(probes(log)) == sorted([broken, java17])
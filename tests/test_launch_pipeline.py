@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+import launcher_cli
+import launcher_core
+from launcher_core import ConfigStore, LaunchError, LaunchPipeline, default_config
+
+pytest.importorskip("minecraft_launcher_lib")
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the fake JVM is a shell script")
+
+OFFLINE = {"type": "offline", "name": "Steve", "uuid": "0f0f0f0f-0000-0000-0000-000000000000"}
+
+
+def fake_java(path, major):
+    """Answers probes like a JVM of the given major; as the game, prints its arguments and exits."""
+    with open(path, "w") as f:
+        f.write('#!/bin/sh\n'
+                f'if [ "$1" = "-XshowSettings:properties" ]; then echo "java.specification.version = {major}" >&2; exit 0; fi\n'
+                'if [ "$2" = "-version" ]; then exit 0; fi\n'
+                'for arg in "$@"; do echo "ARG $arg"; done\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.fixture
+def launcher(tmp_path, monkeypatch):
+    """A Minecraft directory with version 1.0, a Java 17 and a config using both; caches live in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(LaunchPipeline, "_shared_caches", None)
+    monkeypatch.setattr(launcher_core, "java_candidate_paths", lambda mc_dir=None: [])
+    mc_dir = tmp_path / "mc"
+    (mc_dir / "versions" / "1.0").mkdir(parents=True)
+    (mc_dir / "versions" / "1.0" / "1.0.json").write_text(json.dumps({
+        "id": "1.0", "type": "release", "releaseTime": "2011-11-18T00:00:00+00:00", "libraries": [],
+        "mainClass": "net.minecraft.client.main.Main", "javaVersion": {"majorVersion": 17},
+        "minecraftArguments": "--username ${auth_player_name} --gameDir ${game_directory} --accessToken ${auth_access_token}"}))
+    (mc_dir / "versions" / "1.0" / "1.0.jar").write_bytes(b"")
+    config = ConfigStore(str(tmp_path / "config.json"), default_config())
+    config.update(minecraft_directory=str(mc_dir), java_path=fake_java(tmp_path / "java17", 17), ram_auto=False, ram=1024,
+                  accounts=[dict(OFFLINE)], active_account_uuid=OFFLINE["uuid"])
+    return config
+
+
+def files_under(root):
+    return sorted(os.path.relpath(os.path.join(d, f), root) for d, _, names in os.walk(root) for f in names)
+
+
+def test_launch_resolves_and_runs(tmp_path, launcher):
+    output = []
+    pipeline = LaunchPipeline(launcher, on_output=output.append)
+    plan = pipeline.prepare("1.0")
+    command = plan["command"]
+    assert command[0] == launcher["java_path"]
+    assert command[1].startswith("-XX:ArchiveClassesAtExit=")
+    assert command[2:4] == ["-Xmx1024M", "-Xms1024M"]
+    assert os.path.isdir(os.path.join(plan["profile_dir"], "mods"))
+
+    return_code, report = pipeline.run(plan)
+    assert (return_code, report) == (0, "")
+    args = [line[4:].rstrip("\n") for line in "".join(output).splitlines(keepends=True) if line.startswith("ARG ")]
+    # hs_err files land in the profile, where the crash analyzer looks, whatever the working directory
+    assert args[0] == f"-XX:ErrorFile={os.path.join(os.path.abspath(plan['profile_dir']), 'hs_err_pid%p.log')}"
+    assert "Steve" in args
+    assert pipeline.cds_archives.in_use == {}
+
+
+def test_dry_run_changes_nothing_on_disk(tmp_path, launcher):
+    launcher.update(mod_loader="Fabric", fabric_loader_version="0.15.0")
+    launcher.flush()
+    before = files_under(tmp_path)
+    output = []
+    pipeline = LaunchPipeline(launcher, on_output=output.append)
+    plan = pipeline.prepare("1.0", dry_run=True)
+    assert files_under(tmp_path) == before
+    assert plan["dry_run"] and plan["launch_version_id"] == "1.0"
+    assert "Fabric 0.15.0 would be installed first" in "".join(output)
+    assert any(arg.startswith("-XX:ArchiveClassesAtExit=") for arg in plan["command"])
+    with pytest.raises(LaunchError):
+        pipeline.run(plan)
+
+
+def test_dry_run_leaves_an_expired_msa_token_alone(tmp_path, launcher):
+    account = {"type": "msa", "name": "Alex", "uuid": "msa-uuid", "token": "old", "refresh_token": "r", "token_expires_at": 0}
+    launcher.update(accounts=[account], active_account_uuid="msa-uuid")
+    refresher = launcher_core.MsaTokenRefresher(launcher, refresh_login=lambda token: pytest.fail("refreshed in a dry run"))
+    output = []
+    plan = LaunchPipeline(launcher, on_output=output.append, token_refresher=refresher).prepare("1.0", dry_run=True)
+    assert plan["token"] == "old"
+    assert "would be refreshed" in "".join(output)
+
+
+def test_newer_java_fallback_is_reported(tmp_path, launcher, monkeypatch):
+    java21 = fake_java(tmp_path / "java21", 21)
+    monkeypatch.setattr(launcher_core, "java_candidate_paths", lambda mc_dir=None: [java21])
+    launcher["java_path"] = ""
+    output = []
+    plan = LaunchPipeline(launcher, on_output=output.append).prepare("1.0", dry_run=True)
+    assert plan["java_path"] == java21
+    assert "requires Java 17" in "".join(output) and "using Java 21" in "".join(output)
+
+
+def test_cli_dry_run_prints_the_masked_command(tmp_path, launcher, monkeypatch):
+    launcher.update(accounts=[dict(OFFLINE, token="secret-token")])
+    launcher.flush()
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    assert launcher_cli.main(["--version", "1.0", "--config", launcher.path, "--dry-run", "--json"]) == 0
+    events = [json.loads(line) for line in out.getvalue().splitlines()]
+    prepared = next(e for e in events if e["event"] == "prepared")
+    assert prepared["version"] == "1.0"
+    assert "secret-token" not in out.getvalue()
+    assert not os.path.isdir(tmp_path / "mc" / "profiles")
@@ -0,0 +1,93 @@
+import json
+import os
+
+import pytest
+
+from launcher_core import LaunchPlanCache
+
+
+def write_version(mc_dir, version_id, data):
+    os.makedirs(os.path.join(mc_dir, "versions", version_id), exist_ok=True)
+    with open(os.path.join(mc_dir, "versions", version_id, f"{version_id}.json"), "w") as f:
+        json.dump(data, f)
+
+
+class FakeBuilder:
+    """Stands in for minecraft_launcher_lib.command.get_minecraft_command."""
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, version_id, mc_dir, options):
+        self.calls += 1
+        return ([options["executablePath"]] + options.get("jvmArguments", []) +
+                ["-cp", "client.jar", "Main", "--username", options["username"], "--uuid", options["uuid"],
+                 "--accessToken", options["token"], "--gameDir", options["gameDirectory"]])
+
+
+def options(**overrides):
+    base = {"username": "Steve", "uuid": "uuid-1", "token": "token-1", "executablePath": "/usr/bin/java",
+            "gameDirectory": "/games/1.20.1", "jvmArguments": ["-Xmx2048M", "-Xms2048M"]}
+    base.update(overrides)
+    return base
+
+
+@pytest.fixture
+def mc_dir(tmp_path):
+    mc_dir = str(tmp_path / "mc")
+    write_version(mc_dir, "1.20.1", {"id": "1.20.1", "mainClass": "Main"})
+    return mc_dir
+
+
+def test_hit_substitutes_the_account_fields(tmp_path, mc_dir):
+    build = FakeBuilder()
+    cache = LaunchPlanCache(str(tmp_path / "cache"))
+    first = cache.get_command("1.20.1", mc_dir, options(), build)
+    second = cache.get_command("1.20.1", mc_dir, options(username="Alex", uuid="uuid-2", token="token-2"), build)
+    assert build.calls == 1
+    assert first == build("1.20.1", mc_dir, options())
+    assert second == build("1.20.1", mc_dir, options(username="Alex", uuid="uuid-2", token="token-2"))
+    # Reloaded from disk
+    third = LaunchPlanCache(str(tmp_path / "cache")).get_command("1.20.1", mc_dir, options(), build)
+    assert third == first
+    assert build.calls == 3
+
+
+def test_heap_and_gc_flags_are_not_part_of_the_key(tmp_path, mc_dir):
+    build = FakeBuilder()
+    cache = LaunchPlanCache(str(tmp_path / "cache"))
+    cache.get_command("1.20.1", mc_dir, options(), build)
+    command = cache.get_command("1.20.1", mc_dir, options(jvmArguments=["-Xmx6144M", "-XX:+UseZGC"]), build)
+    assert build.calls == 1
+    assert command[:4] == ["/usr/bin/java", "-Xmx6144M", "-XX:+UseZGC", "-cp"]
+    assert "-Xmx2048M" not in command
+
+
+def test_other_options_and_the_version_json_are_part_of_the_key(tmp_path, mc_dir):
+    build = FakeBuilder()
+    cache = LaunchPlanCache(str(tmp_path / "cache"))
+    cache.get_command("1.20.1", mc_dir, options(), build)
+    cache.get_command("1.20.1", mc_dir, options(gameDirectory="/games/other"), build)
+    assert build.calls == 2
+    write_version(mc_dir, "1.20.1", {"id": "1.20.1", "mainClass": "Main", "libraries": []})
+    cache.get_command("1.20.1", mc_dir, options(), build)
+    assert build.calls == 3
+
+
+def test_missing_versions_go_straight_to_the_builder(tmp_path, mc_dir):
+    def build(version_id, mc_dir, options):
+        raise LookupError(version_id)
+    cache = LaunchPlanCache(str(tmp_path / "cache"))
+    with pytest.raises(LookupError):
+        cache.get_command("1.99", mc_dir, options(), build)
+    assert cache.entries == {}
+
+
+def test_only_max_entries_are_kept(tmp_path, mc_dir):
+    build = FakeBuilder()
+    cache = LaunchPlanCache(str(tmp_path / "cache"), max_entries=2)
+    for game_dir in ("/a", "/b", "/c"):
+        cache.get_command("1.20.1", mc_dir, options(gameDirectory=game_dir), build)
+    assert len(cache.entries) == 2
+    # The least recently used plan went, not the one just built
+    cache.get_command("1.20.1", mc_dir, options(gameDirectory="/c"), build)
+    assert build.calls == 3
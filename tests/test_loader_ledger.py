@@ -0,0 +1,59 @@
+import json
+import os
+
+from launcher_core import LoaderInstallLedger, forge_installed_version_id
+
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def install_fabric(mc_dir):
+    vanilla = {"id": "1.20.1", "releaseTime": "2023-06-12T00:00:00+00:00", "downloads": {"client": {}},
+               "libraries": [{"name": "com.example:lib:1.0", "downloads": {"artifact": {"path": "com/example/lib/1.0/lib-1.0.jar"}}}]}
+    fabric_id = "fabric-loader-0.15.0-1.20.1"
+    fabric = {"id": fabric_id, "inheritsFrom": "1.20.1", "libraries": [{"name": "net.fabricmc:fabric-loader:0.15.0"}]}
+    write_file(os.path.join(mc_dir, "versions", "1.20.1", "1.20.1.json"), json.dumps(vanilla))
+    write_file(os.path.join(mc_dir, "versions", "1.20.1", "1.20.1.jar"), "client")
+    write_file(os.path.join(mc_dir, "versions", fabric_id, f"{fabric_id}.json"), json.dumps(fabric))
+    write_file(os.path.join(mc_dir, "libraries", "com", "example", "lib", "1.0", "lib-1.0.jar"), "lib")
+    write_file(os.path.join(mc_dir, "libraries", "net", "fabricmc", "fabric-loader", "0.15.0", "fabric-loader-0.15.0.jar"), "loader")
+    return fabric_id
+
+
+def test_recorded_install_is_found_until_a_file_changes(tmp_path):
+    mc_dir = str(tmp_path / "mc")
+    fabric_id = install_fabric(mc_dir)
+    ledger = LoaderInstallLedger(str(tmp_path / "cache"))
+    assert ledger.lookup(mc_dir, "1.20.1", "Fabric", "latest") is None
+
+    ledger.record(mc_dir, "1.20.1", "Fabric", "latest", fabric_id)
+    assert ledger.lookup(mc_dir, "1.20.1", "Fabric", "latest") == fabric_id
+    assert ledger.lookup(mc_dir, "1.20.1", "Fabric", "0.14.0") is None
+    assert ledger.lookup(str(tmp_path / "other"), "1.20.1", "Fabric", "latest") is None
+    # Survives a restart
+    assert LoaderInstallLedger(str(tmp_path / "cache")).lookup(mc_dir, "1.20.1", "Fabric", "latest") == fabric_id
+
+    # A library inherited from the vanilla version was replaced
+    write_file(os.path.join(mc_dir, "libraries", "com", "example", "lib", "1.0", "lib-1.0.jar"), "patched lib")
+    assert ledger.lookup(mc_dir, "1.20.1", "Fabric", "latest") is None
+
+
+def test_missing_files_invalidate_the_entry(tmp_path):
+    mc_dir = str(tmp_path / "mc")
+    fabric_id = install_fabric(mc_dir)
+    ledger = LoaderInstallLedger(str(tmp_path / "cache"))
+    ledger.record(mc_dir, "1.20.1", "Fabric", "latest", fabric_id)
+    os.remove(os.path.join(mc_dir, "libraries", "net", "fabricmc", "fabric-loader", "0.15.0", "fabric-loader-0.15.0.jar"))
+    assert ledger.lookup(mc_dir, "1.20.1", "Fabric", "latest") is None
+
+
+def test_forge_version_id_follows_the_installed_folder(tmp_path):
+    mc_dir = str(tmp_path)
+    assert forge_installed_version_id(mc_dir, "1.20.1-47.2.0") == "1.20.1-47.2.0"
+    write_file(os.path.join(mc_dir, "versions", "1.20.1-forge-47.2.0", "1.20.1-forge-47.2.0.json"), "{}")
+    assert forge_installed_version_id(mc_dir, "1.20.1-47.2.0") == "1.20.1-forge-47.2.0"
+    write_file(os.path.join(mc_dir, "versions", "1.12.2-forge1.12.2-14.23.5.2859", "1.12.2-forge1.12.2-14.23.5.2859.json"), "{}")
+    assert forge_installed_version_id(mc_dir, "1.12.2-14.23.5.2859") == "1.12.2-forge1.12.2-14.23.5.2859"
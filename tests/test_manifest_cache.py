@@ -0,0 +1,52 @@
+import json
+
+from launcher_core import ManifestCache
+
+
+def manifest(*ids):
+    return {"latest": {"release": ids[0]}, "versions": [{"id": v, "type": "release"} for v in ids]}
+
+
+def serve_manifest(http_server, state):
+    def route(handler):
+        if handler.headers.get("If-None-Match") == state["etag"]:
+            return 304, {"ETag": state["etag"]}, b""
+        return 200, {"ETag": state["etag"]}, json.dumps(state["manifest"]).encode()
+    http_server.routes["/manifest.json"] = route
+
+
+def test_revalidates_with_etag_and_reuses_the_cache_on_304(tmp_path, http_server):
+    state = {"etag": '"v1"', "manifest": manifest("1.20.1", "1.20")}
+    serve_manifest(http_server, state)
+    cache = ManifestCache(str(tmp_path), f"{http_server.url}/manifest.json")
+    assert cache.cached_versions() == []
+
+    changed, versions = cache.revalidate()
+    assert changed
+    assert [v["id"] for v in versions] == ["1.20.1", "1.20"]
+    assert "If-None-Match" not in http_server.requests[0][1]
+
+    changed, versions = cache.revalidate()
+    assert not changed
+    assert [v["id"] for v in versions] == ["1.20.1", "1.20"]
+    assert http_server.requests[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_a_new_etag_replaces_the_cached_manifest(tmp_path, http_server):
+    state = {"etag": '"v1"', "manifest": manifest("1.20")}
+    serve_manifest(http_server, state)
+    cache = ManifestCache(str(tmp_path), f"{http_server.url}/manifest.json")
+    cache.revalidate()
+
+    state.update(etag='"v2"', manifest=manifest("1.21", "1.20"))
+    changed, versions = cache.revalidate()
+    assert changed
+    assert [v["id"] for v in versions] == ["1.21", "1.20"]
+    assert cache.load()["etag"] == '"v2"'
+    assert [v["id"] for v in ManifestCache(str(tmp_path), f"{http_server.url}/manifest.json").cached_versions()] == ["1.21", "1.20"]
+
+
+def test_custom_manifest_urls_get_their_own_cache_file(tmp_path):
+    default = ManifestCache(str(tmp_path))
+    custom = ManifestCache(str(tmp_path), "http://example.invalid/manifest.json")
+    assert default.path != custom.path
@@ -0,0 +1,59 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from launcher_core import gc_preset_args, minecraft_minor, probe_java, recommend_heap_mb
+
+PLENTY = (65536, 49152)
+
+
+@pytest.mark.parametrize("version_id, minor", [("1.20.1", 20), ("1.8.9", 8), ("1.20.1-forge-47.2.0", 20),
+                                               ("fabric-loader-0.15.0-1.19.4", 19), ("23w13a", None)])
+def test_minecraft_minor(version_id, minor):
+    assert minecraft_minor(version_id) == minor
+
+
+def test_heap_grows_with_version_and_mods():
+    assert recommend_heap_mb("1.12.2", 0, PLENTY) == 1024
+    assert recommend_heap_mb("1.16.5", 0, PLENTY) == 2048
+    assert recommend_heap_mb("1.20.1", 0, PLENTY) == 2560
+    assert recommend_heap_mb("1.20.1", 100, PLENTY) == 7168
+    assert recommend_heap_mb("1.20.1", 1000, PLENTY) == 16384
+
+
+def test_heap_stays_within_free_memory():
+    # 80% of 3000 MB free, rounded down to 256 MB
+    assert recommend_heap_mb("1.20.1", 100, (16384, 3000)) == 2304
+    assert recommend_heap_mb("1.20.1", 100, (4096, 4096)) == 2048
+    assert recommend_heap_mb("1.20.1", 100, (2048, 512)) == 1024
+    assert recommend_heap_mb("1.20.1", 0, (None, None)) == 2560
+
+
+def test_g1_region_size_follows_the_heap():
+    assert "-XX:G1HeapRegionSize=4M" in gc_preset_args("g1", 4096)
+    assert "-XX:G1HeapRegionSize=8M" in gc_preset_args("g1", 12288)
+    assert "-XX:G1HeapRegionSize=32M" in gc_preset_args("g1", 262144)
+
+
+def test_presets_fall_back_to_g1():
+    assert gc_preset_args("zgc", 4096, java_major=17)[0] == "-XX:+UseZGC"
+    assert "-XX:+ZGenerational" in gc_preset_args("zgc", 4096, java_major=21)
+    assert gc_preset_args("zgc", 4096, java_major=8)[0] == "-XX:+UseG1GC"
+    assert gc_preset_args("no-such-preset", 4096)[0] == "-XX:+UseG1GC"
+    assert gc_preset_args("shenandoah", 4096, java_major=17)[0] == "-XX:+UseShenandoahGC"
+    assert gc_preset_args("shenandoah", 4096, java_major=17, unsupported=["shenandoah"])[0] == "-XX:+UseG1GC"
+    assert gc_preset_args("default", 4096) == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the fake JVM is a shell script")
+def test_probe_finds_missing_shenandoah(tmp_path):
+    java = tmp_path / "java"
+    java.write_text('#!/bin/sh\n'
+                    'if [ "$1" = "-XX:+UseShenandoahGC" ]; then echo "Unrecognized VM option" >&2; exit 1; fi\n'
+                    'echo "    java.specification.version = 17" >&2\n')
+    os.chmod(java, os.stat(java).st_mode | stat.S_IEXEC)
+    info = probe_java(str(java))
+    assert info["major"] == 17
+    assert info["unsupported_gcs"] == ["shenandoah"]
@@ -0,0 +1,88 @@
+import json
+import os
+import zipfile
+
+from launcher_core import ModIndex, read_mod_metadata
+
+
+def fabric_jar(path, mod_id, depends=(), breaks=(), version="1.0"):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("fabric.mod.json", json.dumps({"id": mod_id, "name": mod_id.title(), "version": version,
+                                                   "depends": {d: "*" for d in depends}, "breaks": {b: "*" for b in breaks}}))
+    return str(path)
+
+
+def forge_jar(path, mod_id, version="${file.jarVersion}"):
+    toml = f'''modLoader="javafml"
+[[mods]]
+modId="{mod_id}"
+version="{version}"
+displayName="Forge Mod"
+[[dependencies.{mod_id}]]
+modId="forge"
+mandatory=true
+'''
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("META-INF/mods.toml", toml)
+        zf.writestr("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\nImplementation-Version: 2.3.4\n")
+    return str(path)
+
+
+def test_reads_fabric_and_forge_metadata(tmp_path):
+    fabric = read_mod_metadata(fabric_jar(tmp_path / "sodium.jar", "sodium", depends=["fabricloader", "minecraft"]))
+    assert fabric == [{"id": "sodium", "name": "Sodium", "version": "1.0", "loader": "fabric",
+                       "depends": ["fabricloader", "minecraft"], "breaks": [], "provides": []}]
+    forge = read_mod_metadata(forge_jar(tmp_path / "jei.jar", "jei"))
+    assert forge[0]["id"] == "jei"
+    assert forge[0]["version"] == "2.3.4" # From the manifest
+    assert forge[0]["depends"] == ["forge"]
+
+
+def test_conflicts(tmp_path):
+    mods_dir = tmp_path / "mods"
+    mods_dir.mkdir()
+    fabric_jar(mods_dir / "a.jar", "alpha", depends=["beta", "fabric-rendering-v1"])
+    fabric_jar(mods_dir / "c.jar", "gamma", breaks=["alpha"])
+    fabric_jar(mods_dir / "c-copy.jar", "gamma")
+    (mods_dir / "broken.jar").write_bytes(b"not a zip")
+    problems = ModIndex.conflicts(ModIndex(str(tmp_path / "cache")).scan(str(mods_dir)))
+    assert "Duplicate mod 'gamma' in: c-copy.jar, c.jar" in problems
+    assert "'alpha' (a.jar) requires 'beta', which is not installed" in problems
+    assert "'alpha' (a.jar) requires 'fabric-rendering-v1', which is not installed" in problems
+    assert "'gamma' (c.jar) is incompatible with 'alpha'" in problems
+    assert any(p.startswith("broken.jar could not be read") for p in problems)
+
+    # Fabric API provides its modules
+    fabric_jar(mods_dir / "fabric-api.jar", "fabric-api")
+    fabric_jar(mods_dir / "b.jar", "beta")
+    problems = ModIndex.conflicts(ModIndex(str(tmp_path / "cache")).scan(str(mods_dir)))
+    assert not any("requires" in p for p in problems)
+
+
+def test_mixed_loaders_are_reported(tmp_path):
+    mods_dir = tmp_path / "mods"
+    mods_dir.mkdir()
+    fabric_jar(mods_dir / "a.jar", "alpha")
+    forge_jar(mods_dir / "b.jar", "beta")
+    problems = ModIndex.conflicts(ModIndex(str(tmp_path / "cache")).scan(str(mods_dir)))
+    assert "Mods for different loaders are mixed: fabric, forge" in problems
+
+
+def test_rescan_reuses_cached_metadata_and_forgets_removed_jars(tmp_path):
+    mods_dir = tmp_path / "mods"
+    mods_dir.mkdir()
+    fabric_jar(mods_dir / "a.jar", "alpha")
+    fabric_jar(mods_dir / "b.jar", "beta")
+    index = ModIndex(str(tmp_path / "cache"))
+    assert sorted(m["id"] for m in index.scan(str(mods_dir))) == ["alpha", "beta"]
+
+    # A cached entry is trusted while size and mtime match, whatever the path spelling
+    key = next(k for k in index.cache if k.endswith("a.jar"))
+    index.cache[key]["mods"][0]["id"] = "from-cache"
+    spelled_differently = os.path.join(str(tmp_path), ".", "mods")
+    assert sorted(m["id"] for m in index.scan(spelled_differently)) == ["beta", "from-cache"]
+
+    os.remove(mods_dir / "b.jar")
+    fabric_jar(mods_dir / "a.jar", "alpha", version="2.0-longer-version")
+    assert [(m["id"], m["version"]) for m in index.scan(str(mods_dir))] == [("alpha", "2.0-longer-version")]
+    assert len(ModIndex(str(tmp_path / "cache")).cache) == 1
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import zipfile
+
+import pytest
+
+from launcher_core import DownloadEngine, DownloadError, ModpackImporter, detect_modpack_format
+
+CDN = "https://cdn.modrinth.com"
+
+
+def sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def write_pack(path, files):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return str(path)
+
+
+def test_detects_pack_formats(tmp_path):
+    assert detect_modpack_format(write_pack(tmp_path / "a.zip", {"mods/a.jar": "jar"})) == "zip"
+    assert detect_modpack_format(write_pack(tmp_path / "b.mrpack", {"modrinth.index.json": "{}"})) == "modrinth"
+    cf = json.dumps({"manifestType": "minecraftModpack"})
+    assert detect_modpack_format(write_pack(tmp_path / "c.zip", {"manifest.json": cf})) == "curseforge"
+    assert detect_modpack_format(write_pack(tmp_path / "d.zip", {"manifest.json": "{}"})) == "zip"
+
+
+def test_modrinth_pack(tmp_path, http_server):
+    sodium, lithium = b"sodium jar", b"lithium jar"
+    http_server.routes["/data/sodium.jar"] = (200, {}, sodium)
+    http_server.routes["/data/lithium.jar"] = (200, {}, lithium)
+    index = {
+        "name": "Test Pack",
+        "dependencies": {"minecraft": "1.20.1", "fabric-loader": "0.15.0"},
+        "files": [
+            {"path": "mods/sodium.jar", "downloads": [f"{CDN}/data/sodium.jar"], "hashes": {"sha1": sha1(sodium)}, "fileSize": len(sodium)},
+            {"path": "mods/lithium.jar", "downloads": [f"{CDN}/data/lithium.jar"], "hashes": {"sha1": sha1(lithium)}},
+            {"path": "mods/server-only.jar", "downloads": [f"{CDN}/data/server.jar"], "env": {"client": "unsupported"}},
+            {"path": "../../escape.jar", "downloads": [f"{CDN}/data/sodium.jar"]},
+        ],
+    }
+    pack = write_pack(tmp_path / "pack.mrpack", {
+        "modrinth.index.json": json.dumps(index),
+        "overrides/config/sodium.json": "{}",
+        "overrides/mods/lithium.jar": "patched lithium",
+    })
+    profile = tmp_path / "profile"
+    with DownloadEngine() as engine:
+        summary = ModpackImporter(engine, mirrors={CDN: http_server.url}).import_pack(pack, str(profile))
+
+    assert summary["name"] == "Test Pack"
+    assert summary["minecraft"] == "1.20.1"
+    assert summary["loader"] == "fabric-loader 0.15.0"
+    assert (summary["downloaded"], summary["written"], summary["rejected"]) == (2, 2, 1)
+    assert (profile / "mods" / "sodium.jar").read_bytes() == sodium
+    # Overrides win over downloaded files
+    assert (profile / "mods" / "lithium.jar").read_text() == "patched lithium"
+    assert (profile / "config" / "sodium.json").exists()
+    assert not (profile / "mods" / "server-only.jar").exists()
+    assert not (tmp_path / "escape.jar").exists()
+
+
+def test_curseforge_pack(tmp_path, http_server):
+    jei = b"jei jar"
+    http_server.routes["/v1/mods/1/files/10"] = (200, {}, json.dumps({"data": {
+        "fileName": "jei.jar", "downloadUrl": f"{http_server.url}/files/jei.jar", "fileLength": len(jei),
+        "hashes": [{"algo": 2, "value": "md5"}, {"algo": 1, "value": sha1(jei)}]}}).encode())
+    http_server.routes["/v1/mods/2/files/20"] = (200, {}, json.dumps({"data": {
+        "fileName": "optifine.jar", "displayName": "OptiFine", "downloadUrl": None}}).encode())
+    http_server.routes["/files/jei.jar"] = (200, {}, jei)
+    manifest = {"manifestType": "minecraftModpack", "name": "CF Pack", "overrides": "overrides",
+                "minecraft": {"version": "1.20.1", "modLoaders": [{"id": "forge-47.2.0", "primary": True}]},
+                "files": [{"projectID": 1, "fileID": 10}, {"projectID": 2, "fileID": 20},
+                          {"projectID": 3, "fileID": 30, "required": False}]}
+    pack = write_pack(tmp_path / "pack.zip", {"manifest.json": json.dumps(manifest), "overrides/options.txt": "fov:90"})
+    profile = tmp_path / "profile"
+
+    with DownloadEngine() as engine:
+        importer = ModpackImporter(engine, curseforge_api_url=http_server.url, curseforge_api_key="secret")
+        summary = importer.import_pack(pack, str(profile))
+
+    assert (summary["loader"], summary["downloaded"], summary["written"]) == ("forge-47.2.0", 1, 1)
+    assert summary["manual"] == ["OptiFine"]
+    assert (profile / "mods" / "jei.jar").read_bytes() == jei
+    api_requests = [headers for path, headers in http_server.requests if path.startswith("/v1/")]
+    assert len(api_requests) == 2
+    assert all(headers["x-api-key"] == "secret" for headers in api_requests)
+
+
+def test_curseforge_needs_an_api_key(tmp_path):
+    manifest = {"manifestType": "minecraftModpack", "minecraft": {}, "files": [{"projectID": 1, "fileID": 10}]}
+    pack = write_pack(tmp_path / "pack.zip", {"manifest.json": json.dumps(manifest)})
+    with DownloadEngine() as engine:
+        with pytest.raises(DownloadError, match="API key"):
+            ModpackImporter(engine).import_pack(pack, str(tmp_path / "profile"))
+    assert not os.path.exists(tmp_path / "profile")
@@ -0,0 +1,36 @@
+import os
+import zipfile
+
+import pytest
+
+from launcher_core import _safe_member_path, extract_modpack
+
+
+@pytest.mark.parametrize("name", ["../evil.txt", "mods/../../evil.txt", "mods\\..\\..\\evil.txt", "C:/evil.txt",
+                                  "C:evil.txt", "..", "", "./"])
+def test_unsafe_member_paths_are_rejected(tmp_path, name):
+    assert _safe_member_path(str(tmp_path), name) is None
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("mods/a.jar", ("mods", "a.jar")),
+    ("config\\b.toml", ("config", "b.toml")),
+    ("./options.txt", ("options.txt",)),
+    ("/config/c.json", ("config", "c.json")),
+])
+def test_safe_member_paths_stay_inside(tmp_path, name, expected):
+    assert _safe_member_path(str(tmp_path), name) == os.path.join(os.path.abspath(str(tmp_path)), *expected)
+
+
+def test_extract_counts_rejected_members_separately(tmp_path):
+    pack = tmp_path / "pack.zip"
+    with zipfile.ZipFile(pack, "w") as zf:
+        zf.writestr("overrides/config/a.toml", "a = 1\n")
+        zf.writestr("overrides/../../escape.txt", "nope")
+        zf.writestr("README.txt", "outside the prefix")
+    dest = tmp_path / "profile"
+
+    assert extract_modpack(str(pack), str(dest), prefix="overrides/") == (1, 0, 1)
+    assert (dest / "config" / "a.toml").read_text() == "a = 1\n"
+    assert not (tmp_path / "escape.txt").exists()
+    assert extract_modpack(str(pack), str(dest), prefix="overrides/") == (0, 1, 1)
@@ -0,0 +1,90 @@
+import base64
+import json
+import threading
+import time
+
+import pytest
+
+from launcher_core import ConfigStore, MsaTokenRefresher, jwt_expiry, msa_token_valid
+
+
+def make_jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+@pytest.fixture
+def config(tmp_path):
+    now = time.time()
+    config = ConfigStore(str(tmp_path / "config.json"), delay=0)
+    config["accounts"] = [
+        {"type": "msa", "uuid": "a", "name": "Alex", "token": make_jwt(now + 60),
+         "refresh_token": "r-a", "token_expires_at": now + 60},
+        {"type": "msa", "uuid": "s", "name": "Steve", "token": make_jwt(now + 86400),
+         "refresh_token": "r-s", "token_expires_at": now + 86400},
+        {"type": "offline", "uuid": "o", "name": "Offline"}
+    ]
+    return config
+
+
+def test_jwt_expiry():
+    assert jwt_expiry(make_jwt(1234567890)) == 1234567890.0
+    assert jwt_expiry("not-a-jwt") is None
+    assert jwt_expiry("a.!!!.c") is None
+    assert jwt_expiry(None) is None
+
+
+def test_token_valid_respects_margin():
+    now = time.time()
+    assert msa_token_valid({"token": "t", "token_expires_at": now + 600}, margin=300)
+    assert not msa_token_valid({"token": "t", "token_expires_at": now + 100}, margin=300)
+    assert not msa_token_valid({"token": "", "token_expires_at": now + 600}, margin=300)
+
+
+def test_concurrent_launches_refresh_once(config):
+    calls = []
+    gate = threading.Event()
+    def refresh_login(token):
+        calls.append(token)
+        gate.wait(5)
+        return {"access_token": make_jwt(time.time() + 86400), "refresh_token": token + "'"}
+    refresher = MsaTokenRefresher(config, refresh_login)
+    account = config["accounts"][0]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(refresher.ensure_valid(account))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == ["r-a"]
+    assert sorted(results) == [False] * 5 + [True]
+    assert account["refresh_token"] == "r-a'"
+    assert msa_token_valid(account)
+    config.flush()
+    with open(config.path, encoding="utf-8") as f:
+        assert json.load(f)["accounts"][0]["token"] == account["token"]
+
+
+def test_refresh_due_renews_only_expiring_tokens(config):
+    calls = []
+    def refresh_login(token):
+        calls.append(token)
+        return {"access_token": make_jwt(time.time() + 86400), "refresh_token": token}
+    refresher = MsaTokenRefresher(config, refresh_login, refresh_ahead=3600, check_interval=900)
+    next_due = refresher.refresh_due()
+    assert calls == ["r-a"]
+    assert 0 < next_due <= 900
+
+
+def test_failed_refresh_is_reported_and_retried(config):
+    errors = []
+    def refresh_login(token):
+        raise RuntimeError("offline")
+    refresher = MsaTokenRefresher(config, refresh_login, refresh_ahead=3600,
+                                  on_error=lambda account, error: errors.append((account["uuid"], str(error))))
+    refresher.refresh_due()
+    assert errors == [("a", "offline")]
+    with pytest.raises(RuntimeError):
+        refresher.ensure_valid(config["accounts"][0])
@@ -0,0 +1,63 @@
+import os
+import threading
+
+from launcher_core import ConsoleBuffer, OutputPump, limit_lines
+
+
+def pump_lines(data, chunk_size):
+    """Runs data through an OutputPump that reads chunk_size bytes at a time."""
+    read_fd, write_fd = os.pipe()
+    writer = threading.Thread(target=lambda: (os.write(write_fd, data), os.close(write_fd)))
+    writer.start()
+    lines = []
+    with os.fdopen(read_fd, "rb", buffering=0) as stream:
+        pump = OutputPump(stream, lines.extend, batch_interval=0.001)
+        pump.CHUNK_SIZE = chunk_size
+        pump.run()
+    writer.join()
+    return lines
+
+
+def test_crlf_split_across_reads_is_one_line_ending():
+    # "line1\r" fills the first read exactly, "\n" starts the next one
+    assert pump_lines(b"line1\r\nline2\r\n", 6) == ["line1\r\n", "line2\r\n"]
+
+
+def test_every_chunk_size_gives_the_same_lines():
+    data = "[main/INFO]: Loading café\r\n\nwarn\rdone\nno newline".encode("utf-8")
+    expected = ["[main/INFO]: Loading café\r\n", "\n", "warn\r", "done\n", "no newline"]
+    for chunk_size in range(1, 12):
+        assert pump_lines(data, chunk_size) == expected, chunk_size
+
+
+def test_multibyte_character_split_across_reads():
+    assert pump_lines("é€\n".encode("utf-8"), 1) == ["é€\n"]
+
+
+def test_large_output_is_delivered_completely():
+    data = b"".join(b"line %d\n" % i for i in range(20000))
+    lines = pump_lines(data, 4096)
+    assert len(lines) == 20000
+    assert lines[-1] == "line 19999\n"
+
+
+def test_limit_lines_policies():
+    lines = [f"{i}\n" for i in range(10)]
+    assert limit_lines(lines, 4, "keep") == lines
+    assert limit_lines(lines, 20, "drop") == lines
+    assert limit_lines(lines, 4, "drop")[:4] == ["0\n", "1\n", "2\n", "3\n"]
+    assert "dropped 6" in limit_lines(lines, 4, "drop")[-1]
+    sampled = limit_lines(lines, 5, "sample")
+    assert sampled[:5] == ["0\n", "2\n", "4\n", "6\n", "8\n"]
+    assert "5 skipped" in sampled[-1]
+
+
+def test_sampling_console_shows_a_budget_but_logs_everything(tmp_path):
+    buffer = ConsoleBuffer(log_path=str(tmp_path / "console.log"), policy="sample", max_lines_per_drain=10)
+    for i in range(1000):
+        buffer.append(f"line {i}\n")
+    shown = buffer.drain().splitlines()
+    assert len(shown) <= 11
+    assert shown[0] == "line 0"
+    buffer.close()
+    assert open(buffer.log_path).read().count("\n") == 1000
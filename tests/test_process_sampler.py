@@ -0,0 +1,75 @@
+import csv
+import gzip
+import json
+import os
+import threading
+
+import pytest
+
+from launcher_core import ProcessSampler, TELEMETRY_COLUMNS
+
+pytestmark = pytest.mark.skipif(not ProcessSampler.supported(), reason="needs /proc")
+
+
+def own_fds():
+    fds = {"stat": os.open("/proc/self/stat", os.O_RDONLY),
+           "status": os.open("/proc/self/status", os.O_RDONLY),
+           "meminfo": os.open("/proc/meminfo", os.O_RDONLY)}
+    if os.path.exists("/proc/self/io"):
+        fds["io"] = os.open("/proc/self/io", os.O_RDONLY)
+    return fds
+
+
+def test_read_parses_own_process():
+    sampler = ProcessSampler(os.getpid())
+    fds = own_fds()
+    try:
+        first = sampler._read(fds)
+        sum(i * i for i in range(200000)) # Burn some CPU between the reads
+        second = sampler._read(fds)
+    finally:
+        for fd in fds.values():
+            os.close(fd)
+    assert first["rss"] > 0 and first["threads"] >= 1
+    assert first["available"] > 0
+    assert second["cpu_ticks"] >= first["cpu_ticks"]
+    sample = dict(zip(TELEMETRY_COLUMNS, sampler._sample(first, second)))
+    assert sample["cpu_percent"] >= 0
+    assert sample["rss_mb"] == round(second["rss"] / (1024 * 1024), 1)
+    assert sample["threads"] == second["threads"]
+
+
+def test_samples_until_stopped_and_exports(tmp_path):
+    got = []
+    enough = threading.Event()
+    def on_sample(sample):
+        got.append(sample)
+        if len(got) >= 3:
+            enough.set()
+    sampler = ProcessSampler(os.getpid(), interval=0.01, on_sample=on_sample, max_samples=2)
+    sampler.start()
+    assert enough.wait(5)
+    sampler.stop()
+    sampler._thread.join(5)
+    assert not sampler._thread.is_alive()
+    assert set(got[0]) == set(TELEMETRY_COLUMNS)
+    assert len(sampler.series("rss_mb")) == 2 # Capped at max_samples
+
+    sampler.export(str(tmp_path / "samples.csv"))
+    with open(tmp_path / "samples.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == TELEMETRY_COLUMNS and len(rows) == 3
+
+    sampler.export(str(tmp_path / "samples.json.gz"))
+    with gzip.open(tmp_path / "samples.json.gz", "rt") as f:
+        data = json.load(f)
+    assert data["pid"] == os.getpid()
+    assert data["columns"]["threads"] == sampler.series("threads")
+
+
+def test_missing_process_ends_quietly():
+    sampler = ProcessSampler(2 ** 22 + 12345, interval=0.01) # Beyond the kernel's pid limit
+    sampler.start()
+    sampler._thread.join(5)
+    assert not sampler._thread.is_alive()
+    assert sampler.series("time") == []
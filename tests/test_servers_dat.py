@@ -0,0 +1,49 @@
+import gzip
+import struct
+
+from launcher_core import read_servers_dat
+
+
+def nbt_string(text):
+    data = text.encode("utf-8")
+    return struct.pack(">H", len(data)) + data
+
+
+def server_entry(name, ip):
+    return (b"\x08" + nbt_string("name") + nbt_string(name) +
+            b"\x08" + nbt_string("ip") + nbt_string(ip) +
+            b"\x01" + nbt_string("hidden") + b"\x00" +
+            b"\x00")
+
+
+def servers_dat(entries):
+    servers = b"\x09" + nbt_string("servers") + struct.pack(">bi", 10, len(entries)) + b"".join(entries)
+    return b"\x0a" + nbt_string("") + servers + b"\x00"
+
+
+def test_reads_names_and_addresses(tmp_path):
+    path = tmp_path / "servers.dat"
+    path.write_bytes(servers_dat([server_entry("Hub", "play.example.com"), server_entry("", "10.0.0.2:25566")]))
+    assert read_servers_dat(str(path)) == [
+        {"name": "Hub", "address": "play.example.com"},
+        {"name": "10.0.0.2:25566", "address": "10.0.0.2:25566"},
+    ]
+
+
+def test_reads_gzipped_file(tmp_path):
+    path = tmp_path / "servers.dat"
+    path.write_bytes(gzip.compress(servers_dat([server_entry("Hub", "play.example.com")])))
+    assert read_servers_dat(str(path)) == [{"name": "Hub", "address": "play.example.com"}]
+
+
+def test_empty_server_list(tmp_path):
+    path = tmp_path / "servers.dat"
+    path.write_bytes(b"\x0a" + nbt_string("") + b"\x09" + nbt_string("servers") + struct.pack(">bi", 0, 0) + b"\x00")
+    assert read_servers_dat(str(path)) == []
+
+
+def test_truncated_or_missing_file_gives_no_servers(tmp_path):
+    path = tmp_path / "servers.dat"
+    path.write_bytes(servers_dat([server_entry("Hub", "play.example.com")])[:20])
+    assert read_servers_dat(str(path)) == []
+    assert read_servers_dat(str(tmp_path / "missing.dat")) == []
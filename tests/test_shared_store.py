@@ -0,0 +1,66 @@
+import hashlib
+import os
+
+import launcher_core
+from launcher_core import DownloadEngine, DownloadJob, SharedStore, link_or_copy
+
+
+def sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def test_link_or_copy_hardlinks_when_possible(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"payload")
+    dst = tmp_path / "deep" / "dir" / "dst.bin"
+    link_or_copy(str(src), str(dst))
+    assert os.path.samefile(src, dst)
+
+
+def test_link_or_copy_falls_back_to_a_copy(tmp_path, monkeypatch):
+    def no_link(src, dst):
+        raise OSError("cross-device link")
+    monkeypatch.setattr(launcher_core.os, "link", no_link)
+    monkeypatch.setattr(launcher_core, "_reflink", lambda src, dst: False)
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"payload")
+    dst = tmp_path / "dst.bin"
+    dst.write_bytes(b"old contents")
+    link_or_copy(str(src), str(dst))
+    assert dst.read_bytes() == b"payload"
+    assert not os.path.samefile(src, dst)
+    assert sorted(os.listdir(tmp_path)) == ["dst.bin", "src.bin"]
+
+
+def test_store_only_adopts_verified_objects(tmp_path):
+    store = SharedStore(str(tmp_path / "store"))
+    good = tmp_path / "good.bin"
+    good.write_bytes(b"good")
+    store.adopt(str(good), sha1(b"something else"))
+    assert not store.has(sha1(b"something else"))
+    store.adopt(str(good), sha1(b"good"))
+    assert store.has(sha1(b"good"))
+    assert store.path_for(sha1(b"good")).endswith(os.path.join(sha1(b"good")[:2], sha1(b"good")))
+
+
+def test_link_into_checks_the_size(tmp_path):
+    store = SharedStore(str(tmp_path / "store"))
+    obj = tmp_path / "obj.bin"
+    obj.write_bytes(b"12345")
+    store.adopt(str(obj), sha1(b"12345"))
+    assert not store.link_into(sha1(b"12345"), str(tmp_path / "a.bin"), size=4)
+    assert store.link_into(sha1(b"12345"), str(tmp_path / "a.bin"), size=5)
+    assert not store.link_into(sha1(b"missing"), str(tmp_path / "b.bin"))
+
+
+def test_engine_links_from_the_store_before_downloading(tmp_path, http_server):
+    body = b"shared library"
+    http_server.routes["/lib.jar"] = (200, {}, body)
+    store = SharedStore(str(tmp_path / "store"))
+    first = DownloadJob(f"{http_server.url}/lib.jar", str(tmp_path / "mc1" / "lib.jar"), sha1(body), len(body))
+    second = DownloadJob(f"{http_server.url}/lib.jar", str(tmp_path / "mc2" / "lib.jar"), sha1(body), len(body))
+    with DownloadEngine(store=store) as engine:
+        assert engine.run([first]) == 1
+        assert engine.run([second]) == 0
+    assert len(http_server.requests) == 1
+    assert os.path.samefile(first.path, second.path)
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+import launcher_core
+from launcher_core import StartupProfiler, lazy_import
+
+
+def test_lazy_import_runs_the_module_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "slow_module.py").write_text("import os\nos.environ['SLOW_MODULE_RAN'] = '1'\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "slow_module", raising=False)
+    monkeypatch.delenv("SLOW_MODULE_RAN", raising=False)
+
+    module = lazy_import("slow_module")
+    assert "SLOW_MODULE_RAN" not in os.environ
+    assert module.VALUE == 42
+    assert os.environ["SLOW_MODULE_RAN"] == "1"
+    assert lazy_import("slow_module") is module
+
+
+def test_lazy_import_of_a_missing_module_fails_right_away():
+    with pytest.raises(ImportError):
+        lazy_import("no_such_module_anywhere")
+
+
+def test_profiler_reports_steps_and_the_slowest(monkeypatch):
+    now = iter([1.0, 1.5, 1.6])
+    monkeypatch.setattr(launcher_core.time, "perf_counter", lambda: next(now))
+    profiler = StartupProfiler(start=0.0)
+    profiler.mark("imports")
+    profiler.mark("window")
+    profiler.mark("paint")
+    lines = profiler.report().splitlines()
+    assert lines[1].split() == ["imports", "1000.0", "1000.0"]
+    assert lines[2].split() == ["window", "500.0", "1500.0"]
+    assert lines[-1] == "slowest: imports (1000 ms), window (500 ms), paint (100 ms)"
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StartupProfiler(enabled=False)
+    profiler.mark("imports")
+    assert profiler.marks == []